@@ -1,37 +1,193 @@
 import sys
 import os
+import argparse
 from pathlib import Path
 from modules.generar_matriz import generar_matriz_universo, guardar_matriz
 from modules.mision_interestelar import Universo
-from ui.interfaz import InterfazUniverso
+from modules.cache_soluciones import CacheSoluciones
+from modules.resolucion_lote import METODOS_LOTE
+
+# Soluciones ya calculadas, por contenido del universo (se reutilizan entre ejecuciones)
+DIRECTORIO_CACHE = "data/cache"
+
+def ejecutar_interfaz():
+    # La interfaz (y pygame) solo se importan en modo gráfico
+    from ui.interfaz import InterfazUniverso
 
-def main():
     try:
         # Configuración inicial
         print("Iniciando el juego...")
-        
+
         # Generar o cargar matriz
         os.makedirs("data", exist_ok=True)
         archivo_matriz = "data/matriz_universo.json"
-        
+
         if not os.path.exists(archivo_matriz):
             print("Generando nueva matriz...")
             universo_data = generar_matriz_universo()
             guardar_matriz(universo_data, archivo_matriz)
-        
+
         # Cargar universo
         print("Cargando universo...")
         universo = Universo(archivo_matriz)
-        
+        universo.cache = CacheSoluciones(DIRECTORIO_CACHE)
+
         # Iniciar interfaz
         print("Iniciando interfaz gráfica...")
         interfaz = InterfazUniverso(universo)
         interfaz.ejecutar()
-        
+
     except Exception as e:
         print(f"Error: {e}")
         input("Presiona Enter para salir...")
         sys.exit(1)
 
+def comando_solve(args):
+    """Resuelve un lote de universos sin interfaz y emite un registro JSONL por archivo"""
+    from modules.resolucion_lote import expandir_entradas, resolver_lote
+
+    rutas = expandir_entradas(args.entradas)
+    if not rutas:
+        print("No se encontraron archivos de universo", file=sys.stderr)
+        return 1
+
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    try:
+        resumen = resolver_lote(rutas, salida, metodo=args.metodo, trabajadores=args.trabajadores,
+                                max_segundos=args.max_segundos, max_nodos=args.max_nodos,
+                                directorio_cache=args.cache)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+    print(f"{resumen['archivos']} archivos, {resumen['resueltos']} resueltos, "
+          f"{resumen['errores']} con error", file=sys.stderr)
+    return 0
+
+def comando_convert(args):
+    """Convierte un universo JSON al formato binario que se abre mapeado en memoria"""
+    from modules.matriz_mapeada import convertir_json
+
+    convertir_json(args.entrada, args.salida, tamano_tesela=args.tesela, tipo_costos=args.tipo_costos)
+    print(f"Universo guardado en {args.salida}", file=sys.stderr)
+    return 0
+
+def comando_generate(args):
+    """Genera un corpus de universos con semillas consecutivas en fragmentos comprimidos"""
+    from modules.generacion_masiva import generar_corpus
+
+    densidades = {}
+    for asignacion in args.densidad:
+        nombre, _, valor = asignacion.partition("=")
+        densidades[nombre] = float(valor)
+    metadatos = generar_corpus(args.directorio, args.cantidad, semilla_inicial=args.semilla_inicial,
+                               filas=args.filas, columnas=args.columnas, densidades=densidades,
+                               carga_inicial=args.carga_inicial, por_fragmento=args.por_fragmento,
+                               trabajadores=args.trabajadores)
+    print(f"{metadatos['cantidad']} universos en {len(metadatos['fragmentos'])} fragmentos "
+          f"guardados en {args.directorio}", file=sys.stderr)
+    return 0
+
+def comando_bench(args):
+    """Corre el banco de pruebas y guarda el informe; con --base también compara"""
+    from modules import rendimiento
+
+    tamanos = args.tamanos or rendimiento.TAMANOS_POR_DEFECTO
+    semillas = args.semillas or rendimiento.SEMILLAS_POR_DEFECTO
+    metodos = args.metodos or rendimiento.METODOS_POR_DEFECTO
+
+    def informar(resultado):
+        print(f"{resultado['tamano']:>4} s{resultado['semilla']} {resultado['metodo']:<22} "
+              f"{resultado['segundos']:>9.4f}s nodos={resultado['nodos_expandidos']} "
+              f"pasos={resultado['pasos']}", file=sys.stderr)
+
+    informe = rendimiento.ejecutar(tamanos, semillas, metodos,
+                                   max_segundos=args.max_segundos, max_nodos=args.max_nodos,
+                                   medir_memoria=not args.sin_memoria, informar=informar)
+    rendimiento.guardar(informe, args.salida)
+    print(f"Informe guardado en {args.salida}", file=sys.stderr)
+    if args.base is None:
+        return 0
+    return _informar_regresiones(rendimiento.comparar(informe, rendimiento.cargar(args.base), args.tolerancia))
+
+def comando_compare(args):
+    """Compara un informe de rendimiento contra una línea base"""
+    from modules import rendimiento
+
+    regresiones = rendimiento.comparar(rendimiento.cargar(args.actual), rendimiento.cargar(args.base),
+                                       args.tolerancia)
+    return _informar_regresiones(regresiones)
+
+def _informar_regresiones(regresiones) -> int:
+    for r in regresiones:
+        print(f"REGRESIÓN {r['tipo']}: {r['tamano']}x{r['tamano']} semilla {r['semilla']} "
+              f"{r['metodo']}: {r['base']} -> {r['actual']}")
+    if not regresiones:
+        print("Sin regresiones")
+    return 1 if regresiones else 0
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Universo de Algoritmos")
+    subcomandos = parser.add_subparsers(dest="comando")
+
+    solve = subcomandos.add_parser("solve", help="resolver lotes de universos sin interfaz gráfica")
+    solve.add_argument("entradas", nargs="+", help="directorios, patrones glob o archivos JSON / .umap")
+    solve.add_argument("-o", "--salida", default="-", help="archivo JSONL de salida (- para stdout)")
+    solve.add_argument("-m", "--metodo", default="astar", choices=METODOS_LOTE)
+    solve.add_argument("-j", "--trabajadores", type=int, default=None,
+                       help="procesos del pool (por defecto, uno por CPU)")
+    solve.add_argument("--max-segundos", type=float, default=None, help="tiempo máximo por archivo")
+    solve.add_argument("--max-nodos", type=int, default=None, help="nodos máximos por archivo")
+    solve.add_argument("--cache", default=None, metavar="DIRECTORIO",
+                       help="reutilizar soluciones guardadas en este directorio")
+    solve.set_defaults(funcion=comando_solve)
+
+    convert = subcomandos.add_parser("convert", help="convertir un universo JSON al formato binario mapeable")
+    convert.add_argument("entrada", help="archivo JSON del universo")
+    convert.add_argument("salida", help="archivo binario de salida (.umap)")
+    convert.add_argument("--tesela", type=int, default=64, help="lado de las teselas de costos")
+    convert.add_argument("--tipo-costos", default="<i4", help="tipo NumPy de los costos (p. ej. u1, <i2, <i4)")
+    convert.set_defaults(funcion=comando_convert)
+
+    generate = subcomandos.add_parser("generate", help="generar un corpus de universos en fragmentos comprimidos")
+    generate.add_argument("directorio", help="directorio del corpus (fragmentos, índice y metadatos)")
+    generate.add_argument("-n", "--cantidad", type=int, required=True, help="cantidad de universos")
+    generate.add_argument("--semilla-inicial", type=int, default=0, help="semilla del primer universo")
+    generate.add_argument("--filas", type=int, default=30)
+    generate.add_argument("--columnas", type=int, default=30)
+    generate.add_argument("--densidad", action="append", default=[], metavar="ELEMENTO=VALOR",
+                          help="elementos por celda, p. ej. num_estrellas=0.01 (repetible)")
+    generate.add_argument("--carga-inicial", type=int, default=200)
+    generate.add_argument("--por-fragmento", type=int, default=1000, help="universos por fragmento")
+    generate.add_argument("-j", "--trabajadores", type=int, default=None,
+                          help="procesos del pool (por defecto, uno por CPU)")
+    generate.set_defaults(funcion=comando_generate)
+
+    bench = subcomandos.add_parser("bench", help="medir los solucionadores sobre universos generados")
+    bench.add_argument("-o", "--salida", default="rendimiento.json", help="archivo JSON del informe")
+    # Sin valor se usan los de modules.rendimiento, que solo se importa al correr el banco
+    bench.add_argument("--tamanos", type=int, nargs="+", default=None, help="por defecto, las escalas del banco")
+    bench.add_argument("--semillas", type=int, nargs="+", default=None, help="por defecto, las semillas del banco")
+    bench.add_argument("--metodos", nargs="+", default=None, help="por defecto todos los de resolver()")
+    bench.add_argument("--max-segundos", type=float, default=10.0, help="tiempo máximo por corrida")
+    bench.add_argument("--max-nodos", type=int, default=None, help="nodos máximos por corrida")
+    bench.add_argument("--sin-memoria", action="store_true", help="no medir el pico de memoria")
+    bench.add_argument("--base", default=None, help="informe base contra el cual comparar")
+    bench.add_argument("--tolerancia", type=float, default=0.2, help="fracción de enlentecimiento tolerada")
+    bench.set_defaults(funcion=comando_bench)
+
+    compare = subcomandos.add_parser("compare", help="comparar un informe de rendimiento con una base")
+    compare.add_argument("actual", help="informe a evaluar")
+    compare.add_argument("base", help="informe de referencia")
+    compare.add_argument("--tolerancia", type=float, default=0.2, help="fracción de enlentecimiento tolerada")
+    compare.set_defaults(funcion=comando_compare)
+    return parser
+
+def main(argv=None):
+    args = crear_parser().parse_args(argv)
+    if args.comando is None:
+        ejecutar_interfaz()
+        return
+    sys.exit(args.funcion(args))
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,92 @@
+"""
+Módulo de bitboards sobre la grilla del universo
+
+Un tablero es un entero de Python con un bit por celda (bit fila * columnas +
+columna). Las operaciones de conjuntos (unión, intersección, diferencia) son
+operaciones de bits sobre el entero completo; el análisis de factibilidad
+(modules.factibilidad) inunda la grilla sobre estos tableros.
+
+GeometriaBits guarda las máscaras de borde necesarias para desplazar un tablero
+una celda en las cuatro direcciones sin que los bits pasen de una fila a otra.
+La búsqueda no mueve la nave sobre tableros: su estado cambia de a una celda y se
+deshace con el rastro del EstadoBusqueda. Solo la tabla de transposición guarda
+las celdas visitadas de cada llegada como tablero, para compararlas con & y ~.
+"""
+
+import numpy as np
+
+
+def empaquetar(mascara: np.ndarray) -> int:
+    """Tablero con los bits encendidos donde el arreglo booleano (plano) es verdadero"""
+    bits = np.packbits(mascara, bitorder='little')
+    return int.from_bytes(bits.tobytes(), 'little')
+
+
+def desempaquetar(tablero: int, total: int) -> np.ndarray:
+    """Arreglo booleano plano de 'total' celdas a partir de un tablero"""
+    datos = np.frombuffer(tablero.to_bytes((total + 7) // 8, 'little'), dtype=np.uint8)
+    return np.unpackbits(datos, count=total, bitorder='little').astype(bool)
+
+
+class GeometriaBits:
+    """Máscaras de borde y relleno por inundación para tableros de filas x columnas"""
+
+    def __init__(self, filas: int, columnas: int):
+        self.filas = filas
+        self.columnas = columnas
+        self.total = filas * columnas
+        self.todo = (1 << self.total) - 1
+
+        # Primera columna de cada fila, armada duplicando el patrón (O(log filas) operaciones)
+        primera_columna = 1
+        filas_cubiertas = 1
+        while filas_cubiertas < filas:
+            paso = min(filas_cubiertas, filas - filas_cubiertas)
+            primera_columna |= (primera_columna & ((1 << (paso * columnas)) - 1)) << (filas_cubiertas * columnas)
+            filas_cubiertas += paso
+        self.primera_columna = primera_columna
+        self.ultima_columna = primera_columna << (columnas - 1)
+        self.sin_primera_columna = self.todo & ~primera_columna
+        self.sin_ultima_columna = self.todo & ~self.ultima_columna
+
+    def bit(self, fila: int, columna: int) -> int:
+        return 1 << (fila * self.columnas + columna)
+
+    @staticmethod
+    def _rellenar(generadores: int, propagadores: int, desplazamiento: int, limite: int, subir: bool) -> int:
+        """
+        Relleno ocluido (Kogge-Stone): extiende los generadores en una dirección mientras
+        haya propagadores, en O(log limite) operaciones en lugar de una por celda
+        """
+        while desplazamiento < limite:
+            if subir:
+                generadores |= propagadores & (generadores << desplazamiento)
+                propagadores &= propagadores << desplazamiento
+            else:
+                generadores |= propagadores & (generadores >> desplazamiento)
+                propagadores &= propagadores >> desplazamiento
+            desplazamiento <<= 1
+        return generadores
+
+    def inundar(self, semilla: int, transitables: int) -> int:
+        """
+        Todas las celdas transitables conectadas a la semilla (relleno por inundación).
+        Cada ronda recorre tramos rectos completos en las cuatro direcciones, así que las
+        rondas dependen de los giros del camino y no de su largo
+        """
+        alcanzadas = semilla & transitables
+        hacia_este = transitables & self.sin_primera_columna
+        hacia_oeste = transitables & self.sin_ultima_columna
+        columnas, total = self.columnas, self.total
+        while True:
+            nuevas = self._rellenar(alcanzadas, hacia_este, 1, columnas, True)
+            nuevas = self._rellenar(nuevas, hacia_oeste, 1, columnas, False)
+            nuevas = self._rellenar(nuevas, transitables, columnas, total, True)
+            nuevas = self._rellenar(nuevas, transitables, columnas, total, False)
+            if nuevas == alcanzadas:
+                return alcanzadas
+            alcanzadas = nuevas
+
+    @staticmethod
+    def contar(tablero: int) -> int:
+        return bin(tablero).count("1")
@@ -0,0 +1,225 @@
+"""
+Módulo de re-resolución incremental (estilo LPA*/D* Lite)
+
+BusquedaIncremental es un A* sobre el mismo espacio de estados que motor_busqueda,
+pero conserva entre llamadas su árbol de búsqueda, las etiquetas no dominadas y
+la lista de abiertos. Cuando se edita una celda:
+    1. se invalidan los nodos que pasan por ella y todos sus descendientes,
+    2. los nodos expandidos vecinos de lo invalidado vuelven a la lista de abiertos
+       para regenerar sus sucesores con los datos nuevos,
+    3. la búsqueda continúa desde ahí; el resto del árbol se reutiliza tal cual.
+La heurística no depende de costos, estrellas, agujeros negros ni recargas, por lo
+que sigue siendo admisible después de cualquiera de esas ediciones.
+"""
+
+import heapq
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from modules.motor_busqueda import MOVIMIENTOS, ProblemaUniverso, reconstruir
+from modules.presupuesto import Presupuesto
+from modules.estadisticas import EstadisticasBusqueda, PODA_DOMINANCIA, PODA_SIN_ENERGIA
+
+
+class BusquedaIncremental:
+    """A* persistente que repara solo la parte del árbol afectada por una edición"""
+
+    def __init__(self, problema: ProblemaUniverso, usar_heuristica: bool = True):
+        self.problema = problema
+        self._heuristica = problema.heuristica if usar_heuristica else (lambda posicion: 0)
+        self.reiniciar()
+
+    def reiniciar(self):
+        """Descarta todo el árbol y vuelve a sembrar el origen"""
+        # Por nodo: (padre, posición, energía, estrellas), pasos y máscaras (est, neg, gus, rec)
+        self.nodos: List[Tuple[int, Tuple[int, int], int, int]] = []
+        self.pasos: List[int] = []
+        self.mascaras: List[Tuple[int, int, int, int]] = []
+        self.hijos: List[List[int]] = []
+        self.nodos_por_posicion: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        # Etiquetas no dominadas por estado discreto: clave -> [(pasos, energía, id)]
+        self.etiquetas: Dict[tuple, List[Tuple[int, int, int]]] = {}
+        self.invalidos: Set[int] = set()
+        self.expandidos_por_posicion: Dict[Tuple[int, int], Set[int]] = defaultdict(set)
+        self.expandidos: Set[int] = set()
+        self.abiertos = []
+        self.nodos_reabiertos = 0
+
+        problema = self.problema
+        raiz = self._nuevo_nodo(-1, problema.origen, problema.carga_inicial, 0, 0, (0, 0, 0, 0))
+        if problema.carga_inicial > 0 or problema.origen == problema.destino:
+            self._insertar(raiz)
+
+    def _nuevo_nodo(self, padre: int, posicion: Tuple[int, int], energia: int, estrellas: int,
+                    pasos: int, mascaras: Tuple[int, int, int, int]) -> int:
+        id_nodo = len(self.nodos)
+        self.nodos.append((padre, posicion, energia, estrellas))
+        self.pasos.append(pasos)
+        self.mascaras.append(mascaras)
+        self.hijos.append([])
+        self.nodos_por_posicion[posicion].append(id_nodo)
+        if padre >= 0:
+            self.hijos[padre].append(id_nodo)
+        return id_nodo
+
+    def _clave(self, id_nodo: int) -> tuple:
+        return (self.nodos[id_nodo][1],) + self.mascaras[id_nodo]
+
+    def _encolar(self, id_nodo: int):
+        _, posicion, energia, _ = self.nodos[id_nodo]
+        pasos = self.pasos[id_nodo]
+        heapq.heappush(self.abiertos, (pasos + self._heuristica(posicion), -energia, id_nodo))
+
+    def _insertar(self, id_nodo: int, estadisticas: Optional[EstadisticasBusqueda] = None):
+        """Agrega la etiqueta si no está dominada y descarta las que ella domina"""
+        clave = self._clave(id_nodo)
+        energia = self.nodos[id_nodo][2]
+        pasos = self.pasos[id_nodo]
+        lista = self.etiquetas.setdefault(clave, [])
+        for pasos_e, energia_e, _ in lista:
+            if pasos_e <= pasos and energia_e >= energia:
+                self.invalidos.add(id_nodo)
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_DOMINANCIA)
+                return
+        vigentes = []
+        for etiqueta in lista:
+            if pasos <= etiqueta[0] and energia >= etiqueta[1]:
+                self.invalidos.add(etiqueta[2])
+            else:
+                vigentes.append(etiqueta)
+        vigentes.append((pasos, energia, id_nodo))
+        self.etiquetas[clave] = vigentes
+        self._encolar(id_nodo)
+
+    def _expandir(self, id_nodo: int, estadisticas: Optional[EstadisticasBusqueda] = None):
+        problema = self.problema
+        destino = problema.destino
+        _, posicion, energia, estrellas = self.nodos[id_nodo]
+        pasos = self.pasos[id_nodo]
+        m_est, m_neg, m_gus, m_rec = self.mascaras[id_nodo]
+
+        for df, dc in MOVIMIENTOS:
+            fila, columna = posicion[0] + df, posicion[1] + dc
+            if not problema.es_valida(fila, columna):
+                continue
+            siguiente = (fila, columna)
+            efecto = problema.entrar(siguiente, energia, estrellas, m_est, m_neg, m_rec)
+            if efecto is None:
+                if estadisticas is not None:
+                    estadisticas.podar(problema.motivo_rechazo(siguiente, m_neg))
+                continue
+            n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+            n_gus = m_gus
+            id_hijo = self._nuevo_nodo(id_nodo, siguiente, n_energia, n_estrellas, pasos + 1,
+                                       (n_est, n_neg, n_gus, n_rec))
+
+            # Salto obligatorio por agujero de gusano: la entrada queda como nodo intermedio
+            gusano = problema.gusanos.get(siguiente)
+            if gusano is not None and not (m_gus >> gusano[0]) & 1:
+                self.invalidos.add(id_hijo)
+                bit, salida = gusano
+                efecto = problema.entrar(salida, n_energia, n_estrellas, n_est, n_neg, n_rec)
+                if efecto is None:
+                    if estadisticas is not None:
+                        estadisticas.podar(problema.motivo_rechazo(salida, n_neg))
+                    continue
+                n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+                n_gus |= 1 << bit
+                if estadisticas is not None:
+                    estadisticas.usar_gusano()
+                siguiente = salida
+                id_hijo = self._nuevo_nodo(id_hijo, siguiente, n_energia, n_estrellas, pasos + 2,
+                                           (n_est, n_neg, n_gus, n_rec))
+
+            if n_energia <= 0 and siguiente != destino:
+                self.invalidos.add(id_hijo)
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_SIN_ENERGIA)
+                continue
+            self._insertar(id_hijo, estadisticas)
+
+        self.expandidos.add(id_nodo)
+        self.expandidos_por_posicion[posicion].add(id_nodo)
+
+    def resolver(self, presupuesto: Optional[Presupuesto] = None,
+                 estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[dict]:
+        """
+        Continúa el A* desde el estado guardado. Devuelve la solución de menos pasos,
+        None si no existe, o el camino más cercano marcado 'completa': False si el
+        presupuesto se agota.
+        """
+        destino = self.problema.destino
+        mejor_parcial = (self.problema.heuristica(self.problema.origen), 0)
+
+        while self.abiertos:
+            id_nodo = self.abiertos[0][2]
+            if id_nodo in self.invalidos or id_nodo in self.expandidos:
+                heapq.heappop(self.abiertos)
+                continue
+            posicion = self.nodos[id_nodo][1]
+
+            # La meta queda en abiertos: si una edición no la afecta, la próxima llamada es inmediata
+            if posicion == destino:
+                return reconstruir(self.nodos, id_nodo)
+
+            heapq.heappop(self.abiertos)
+            if presupuesto is not None:
+                if presupuesto.consumir():
+                    self._encolar(id_nodo)
+                    return reconstruir(self.nodos, mejor_parcial[1], completa=False)
+                cercania = self.problema.heuristica(posicion)
+                if cercania < mejor_parcial[0]:
+                    mejor_parcial = (cercania, id_nodo)
+            if estadisticas is not None:
+                estadisticas.expandir(self.pasos[id_nodo])
+            self._expandir(id_nodo, estadisticas)
+
+        return None
+
+    def invalidar(self, celdas: Iterable[Tuple[int, int]]):
+        """Invalida lo que depende de las celdas editadas y reabre a sus predecesores"""
+        celdas = set(celdas)
+        pendientes = [id_nodo for posicion in celdas for id_nodo in self.nodos_por_posicion.get(posicion, ())]
+        posiciones = set(celdas)
+        vistos = set()
+
+        while pendientes:
+            id_nodo = pendientes.pop()
+            if id_nodo in vistos:
+                continue
+            vistos.add(id_nodo)
+            pendientes.extend(self.hijos[id_nodo])
+            posicion = self.nodos[id_nodo][1]
+            posiciones.add(posicion)
+            if id_nodo in self.expandidos:
+                self.expandidos.discard(id_nodo)
+                self.expandidos_por_posicion[posicion].discard(id_nodo)
+            if id_nodo not in self.invalidos:
+                self.invalidos.add(id_nodo)
+                clave = self._clave(id_nodo)
+                lista = self.etiquetas.get(clave)
+                if lista is not None:
+                    self.etiquetas[clave] = [e for e in lista if e[2] != id_nodo]
+
+        if 0 in vistos:
+            # Se invalidó la raíz (p. ej. cambió el origen): no hay nada que reutilizar
+            self.reiniciar()
+            return
+
+        # Predecesores: vecinos de lo invalidado y de las entradas de gusano que llevan allí
+        predecesoras = set()
+        for fila, columna in posiciones:
+            for df, dc in MOVIMIENTOS:
+                predecesoras.add((fila + df, columna + dc))
+        for entrada, (_, salida) in self.problema.gusanos.items():
+            if salida in posiciones or entrada in posiciones:
+                for df, dc in MOVIMIENTOS:
+                    predecesoras.add((entrada[0] + df, entrada[1] + dc))
+
+        for posicion in predecesoras:
+            for id_nodo in list(self.expandidos_por_posicion.get(posicion, ())):
+                self.expandidos.discard(id_nodo)
+                self.expandidos_por_posicion[posicion].discard(id_nodo)
+                self._encolar(id_nodo)
+                self.nodos_reabiertos += 1
@@ -0,0 +1,174 @@
+"""
+Módulo de búsqueda paralela en varios procesos
+
+La frontera de la búsqueda (todos los caminos de los primeros niveles desde el
+origen) se reparte entre los procesos de un ProcessPoolExecutor. Cada proceso
+completa sus prefijos con el backtracking iterativo en modo ramificación y poda:
+la mejor longitud encontrada hasta el momento se comparte entre todos a través
+de un multiprocessing.Value y cualquier rama que no pueda mejorarla se corta.
+Igual que el backtracking, recorre caminos simples: encuentra la ruta más corta
+que no repite celdas, que puede ser más larga que la de A* (o no existir).
+
+El presupuesto se traslada a los procesos como un instante límite absoluto,
+una cuota de nodos por prefijo y un multiprocessing.Event de parada que el
+proceso principal activa si la búsqueda se cancela. Si la resolución lleva
+estadísticas, cada prefijo devuelve las suyas y se suman en el proceso principal
+(la frontera generada allí no se cuenta, igual que en el presupuesto).
+
+Los procesos reciben el Universo (capa estática) y las celdas descartadas de la
+resolución; cada prefijo se explora sobre un EstadoBusqueda nuevo.
+"""
+
+import os
+import time
+import multiprocessing
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Tuple
+
+from modules.estadisticas import EstadisticasBusqueda
+from modules.estado_busqueda import EstadoBusqueda
+from modules.motor_busqueda import ProblemaUniverso
+from modules.presupuesto import Presupuesto, TokenCancelacion
+
+SIN_COTA = 2 ** 31 - 1
+
+# Cada cuánto el proceso principal revisa la cancelación mientras espera
+INTERVALO_ESPERA = 0.1
+
+# Estado de cada proceso trabajador (se fija en el inicializador)
+_universo = None
+_descartadas = frozenset()
+_cota = None
+_problema = None
+_parada = None
+_limite = None
+_nodos_por_prefijo = None
+
+
+def _inicializar_trabajador(universo, descartadas, cota, parada, limite, nodos_por_prefijo):
+    global _universo, _descartadas, _cota, _problema, _parada, _limite, _nodos_por_prefijo
+    _universo = universo
+    _descartadas = descartadas
+    _cota = cota
+    _problema = ProblemaUniverso(universo, descartadas)
+    _parada = parada
+    _limite = limite
+    _nodos_por_prefijo = nodos_por_prefijo
+
+
+def _reproducir_prefijo(estado: EstadoBusqueda, prefijo: List[Tuple[int, int]], rastro: list) -> bool:
+    """Lleva la nave al final del prefijo; los saltos de gusano se aplican solos al avanzar"""
+    i = 1
+    while i < len(prefijo):
+        llegada = estado._avanzar(prefijo[i][0], prefijo[i][1], rastro)
+        if llegada is None:
+            return False
+        # Si hubo salto, el prefijo ya incluye la salida del agujero de gusano
+        i += 2 if llegada != prefijo[i] else 1
+    return True
+
+
+def _explorar_prefijo(prefijo: List[Tuple[int, int]], con_estadisticas: bool = False
+                      ) -> Tuple[List[dict], int, Optional[str], Optional[dict]]:
+    """
+    Ramificación y poda desde el final de un prefijo. Devuelve (soluciones que mejoraron
+    la cota, nodos expandidos, motivo de parada, estadísticas como dict o None).
+    """
+    segundos = None if _limite is None else max(0.0, _limite - time.time())
+    presupuesto = Presupuesto(segundos, _nodos_por_prefijo, TokenCancelacion(_parada))
+    estadisticas = EstadisticasBusqueda() if con_estadisticas else None
+    estado = EstadoBusqueda(_universo, presupuesto, descartadas=_descartadas, estadisticas=estadisticas)
+    rastro = []
+    encontradas = []
+    if presupuesto.verificar() or not _reproducir_prefijo(estado, prefijo, rastro):
+        return encontradas, 0, presupuesto.motivo, None
+
+    def podar(fila: int, columna: int) -> bool:
+        pasos = len(estado.nave.camino) - 1
+        return pasos + _problema.heuristica((fila, columna)) >= _cota.value
+
+    for solucion in estado._explorar_con_pila(None, rastro, podar):
+        pasos = len(solucion['camino']) - 1
+        with _cota.get_lock():
+            if pasos < _cota.value:
+                _cota.value = pasos
+                encontradas.append(solucion)
+    return (encontradas, presupuesto.nodos, presupuesto.motivo,
+            None if estadisticas is None else estadisticas.como_dict())
+
+
+def generar_frontera(estado: EstadoBusqueda, profundidad: int) -> Tuple[List[List[Tuple[int, int]]], List[dict]]:
+    """
+    Enumera los prefijos vivos de 'profundidad' movimientos desde el origen.
+    Devuelve (prefijos, soluciones encontradas antes de esa profundidad).
+    """
+    universo = estado.universo
+    prefijos, soluciones = [], []
+    rastro = []
+
+    def expandir(nivel: int):
+        fila, columna = estado.nave.posicion
+        if universo.es_destino(fila, columna):
+            soluciones.append(estado._solucion_actual())
+            return
+        if nivel == profundidad:
+            prefijos.append(estado.nave.camino.copy())
+            return
+        for df, dc in universo._movimientos_ordenados(fila, columna):
+            nueva_fila, nueva_columna = fila + df, columna + dc
+            if (not universo.es_valida(nueva_fila, nueva_columna) or
+                    estado.visitada(nueva_fila, nueva_columna) or
+                    not estado.es_segura(nueva_fila, nueva_columna)):
+                continue
+            marca = len(rastro)
+            if estado._avanzar(nueva_fila, nueva_columna, rastro) is not None:
+                expandir(nivel + 1)
+                estado._deshacer(rastro, marca)
+
+    if estado.nave.energia > 0 or universo.es_destino(*universo.origen):
+        expandir(0)
+    return prefijos, soluciones
+
+
+def resolver_en_paralelo(estado: EstadoBusqueda, trabajadores: Optional[int] = None,
+                         profundidad_division: int = 3) -> List[dict]:
+    """
+    Busca el camino más corto repartiendo la frontera entre procesos.
+    Devuelve las soluciones que fueron mejorando la cota, de la mejor a la peor.
+    Los nodos expandidos y el motivo de parada se acumulan en el presupuesto del estado
+    y, si las hay, las estadísticas de los procesos en las del estado.
+    """
+    trabajadores = trabajadores or os.cpu_count() or 1
+    presupuesto = estado.presupuesto
+    prefijos, soluciones = generar_frontera(estado, profundidad_division)
+
+    mejor = min((len(sol['camino']) - 1 for sol in soluciones), default=SIN_COTA)
+    cota = multiprocessing.Value('i', mejor)
+    parada = multiprocessing.Event()
+    restante = presupuesto.restante()
+    limite = None if restante is None else time.time() + restante
+    nodos_por_prefijo = None
+    if presupuesto.max_nodos is not None and prefijos:
+        nodos_por_prefijo = max(1, presupuesto.max_nodos // len(prefijos))
+
+    if prefijos:
+        with ProcessPoolExecutor(max_workers=trabajadores, initializer=_inicializar_trabajador,
+                                 initargs=(estado.universo, estado.descartadas, cota, parada, limite, nodos_por_prefijo)) as ejecutor:
+            con_estadisticas = estado.estadisticas is not None
+            pendientes = {ejecutor.submit(_explorar_prefijo, prefijo, con_estadisticas) for prefijo in prefijos}
+            while pendientes:
+                terminados, pendientes = wait(pendientes, timeout=INTERVALO_ESPERA,
+                                              return_when=FIRST_COMPLETED)
+                if presupuesto.verificar():
+                    parada.set()
+                for futuro in terminados:
+                    encontradas, nodos, motivo, estadisticas = futuro.result()
+                    soluciones.extend(encontradas)
+                    if estadisticas is not None:
+                        estado.estadisticas.acumular(estadisticas)
+                    presupuesto.nodos += nodos
+                    if motivo is not None and presupuesto.motivo is None:
+                        presupuesto.motivo = motivo
+
+    soluciones.sort(key=lambda sol: len(sol['camino']))
+    return soluciones
@@ -0,0 +1,258 @@
+"""
+Módulo de búsqueda multiobjetivo (frente de Pareto)
+
+Búsqueda por etiquetas (label-setting) sobre el mismo espacio de estados que
+motor_busqueda, con tres objetivos a la vez:
+    - menos pasos
+    - más energía al llegar
+    - más estrellas disponibles al llegar
+
+Las etiquetas se extraen en orden de pasos + heurística (como en A*, así las
+primeras llegadas aparecen pronto). Una etiqueta se descarta apenas
+otra en la misma celda (y con los mismos agujeros de gusano usados) la domina:
+    - a lo sumo los mismos pasos y al menos la misma energía
+    - si usó recargas que la otra conserva, energía de sobra para cubrir el
+      producto de sus factores (la otra todavía puede multiplicar por ellos)
+    - suficientes estrellas de ventaja para cubrir las estrellas que solo la
+      otra puede recolectar todavía y los agujeros negros que solo la otra ya
+      destruyó
+Como las recargas no cobran costo ni siquiera usadas, restar un costo o
+multiplicar por un factor común conserva la ventaja; así, siguiendo cualquier
+continuación, la dominante llega con al menos la misma energía y estrellas en
+los mismos pasos o menos.
+
+Además, una etiqueta se deja de expandir si ningún futuro suyo puede salir del
+frente de llegadas. Usar una recarga exige al menos llegar a ella y de ahí al
+destino, así que con las recargas sin usar ordenadas por esa cota de pasos, cada
+prefijo da la mayor energía posible con al menos esos pasos; si ninguna supera
+la mejor llegada del frente con esos pasos o menos (y todas las estrellas
+restantes), la etiqueta no aporta. Esto supone costos de celda no negativos.
+
+Aun así, con la densidad por defecto las combinaciones de estrellas y recargas
+usadas dejan cientos de etiquetas no dominadas por celda y la búsqueda exacta no
+termina a 10x10. Por eso cada grupo guarda a lo sumo 'max_etiquetas': si se llena,
+se descarta la peor en (pasos, energía, estrellas), la nueva o una guardada. Un
+recorte así, igual que agotar el presupuesto, deja el frente incompleto: sus
+rutas son válidas pero puede faltar alguna no dominada (o sobrar alguna que una
+ruta perdida dominaba).
+"""
+
+import heapq
+from typing import Dict, List, Optional, Tuple
+
+from modules.motor_busqueda import MOVIMIENTOS, ProblemaUniverso, reconstruir
+from modules.presupuesto import Presupuesto
+from modules.estadisticas import EstadisticasBusqueda, PODA_DOMINANCIA, PODA_RECORTE, PODA_SIN_ENERGIA
+
+# Etiqueta: (pasos, energía, estrellas, m_est, m_neg, m_rec, id de nodo)
+Etiqueta = Tuple[int, int, int, int, int, int, int]
+
+# Etiquetas vivas por celda y máscara de gusanos
+MAX_ETIQUETAS_POR_DEFECTO = 8
+
+
+def _orden(etiqueta: Etiqueta) -> Tuple[int, int, int]:
+    """Clave de descarte: la mayor es la peor (más pasos, menos energía, menos estrellas)"""
+    return etiqueta[0], -etiqueta[1], -etiqueta[2]
+
+
+def _bits(mascara: int) -> int:
+    return bin(mascara).count("1") if mascara else 0
+
+
+def _domina(a: Etiqueta, b: Etiqueta, factores: List[int]) -> bool:
+    if a[0] > b[0] or a[1] < b[1]:
+        return False
+    # Estrellas que b aún puede ganar respecto de a, y agujeros que a todavía debe pagar
+    desventaja = _bits(a[3] & ~b[3]) + _bits(b[4] & ~a[4])
+    if a[2] - b[2] < desventaja:
+        return False
+    # Recargas que a ya usó y b conserva: b puede multiplicar su energía por cada una
+    solo_a = a[5] & ~b[5]
+    energia_b = b[1]
+    while solo_a and energia_b > 0:
+        menor = solo_a & -solo_a
+        energia_b *= factores[menor.bit_length() - 1]
+        if energia_b > a[1]:
+            return False
+        solo_a ^= menor
+    return True
+
+
+def _cotas_recargas(problema: ProblemaUniverso) -> List[Tuple[int, int, int, Tuple[int, int]]]:
+    """(pasos mínimos de la recarga al destino, bit, factor, posición) de cada recarga"""
+    return [(problema.heuristica(posicion), bit, factor, posicion)
+            for posicion, (bit, factor) in problema.recargas.items()]
+
+
+def _inalcanzable(problema: ProblemaUniverso, etiqueta: Etiqueta, posicion: Tuple[int, int],
+                  llegadas: List[Tuple[int, int, int]], cotas_recargas: list) -> bool:
+    """
+    True si ningún futuro de la etiqueta puede salir del frente: para cada conjunto de
+    recargas que podría usar, alguna llegada tiene a lo sumo sus pasos mínimos y al menos
+    su energía máxima y todas las estrellas que podría juntar. llegadas: (pasos, -energía,
+    -estrellas) del frente, ordenadas por pasos.
+    """
+    pasos, energia, estrellas, m_est, m_neg, m_rec, _ = etiqueta
+    estrellas_max = estrellas + len(problema.estrellas) - _bits(m_est)
+    utiles = [(pasos_f, -energia_f) for pasos_f, energia_f, estrellas_f in llegadas if -estrellas_f >= estrellas_max]
+    if not utiles:
+        return False
+
+    def mejor_energia(pasos_max: int) -> Optional[int]:
+        mejor = None
+        for pasos_f, energia_f in utiles:
+            if pasos_f > pasos_max:
+                break
+            if mejor is None or energia_f > mejor:
+                mejor = energia_f
+        return mejor
+
+    pasos_min = pasos + problema.heuristica(posicion)
+    tope = mejor_energia(pasos_min)
+    if tope is None or energia > tope:
+        return False
+    # Sin gusanos, llegar a la recarga cuesta al menos la distancia Manhattan; con gusanos, un paso
+    directo = not problema.gusanos
+    pendientes = sorted((max(pasos_min, pasos + cota + (abs(r[0] - posicion[0]) + abs(r[1] - posicion[1])
+                                                        if directo else 1)), factor)
+                        for cota, bit, factor, r in cotas_recargas if not (m_rec >> bit) & 1)
+    energia_max = energia
+    for pasos_recarga, factor in pendientes:
+        energia_max *= factor
+        tope = mejor_energia(pasos_recarga)
+        if tope is None or energia_max > tope:
+            return False
+    return True
+
+
+def buscar_pareto(problema: ProblemaUniverso, presupuesto: Optional[Presupuesto] = None,
+                  estadisticas: Optional[EstadisticasBusqueda] = None,
+                  max_etiquetas: int = MAX_ETIQUETAS_POR_DEFECTO) -> Tuple[List[dict], bool]:
+    """
+    Devuelve (rutas no dominadas en pasos, energía final y estrellas finales ordenadas
+    por pasos, completo). completo es False si el presupuesto se agotó o si se recortó
+    algún grupo de etiquetas: las rutas son el frente hallado hasta ahí.
+    """
+    if max_etiquetas <= 0:
+        raise ValueError("Las etiquetas por celda deben ser positivas")
+    destino = problema.destino
+    nodos: List[Tuple[int, Tuple[int, int], int, int]] = [(-1, problema.origen, problema.carga_inicial, 0)]
+    # Etiquetas vivas por (posición, máscara de gusanos)
+    grupos: Dict[tuple, List[Etiqueta]] = {}
+    descartados = set()
+    abiertos = []
+    # Llegadas no dominadas: ((pasos, -energía, -estrellas), id de nodo)
+    frente: List[Tuple[Tuple[int, int, int], int]] = []
+    factores = [0] * len(problema.recargas)
+    for bit, factor in problema.recargas.values():
+        factores[bit] = factor
+    cotas_recargas = _cotas_recargas(problema)
+    completo = True
+
+    def insertar(posicion, m_gus, etiqueta: Etiqueta):
+        nonlocal completo
+        clave = (posicion, m_gus)
+        grupo = grupos.get(clave)
+        if grupo is None:
+            grupos[clave] = grupo = []
+        pasos, energia = etiqueta[0], etiqueta[1]
+        # Una sola pasada: el grupo es una anticadena, así que si alguna etiqueta domina
+        # a la nueva, la nueva no puede dominar a ninguna otra del grupo
+        vigentes = []
+        for otra in grupo:
+            if otra[0] <= pasos and otra[1] >= energia and _domina(otra, etiqueta, factores):
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_DOMINANCIA)
+                return
+            if pasos <= otra[0] and energia >= otra[1] and _domina(etiqueta, otra, factores):
+                descartados.add(otra[6])
+            else:
+                vigentes.append(otra)
+        if len(vigentes) >= max_etiquetas:
+            completo = False
+            if estadisticas is not None:
+                estadisticas.podar(PODA_RECORTE)
+            peor = max(range(len(vigentes)), key=lambda i: _orden(vigentes[i]))
+            if _orden(etiqueta) >= _orden(vigentes[peor]):
+                grupos[clave] = vigentes
+                return
+            descartados.add(vigentes[peor][6])
+            vigentes[peor] = vigentes[-1]
+            vigentes.pop()
+        vigentes.append(etiqueta)
+        grupos[clave] = vigentes
+        heapq.heappush(abiertos, (pasos + problema.heuristica(posicion), -energia, -etiqueta[2],
+                                  etiqueta[6], m_gus, etiqueta))
+
+    if problema.carga_inicial > 0 or problema.origen == destino:
+        insertar(problema.origen, 0, (0, problema.carga_inicial, 0, 0, 0, 0, 0))
+
+    while abiertos:
+        _, _, _, id_nodo, m_gus, etiqueta = heapq.heappop(abiertos)
+        if id_nodo in descartados:
+            continue
+        pasos, energia, estrellas, m_est, m_neg, m_rec, _ = etiqueta
+        posicion = nodos[id_nodo][1]
+
+        # El viaje termina en el destino: la etiqueta entra al frente si nadie la domina
+        if posicion == destino:
+            llegada = (pasos, -energia, -estrellas)
+            if not any(f[0] <= llegada[0] and f[1] <= llegada[1] and f[2] <= llegada[2] for f, _ in frente):
+                frente = [(f, i) for f, i in frente
+                          if not (llegada[0] <= f[0] and llegada[1] <= f[1] and llegada[2] <= f[2])]
+                frente.append((llegada, id_nodo))
+                frente.sort()
+            continue
+
+        if frente and _inalcanzable(problema, etiqueta, posicion, [f for f, _ in frente], cotas_recargas):
+            continue
+
+        if presupuesto is not None and presupuesto.consumir():
+            completo = False
+            break
+        if estadisticas is not None:
+            estadisticas.expandir(pasos)
+
+        for df, dc in MOVIMIENTOS:
+            fila, columna = posicion[0] + df, posicion[1] + dc
+            if not problema.es_valida(fila, columna):
+                continue
+            siguiente = (fila, columna)
+            efecto = problema.entrar(siguiente, energia, estrellas, m_est, m_neg, m_rec)
+            if efecto is None:
+                if estadisticas is not None:
+                    estadisticas.podar(problema.motivo_rechazo(siguiente, m_neg))
+                continue
+            n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+            n_gus = m_gus
+            n_pasos = pasos + 1
+            id_hijo = len(nodos)
+            nodos.append((id_nodo, siguiente, n_energia, n_estrellas))
+
+            # Salto obligatorio por agujero de gusano
+            gusano = problema.gusanos.get(siguiente)
+            if gusano is not None and not (m_gus >> gusano[0]) & 1:
+                bit, salida = gusano
+                efecto = problema.entrar(salida, n_energia, n_estrellas, n_est, n_neg, n_rec)
+                if efecto is None:
+                    if estadisticas is not None:
+                        estadisticas.podar(problema.motivo_rechazo(salida, n_neg))
+                    continue
+                n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+                n_gus |= 1 << bit
+                n_pasos += 1
+                siguiente = salida
+                nodos.append((id_hijo, siguiente, n_energia, n_estrellas))
+                id_hijo += 1
+                if estadisticas is not None:
+                    estadisticas.usar_gusano()
+
+            if n_energia <= 0 and siguiente != destino:
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_SIN_ENERGIA)
+                continue
+            insertar(siguiente, n_gus, (n_pasos, n_energia, n_estrellas, n_est, n_neg, n_rec, id_hijo))
+
+    frente.sort()
+    return [reconstruir(nodos, id_nodo) for _, id_nodo in frente], completo
@@ -0,0 +1,255 @@
+"""
+Módulo de caché de soluciones direccionada por contenido
+
+La clave de una resolución es un hash SHA-256 del contenido canónico del
+universo (dimensiones, origen, destino, carga, costos y elementos en orden
+fijo) junto con el método y sus parámetros. Editar el universo o el archivo
+JSON cambia la clave, así que las entradas viejas nunca se vuelven a leer y
+terminan desalojadas.
+
+Hay dos capas:
+    - memoria: LRU de las últimas 'capacidad_memoria' resoluciones
+    - disco (opcional): un archivo por clave en 'directorio', con un tope de
+      bytes; al superarlo se borran los archivos usados hace más tiempo. El
+      directorio se recorre una sola vez al abrir la caché: después, el tamaño
+      y el orden de uso de cada archivo se llevan en memoria, así que guardar
+      no lista el directorio. Otros procesos que escriben en el mismo
+      directorio no se ven hasta que el total propio supera el tope; entonces
+      se vuelve a recorrer y se recorta hasta FRACCION_RECORTE del tope
+
+Solo se guardan resoluciones que el presupuesto no cortó, por eso los límites
+de tiempo y de nodos no forman parte de la clave. La capa en memoria se protege
+con un cerrojo para que varias resoluciones en hilos compartan la caché.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from modules.matriz_compacta import ZONA_RECARGA
+from modules.solucion_compacta import SolucionCompacta, deserializar_soluciones, serializar_soluciones
+
+_MAGICO = b'CSOL'
+_VERSION = 1
+# magico, versión, largo del estado en JSON
+_CABECERA = struct.Struct('<4sBI')
+_EXTENSION = ".sol"
+# Al recortar se baja hasta esta fracción del tope, para no recorrer el directorio en cada escritura
+FRACCION_RECORTE = 0.9
+
+
+def huella_universo(universo) -> str:
+    """Hash del contenido del universo, independiente del orden de los elementos en el JSON"""
+    celdas = universo.celdas
+    tabla = universo.tabla_gusanos
+    gusanos = [[tabla.entradas[2 * i], tabla.entradas[2 * i + 1], tabla.salidas[2 * i], tabla.salidas[2 * i + 1]]
+               for i in range(len(tabla))]
+    recargas = [[fila, columna, int(celdas.vista_factor_recarga[fila * universo.columnas + columna])]
+                for fila, columna in celdas.coordenadas_con(ZONA_RECARGA)]
+    contenido = {
+        'filas': universo.filas,
+        'columnas': universo.columnas,
+        'origen': list(universo.origen),
+        'destino': list(universo.destino),
+        'carga_inicial': universo.carga_inicial,
+        'agujeros_negros': sorted(list(an) for an in universo.agujeros_negros_originales),
+        'estrellas': sorted(list(eg) for eg in universo.estrellas_gigantes_originales),
+        'gusanos': sorted(gusanos),
+        'recargas': recargas,
+        'cargas_requeridas': sorted([f, c, carga] for (f, c), carga in universo.cargas_requeridas.items()),
+    }
+    huella = hashlib.sha256(json.dumps(contenido, sort_keys=True).encode('utf-8'))
+    huella.update(celdas.huella_costos().encode('ascii'))
+    return huella.hexdigest()
+
+
+def clave_resolucion(huella: str, metodo: str, parametros: dict) -> str:
+    """Clave de una resolución: contenido del universo + método + parámetros que afectan el resultado"""
+    texto = json.dumps({'huella': huella, 'metodo': metodo, 'parametros': parametros}, sort_keys=True)
+    return hashlib.sha256(texto.encode('utf-8')).hexdigest()
+
+
+class CacheSoluciones:
+    """LRU en memoria con respaldo opcional en disco, limitado en bytes"""
+
+    def __init__(self, directorio: Optional[str] = None, capacidad_memoria: int = 32,
+                 max_bytes_disco: int = 64 * 1024 * 1024):
+        if capacidad_memoria <= 0:
+            raise ValueError("La capacidad en memoria debe ser positiva")
+        if max_bytes_disco <= 0:
+            raise ValueError("El tamaño máximo en disco debe ser positivo")
+        self.directorio = directorio
+        self.capacidad_memoria = capacidad_memoria
+        self.max_bytes_disco = max_bytes_disco
+        self._memoria: "OrderedDict[str, Tuple[List[SolucionCompacta], dict]]" = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        # Archivos en disco: clave -> bytes, del usado hace más tiempo al más reciente
+        self._disco: "OrderedDict[str, int]" = OrderedDict()
+        self._bytes_disco = 0
+        if directorio is not None:
+            os.makedirs(directorio, exist_ok=True)
+            self._indexar_disco()
+
+    def __len__(self) -> int:
+        return len(self._memoria)
+
+    def obtener(self, clave: str) -> Optional[Tuple[List[SolucionCompacta], dict]]:
+        """(soluciones, estado de la resolución) guardados con la clave, o None"""
+        with self._cerrojo:
+            entrada = self._memoria.get(clave)
+            if entrada is not None:
+                self._memoria.move_to_end(clave)
+        if entrada is None and self.directorio is not None:
+            entrada = self._leer_disco(clave)
+            if entrada is not None:
+                self._recordar(clave, entrada)
+        with self._cerrojo:
+            if entrada is None:
+                self.fallos += 1
+                return None
+            self.aciertos += 1
+        return list(entrada[0]), dict(entrada[1])
+
+    def guardar(self, clave: str, soluciones: List[dict], estado: dict):
+        compactas = [sol if isinstance(sol, SolucionCompacta) else SolucionCompacta.desde_dict(sol)
+                     for sol in soluciones]
+        entrada = (compactas, dict(estado))
+        self._recordar(clave, entrada)
+        if self.directorio is not None:
+            self._escribir_disco(clave, entrada)
+
+    def limpiar(self):
+        """Vacía ambas capas"""
+        with self._cerrojo:
+            self._memoria.clear()
+            self._disco.clear()
+            self._bytes_disco = 0
+        for ruta, _, _ in self._archivos():
+            self._borrar(ruta)
+
+    @property
+    def entradas_disco(self) -> int:
+        return len(self._disco)
+
+    @property
+    def bytes_disco(self) -> int:
+        return self._bytes_disco
+
+    def _recordar(self, clave: str, entrada: Tuple[List[SolucionCompacta], dict]):
+        with self._cerrojo:
+            self._memoria[clave] = entrada
+            self._memoria.move_to_end(clave)
+            while len(self._memoria) > self.capacidad_memoria:
+                self._memoria.popitem(last=False)
+
+    # --- Capa en disco ---
+
+    def _ruta(self, clave: str) -> str:
+        return os.path.join(self.directorio, clave + _EXTENSION)
+
+    def _indexar_disco(self):
+        """Arma el índice en memoria de los archivos del directorio (por fecha de uso)"""
+        archivos = sorted(self._archivos(), key=lambda archivo: archivo[1])
+        with self._cerrojo:
+            self._disco.clear()
+            for ruta, _, tamano in archivos:
+                self._disco[os.path.basename(ruta)[:-len(_EXTENSION)]] = tamano
+            self._bytes_disco = sum(self._disco.values())
+
+    def _anotar_disco(self, clave: str, tamano: Optional[int]):
+        """Registra el uso (o con tamano None, el borrado) de un archivo en el índice"""
+        with self._cerrojo:
+            self._bytes_disco -= self._disco.pop(clave, 0)
+            if tamano is not None:
+                self._disco[clave] = tamano
+                self._bytes_disco += tamano
+
+    def _leer_disco(self, clave: str) -> Optional[Tuple[List[SolucionCompacta], dict]]:
+        ruta = self._ruta(clave)
+        try:
+            with open(ruta, 'rb') as f:
+                datos = f.read()
+        except OSError:
+            return None
+        try:
+            magico, version, largo = _CABECERA.unpack_from(datos)
+            if magico != _MAGICO or version != _VERSION:
+                raise ValueError("Formato de caché desconocido")
+            inicio = _CABECERA.size
+            estado = json.loads(datos[inicio:inicio + largo].decode('utf-8'))
+            soluciones = deserializar_soluciones(datos[inicio + largo:])
+        except (ValueError, struct.error):
+            # Entrada corrupta o de otra versión: se descarta como si no existiera
+            self._borrar(ruta)
+            self._anotar_disco(clave, None)
+            return None
+        # Marca de uso para el desalojo LRU (también para otros procesos, por la fecha del archivo)
+        self._anotar_disco(clave, len(datos))
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+        return soluciones, estado
+
+    def _escribir_disco(self, clave: str, entrada: Tuple[List[SolucionCompacta], dict]):
+        soluciones, estado = entrada
+        texto = json.dumps(estado).encode('utf-8')
+        datos = b''.join((_CABECERA.pack(_MAGICO, _VERSION, len(texto)), texto,
+                          serializar_soluciones(soluciones)))
+        if len(datos) > self.max_bytes_disco:
+            return
+        ruta = self._ruta(clave)
+        temporal = f"{ruta}.{os.getpid()}.tmp"
+        with open(temporal, 'wb') as f:
+            f.write(datos)
+        # Reemplazo atómico: otro proceso nunca lee un archivo a medio escribir
+        os.replace(temporal, ruta)
+        self._anotar_disco(clave, len(datos))
+        if self._bytes_disco > self.max_bytes_disco:
+            self._recortar_disco()
+
+    def _archivos(self) -> List[Tuple[str, float, int]]:
+        if self.directorio is None:
+            return []
+        archivos = []
+        with os.scandir(self.directorio) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(_EXTENSION):
+                    try:
+                        info = entrada.stat()
+                    except OSError:
+                        continue
+                    archivos.append((entrada.path, info.st_mtime, info.st_size))
+        return archivos
+
+    def _recortar_disco(self):
+        """
+        Borra los archivos usados hace más tiempo hasta quedar en FRACCION_RECORTE del tope.
+        Antes vuelve a recorrer el directorio, para contar lo que escribieron otros procesos.
+        """
+        self._indexar_disco()
+        objetivo = int(self.max_bytes_disco * FRACCION_RECORTE)
+        while True:
+            with self._cerrojo:
+                if self._bytes_disco <= objetivo or not self._disco:
+                    return
+                clave, tamano = self._disco.popitem(last=False)
+                self._bytes_disco -= tamano
+            self._borrar(self._ruta(clave))
+
+    @staticmethod
+    def _borrar(ruta: str):
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+
+    def __repr__(self) -> str:
+        return (f"CacheSoluciones(directorio={self.directorio!r}, en_memoria={len(self._memoria)}, "
+                f"aciertos={self.aciertos}, fallos={self.fallos})")
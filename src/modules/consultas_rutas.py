@@ -0,0 +1,154 @@
+"""
+Módulo de consultas de rutas sobre un mismo universo
+
+Responde muchas preguntas origen -> destino (con su carga inicial) sin rehacer
+lo que no depende de la consulta:
+    - ProblemaUniverso (elementos indexados) se arma una sola vez
+    - tabla de atajos entre agujeros de gusano: pasos relajados de la salida de
+      cada gusano a la salida de cualquier otro (Floyd-Warshall, una vez)
+    - mapa de costo restante por destino: pasos relajados de cada celda al destino,
+      guardado en una LRU de destinos; la heurística pasa a ser una lectura
+
+En la relajación todas las celdas son transitables y los gusanos pueden usarse
+siempre, así que la distancia es Manhattan o una cadena de gusanos; es la misma
+cota que ProblemaUniverso.heuristica calcula recorriendo los gusanos en cada
+llamada. Fuera de memoria no se arman mapas (ocuparían toda la grilla) y se usa
+esa forma con las cotas de las salidas precalculadas por destino.
+
+Varios hilos pueden consultar a la vez (la LRU y los contadores van con un
+cerrojo); editar el universo mientras hay consultas en curso no está soportado.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from modules.estadisticas import EstadisticasBusqueda
+from modules.motor_busqueda import ProblemaUniverso, buscar
+from modules.presupuesto import Presupuesto
+from modules.solucion_compacta import SolucionCompacta
+
+
+class ConsultasRutas:
+    """Rutas A* entre pares arbitrarios de celdas de un universo, con precálculos compartidos"""
+
+    def __init__(self, universo, capacidad_destinos: int = 8):
+        if capacidad_destinos <= 0:
+            raise ValueError("La capacidad de destinos debe ser positiva")
+        self.problema = ProblemaUniverso(universo)
+        self.filas = universo.filas
+        self.columnas = universo.columnas
+        self.carga_inicial = universo.carga_inicial
+        self.capacidad_destinos = capacidad_destinos
+        self._con_mapas = universo.celdas.en_memoria
+        self._mapas: "OrderedDict[Tuple[int, int], memoryview]" = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self.consultas = 0
+        self.mapas_calculados = 0
+
+        gusanos = list(self.problema.gusanos.items())
+        self._entradas = np.array([entrada for entrada, _ in gusanos], dtype=np.int64).reshape(-1, 2)
+        self._salidas = np.array([salida for _, (_, salida) in gusanos], dtype=np.int64).reshape(-1, 2)
+        self._atajos = self._calcular_atajos()
+
+    def _calcular_atajos(self) -> np.ndarray:
+        """atajos[i, j]: pasos relajados desde la salida de i hasta la salida de j (entrando por j)"""
+        salidas, entradas = self._salidas, self._entradas
+        atajos = (np.abs(salidas[:, None, :] - entradas[None, :, :]).sum(axis=2) + 1)
+        for k in range(len(atajos)):
+            np.minimum(atajos, atajos[:, k:k + 1] + atajos[k:k + 1, :], out=atajos)
+        return atajos
+
+    def _cotas_salidas(self, destino: Tuple[int, int]) -> np.ndarray:
+        """Pasos relajados desde la salida de cada gusano hasta el destino"""
+        directas = np.abs(self._salidas - np.asarray(destino)).sum(axis=1)
+        if not len(directas):
+            return directas
+        return np.minimum(directas, (self._atajos + directas[None, :]).min(axis=1))
+
+    def _mapa(self, destino: Tuple[int, int]) -> memoryview:
+        """Pasos relajados de cada celda al destino (índice plano), calculado una vez por destino"""
+        with self._cerrojo:
+            mapa = self._mapas.get(destino)
+            if mapa is not None:
+                self._mapas.move_to_end(destino)
+                return mapa
+        filas = np.arange(self.filas, dtype=np.int32)[:, None]
+        columnas = np.arange(self.columnas, dtype=np.int32)[None, :]
+        tabla = np.abs(filas - destino[0]) + np.abs(columnas - destino[1])
+        for (fila, columna), cota in zip(self._entradas.tolist(), self._cotas_salidas(destino).tolist()):
+            np.minimum(tabla, np.abs(filas - fila) + np.abs(columnas - columna) + (1 + cota), out=tabla)
+        mapa = memoryview(tabla.reshape(-1))
+        with self._cerrojo:
+            # Otro hilo pudo calcular el mismo destino mientras tanto
+            if destino in self._mapas:
+                self._mapas.move_to_end(destino)
+                return self._mapas[destino]
+            self._mapas[destino] = mapa
+            self.mapas_calculados += 1
+            while len(self._mapas) > self.capacidad_destinos:
+                self._mapas.popitem(last=False)
+        return mapa
+
+    def heuristica(self, destino: Tuple[int, int]) -> Callable[[Tuple[int, int]], int]:
+        """Cota inferior admisible de pasos hasta el destino, para una consulta"""
+        if self._con_mapas:
+            mapa = self._mapa(destino)
+            columnas = self.columnas
+            return lambda posicion: mapa[posicion[0] * columnas + posicion[1]]
+
+        manhattan = ProblemaUniverso.manhattan
+        cotas = list(zip(map(tuple, self._entradas.tolist()), (self._cotas_salidas(destino) + 1).tolist()))
+
+        def heuristica(posicion: Tuple[int, int]) -> int:
+            mejor = manhattan(posicion, destino)
+            for entrada, cota in cotas:
+                candidata = manhattan(posicion, entrada) + cota
+                if candidata < mejor:
+                    mejor = candidata
+            return mejor
+        return heuristica
+
+    def ruta(self, origen: Sequence[int], destino: Sequence[int], carga: Optional[int] = None,
+             presupuesto: Optional[Presupuesto] = None,
+             estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[SolucionCompacta]:
+        """
+        Ruta de menos pasos desde origen hasta destino con la carga indicada (por defecto la
+        del universo), partiendo del estado inicial de estrellas, agujeros negros y gusanos.
+        None si no existe; con el presupuesto agotado, la ruta parcial marcada 'completa': False.
+        """
+        origen, destino = tuple(origen), tuple(destino)
+        for fila, columna in (origen, destino):
+            if not self.problema.es_valida(fila, columna):
+                raise ValueError(f"Celda fuera de la matriz: ({fila}, {columna})")
+        with self._cerrojo:
+            self.consultas += 1
+        problema = copy.copy(self.problema)
+        problema.origen = origen
+        problema.destino = destino
+        problema.carga_inicial = self.carga_inicial if carga is None else carga
+        problema.heuristica = self.heuristica(destino)
+        return buscar(problema, True, presupuesto, estadisticas)
+
+    def rutas(self, consultas: Iterable[Sequence], max_segundos: Optional[float] = None,
+              max_nodos: Optional[int] = None) -> List[Optional[SolucionCompacta]]:
+        """
+        Responde una lista de consultas (origen, destino) o (origen, destino, carga) en el
+        mismo orden. Se agrupan por destino para calcular cada mapa de costo restante una vez;
+        max_segundos y max_nodos acotan cada consulta por separado.
+        """
+        consultas = [tuple(consulta) for consulta in consultas]
+        respuestas: List[Optional[SolucionCompacta]] = [None] * len(consultas)
+        orden = sorted(range(len(consultas)), key=lambda i: tuple(consultas[i][1]))
+        for i in orden:
+            origen, destino, *carga = consultas[i]
+            respuestas[i] = self.ruta(origen, destino, carga[0] if carga else None,
+                                      Presupuesto(max_segundos, max_nodos))
+        return respuestas
+
+    def __repr__(self) -> str:
+        return (f"ConsultasRutas(consultas={self.consultas}, mapas_calculados={self.mapas_calculados}, "
+                f"mapas_en_memoria={len(self._mapas)})")
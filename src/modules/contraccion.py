@@ -0,0 +1,348 @@
+"""
+Módulo de contracción de corredores
+
+La mayoría de las celdas son comunes: solo cobran su costo. El grafo contraído
+tiene como nodos las celdas especiales (origen, destino, estrellas, agujeros
+negros, entradas y salidas de gusanos, zonas de recarga y celdas con carga
+requerida) y como aristas los corredores de celdas comunes entre dos de ellas.
+
+Entre dos nodos se guardan todos los corredores Pareto-óptimos en (pasos, costo):
+uno más largo solo sirve si gasta menos energía. Con costos no negativos la
+energía baja a lo largo del corredor, así que basta exigir que siga positiva al
+llegar a su última celda común. Cualquier ruta óptima puede reemplazar cada
+tramo entre celdas especiales por un corredor que lo domina, por eso la búsqueda
+sobre el grafo contraído encuentra la misma cantidad de pasos que sobre la grilla.
+
+Los corredores que gastan toda la energía que la nave podría llegar a tener
+(carga inicial por todos los factores de recarga) no se guardan. La búsqueda de
+corredores avanza por capas de pasos con operaciones de NumPy sobre la frontera. El grafo solo
+depende de la capa estática del universo; las celdas descartadas de cada
+resolución se respetan al entrar a los nodos.
+
+Los corredores de cada nodo quedan guardados, pero las capas de su búsqueda (que
+sirven para reconstruir las celdas de un corredor y ocupan del orden de la grilla)
+se guardan solo para los últimos max_capas nodos, con desalojo LRU. Si hacen
+falta las de un nodo desalojado se recalculan: la búsqueda es determinista y
+las posiciones de los corredores siguen valiendo.
+"""
+
+import heapq
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from modules.motor_busqueda import MOVIMIENTOS, ProblemaUniverso
+from modules.presupuesto import Presupuesto
+from modules.solucion_compacta import SolucionCompacta
+from modules.estadisticas import EstadisticasBusqueda, PODA_DOMINANCIA, PODA_SIN_ENERGIA
+
+# Corredor: (nodo de llegada, pasos, costo de las celdas comunes, (capa, posición) de su última celda común)
+Corredor = Tuple[Tuple[int, int], int, int, Tuple[int, int]]
+# Capa de la búsqueda de corredores: (índices planos, posición de la etiqueta anterior)
+Capa = Tuple[np.ndarray, np.ndarray]
+
+
+class GrafoContraido:
+    """
+    Celdas especiales y corredores Pareto-óptimos de celdas comunes entre ellas.
+    Los corredores de cada nodo se calculan la primera vez que la búsqueda lo expande
+    y quedan guardados para las búsquedas siguientes; las capas, solo para max_capas nodos.
+    """
+
+    def __init__(self, problema: ProblemaUniverso, max_capas: int = 64):
+        if max_capas <= 0:
+            raise ValueError("La cantidad máxima de capas guardadas debe ser positiva")
+        self.filas = problema.filas
+        self.columnas = problema.columnas
+        total = self.filas * self.columnas
+        self.costos = np.asarray(problema.costos, dtype=np.int64)
+        nodos = {problema.origen, problema.destino}
+        nodos.update(problema.estrellas)
+        nodos.update(problema.agujeros_negros)
+        nodos.update(problema.recargas)
+        nodos.update(problema.cargas_requeridas)
+        for entrada, (_, salida) in problema.gusanos.items():
+            nodos.add(entrada)
+            nodos.add(salida)
+        self.nodos = frozenset(nodos)
+        self.celdas_comunes = total - len(self.nodos)
+        self._es_nodo = np.zeros(total, dtype=bool)
+        self._es_nodo[[fila * self.columnas + columna for fila, columna in self.nodos]] = True
+
+        # Ningún corredor útil gasta más que la energía máxima posible ni más que todas las celdas
+        energia_maxima = problema.carga_inicial
+        for _, factor in problema.recargas.values():
+            energia_maxima *= max(factor, 1)
+        self.limite = int(min(energia_maxima, int(self.costos.sum()) + 1))
+
+        self.cotas = self._calcular_cotas(problema)
+
+        self._corredores: Dict[Tuple[int, int], List[Corredor]] = {}
+        # Por nodo, capas de su búsqueda: (índices planos, posición de la etiqueta anterior), en LRU
+        self.max_capas = max_capas
+        self._capas: "OrderedDict[Tuple[int, int], List[Capa]]" = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self.recalculos = 0
+
+    def _calcular_cotas(self, problema: ProblemaUniverso) -> Dict[Tuple[int, int], int]:
+        """Heurística de ProblemaUniverso para todos los nodos a la vez (la búsqueda solo pisa nodos)"""
+        nodos = sorted(self.nodos)
+        posiciones = np.array(nodos, dtype=np.int64)
+        cotas = np.abs(posiciones - np.asarray(problema.destino)).sum(axis=1)
+        for entrada, cota in problema.cotas_gusanos:
+            np.minimum(cotas, np.abs(posiciones - np.asarray(entrada)).sum(axis=1) + cota, out=cotas)
+        return dict(zip(nodos, cotas.tolist()))
+
+    def corredores(self, nodo: Tuple[int, int]) -> List[Corredor]:
+        corredores = self._corredores.get(nodo)
+        if corredores is None:
+            corredores, capas = self._calcular(nodo)
+            self._guardar_capas(nodo, capas)
+            self._corredores[nodo] = corredores
+        return corredores
+
+    def _guardar_capas(self, nodo: Tuple[int, int], capas: List[Capa]):
+        with self._cerrojo:
+            self._capas[nodo] = capas
+            self._capas.move_to_end(nodo)
+            while len(self._capas) > self.max_capas:
+                self._capas.popitem(last=False)
+
+    def _capas_de(self, nodo: Tuple[int, int]) -> List[Capa]:
+        with self._cerrojo:
+            capas = self._capas.get(nodo)
+            if capas is not None:
+                self._capas.move_to_end(nodo)
+                return capas
+        self.recalculos += 1
+        _, capas = self._calcular(nodo)
+        self._guardar_capas(nodo, capas)
+        return capas
+
+    def calculado(self, nodo: Tuple[int, int]) -> bool:
+        """True si los corredores del nodo ya están calculados"""
+        return nodo in self._corredores
+
+    def _vecinos(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(vecinos, posición en 'indices' de la celda de la que salen) dentro de la grilla"""
+        filas, columnas = np.divmod(indices, self.columnas)
+        posiciones = np.arange(len(indices))
+        vecinos, origenes = [], []
+        for df, dc in MOVIMIENTOS:
+            validos = ((filas + df >= 0) & (filas + df < self.filas) &
+                       (columnas + dc >= 0) & (columnas + dc < self.columnas))
+            vecinos.append(indices[validos] + (df * self.columnas + dc))
+            origenes.append(posiciones[validos])
+        return np.concatenate(vecinos), np.concatenate(origenes)
+
+    @staticmethod
+    def _minimos(destinos: np.ndarray, costos: np.ndarray) -> np.ndarray:
+        """Posiciones del menor costo por destino"""
+        orden = np.lexsort((costos, destinos))
+        primeros = np.ones(len(orden), dtype=bool)
+        primeros[1:] = destinos[orden][1:] != destinos[orden][:-1]
+        return orden[primeros]
+
+    def _calcular(self, nodo: Tuple[int, int]) -> Tuple[List[Corredor], List[Capa]]:
+        """
+        Búsqueda por capas de pasos, vectorizada: en cada capa una celda común queda con
+        su etiqueta más barata, y solo si mejora todas las de capas anteriores.
+        Devuelve (corredores, capas).
+        """
+        total = self.filas * self.columnas
+        inicio = nodo[0] * self.columnas + nodo[1]
+        mejor_costo = np.full(total, self.limite, dtype=np.int64)
+        mejor_llegada = np.full(total, self.limite, dtype=np.int64)
+        mejor_llegada[inicio] = -1  # volver al nodo de partida no sirve
+        indices = np.array([inicio], dtype=np.int64)
+        acumulados = np.zeros(1, dtype=np.int64)
+        capas = [(indices, np.full(1, -1, dtype=np.int64))]
+        corredores = []
+        pasos = 0
+        while len(indices):
+            pasos += 1
+            vecinos, origenes = self._vecinos(indices)
+            costos = acumulados[origenes]
+            a_nodo = self._es_nodo[vecinos]
+
+            # Llegadas a nodos: el costo es el de las celdas comunes recorridas
+            llegadas, desde, costo_llegada = vecinos[a_nodo], origenes[a_nodo], costos[a_nodo]
+            mejora = costo_llegada < mejor_llegada[llegadas]
+            llegadas, desde, costo_llegada = llegadas[mejora], desde[mejora], costo_llegada[mejora]
+            elegidas = self._minimos(llegadas, costo_llegada)
+            mejor_llegada[llegadas[elegidas]] = costo_llegada[elegidas]
+            capa = len(capas) - 1
+            for indice, posicion, costo in zip(llegadas[elegidas].tolist(), desde[elegidas].tolist(),
+                                               costo_llegada[elegidas].tolist()):
+                corredores.append((divmod(indice, self.columnas), pasos, costo, (capa, posicion)))
+
+            # Celdas comunes: siguen solo las etiquetas que mejoran el costo de su celda
+            comunes, desde = vecinos[~a_nodo], origenes[~a_nodo]
+            nuevos = costos[~a_nodo] + self.costos[comunes]
+            mejora = nuevos < mejor_costo[comunes]
+            comunes, desde, nuevos = comunes[mejora], desde[mejora], nuevos[mejora]
+            elegidas = self._minimos(comunes, nuevos)
+            indices, acumulados = comunes[elegidas], nuevos[elegidas]
+            mejor_costo[indices] = acumulados
+            capas.append((indices, desde[elegidas]))
+        return corredores, capas
+
+    def celdas(self, nodo: Tuple[int, int], corredor: Corredor) -> List[Tuple[int, int]]:
+        """Celdas comunes de un corredor que sale del nodo, en orden (sin el nodo ni la llegada)"""
+        capas = self._capas_de(nodo)
+        capa, posicion = corredor[3]
+        celdas = []
+        while capa > 0:
+            indices, anteriores = capas[capa]
+            celdas.append(divmod(int(indices[posicion]), self.columnas))
+            posicion = int(anteriores[posicion])
+            capa -= 1
+        celdas.reverse()
+        return celdas
+
+    @property
+    def aristas(self) -> int:
+        return sum(len(corredores) for corredores in self._corredores.values())
+
+    def __repr__(self) -> str:
+        return (f"GrafoContraido(nodos={len(self.nodos)}, nodos_calculados={len(self._corredores)}, "
+                f"capas_guardadas={len(self._capas)}, aristas={self.aristas}, "
+                f"celdas_comunes={self.celdas_comunes})")
+
+
+def buscar_contraido(grafo: GrafoContraido, problema: ProblemaUniverso,
+                     presupuesto: Optional[Presupuesto] = None,
+                     estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[SolucionCompacta]:
+    """
+    A* sobre el grafo contraído minimizando pasos; la solución se expande a la grilla.
+    Mismo formato y mismas reglas que motor_busqueda.buscar; si el presupuesto se agota
+    devuelve el camino que más se acercó al destino, marcado con 'completa': False.
+    """
+    destino = problema.destino
+    cotas = grafo.cotas
+
+    # Nodos del árbol: (padre, corredor recorrido, nodo, energía, estrellas, entrada del gusano o None)
+    arbol = [(-1, None, problema.origen, problema.carga_inicial, 0, False)]
+    etiquetas: Dict[tuple, List[Tuple[int, int, int]]] = {}
+    descartados = set()
+    abiertos = []
+    mejor_parcial = (grafo.cotas[problema.origen], 0)
+
+    def insertar(id_nodo, posicion, energia, pasos, m_est, m_neg, m_gus, m_rec):
+        clave = (posicion, m_est, m_neg, m_gus, m_rec)
+        lista = etiquetas.setdefault(clave, [])
+        for pasos_e, energia_e, _ in lista:
+            if pasos_e <= pasos and energia_e >= energia:
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_DOMINANCIA)
+                return
+        vigentes = []
+        for etiqueta in lista:
+            if pasos <= etiqueta[0] and energia >= etiqueta[1]:
+                descartados.add(etiqueta[2])
+            else:
+                vigentes.append(etiqueta)
+        vigentes.append((pasos, energia, id_nodo))
+        etiquetas[clave] = vigentes
+        heapq.heappush(abiertos, (pasos + cotas[posicion], -energia, id_nodo,
+                                  pasos, m_est, m_neg, m_gus, m_rec))
+
+    if problema.carga_inicial > 0 or problema.origen == destino:
+        insertar(0, problema.origen, problema.carga_inicial, 0, 0, 0, 0, 0)
+
+    while abiertos:
+        _, _, id_nodo, pasos, m_est, m_neg, m_gus, m_rec = heapq.heappop(abiertos)
+        if id_nodo in descartados:
+            continue
+        _, _, posicion, energia, estrellas, _ = arbol[id_nodo]
+
+        if posicion == destino:
+            return expandir(grafo, arbol, id_nodo)
+
+        if presupuesto is not None:
+            if presupuesto.consumir():
+                return expandir(grafo, arbol, mejor_parcial[1], completa=False)
+            cercania = cotas[posicion]
+            if cercania < mejor_parcial[0]:
+                mejor_parcial = (cercania, id_nodo)
+        # Calcular los corredores de un nodo nuevo puede llevar segundos en grillas grandes:
+        # el reloj se consulta antes, y no solo cada INTERVALO_CONSULTA nodos
+        if presupuesto is not None and not grafo.calculado(posicion) and presupuesto.verificar():
+            return expandir(grafo, arbol, mejor_parcial[1], completa=False)
+        if estadisticas is not None:
+            estadisticas.expandir(pasos)
+
+        for corredor in grafo.corredores(posicion):
+            llegada, largo, costo, _ = corredor
+            # La energía baja a lo largo del corredor: basta revisar la última celda común
+            energia_corredor = energia - costo
+            if largo > 1 and energia_corredor <= 0:
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_SIN_ENERGIA)
+                continue
+            efecto = problema.entrar(llegada, energia_corredor, estrellas, m_est, m_neg, m_rec)
+            if efecto is None:
+                if estadisticas is not None:
+                    estadisticas.podar(problema.motivo_rechazo(llegada, m_neg))
+                continue
+            n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+            n_gus = m_gus
+            n_pasos = pasos + largo
+            siguiente = llegada
+            salto = None
+
+            # Salto obligatorio por agujero de gusano
+            gusano = problema.gusanos.get(llegada)
+            if gusano is not None and not (m_gus >> gusano[0]) & 1:
+                bit, salida = gusano
+                efecto = problema.entrar(salida, n_energia, n_estrellas, n_est, n_neg, n_rec)
+                if efecto is None:
+                    if estadisticas is not None:
+                        estadisticas.podar(problema.motivo_rechazo(salida, n_neg))
+                    continue
+                salto = (llegada, n_energia, n_estrellas)
+                n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+                n_gus |= 1 << bit
+                n_pasos += 1
+                if estadisticas is not None:
+                    estadisticas.usar_gusano()
+                siguiente = salida
+
+            if n_energia <= 0 and siguiente != destino:
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_SIN_ENERGIA)
+                continue
+            arbol.append((id_nodo, corredor, siguiente, n_energia, n_estrellas, salto))
+            insertar(len(arbol) - 1, siguiente, n_energia, n_pasos, n_est, n_neg, n_gus, n_rec)
+
+    return None
+
+
+def expandir(grafo: GrafoContraido, arbol: list, id_nodo: int, completa: bool = True) -> SolucionCompacta:
+    """Reconstruye camino, energía y estrellas celda por celda, incluidas las de cada corredor"""
+    tramos = []
+    while id_nodo != -1:
+        tramos.append(arbol[id_nodo])
+        id_nodo = arbol[id_nodo][0]
+    tramos.reverse()
+
+    costos, columnas = grafo.costos, grafo.columnas
+    _, _, nodo, energia, estrellas, _ = tramos[0]
+    camino, energias, historial_estrellas = [nodo], [energia], [estrellas]
+    for _, corredor, llegada, n_energia, n_estrellas, salto in tramos[1:]:
+        for fila, columna in grafo.celdas(nodo, corredor):
+            energia -= costos[fila * columnas + columna]
+            camino.append((fila, columna))
+            energias.append(energia)
+            historial_estrellas.append(estrellas)
+        if salto is not None:
+            camino.append(salto[0])
+            energias.append(salto[1])
+            historial_estrellas.append(salto[2])
+        camino.append(llegada)
+        energias.append(n_energia)
+        historial_estrellas.append(n_estrellas)
+        nodo, energia, estrellas = llegada, n_energia, n_estrellas
+    return SolucionCompacta.desde_listas(camino, energias, historial_estrellas, completa)
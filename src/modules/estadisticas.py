@@ -0,0 +1,107 @@
+"""
+Módulo de instrumentación de las búsquedas
+
+EstadisticasBusqueda es opcional: si un solucionador no la recibe, no registra
+nada y no paga ningún costo. Si la recibe, cuenta nodos expandidos, retrocesos,
+podas por motivo, usos de agujeros de gusano, un histograma por profundidad y el
+tiempo de cada fase; cada 'intervalo' nodos llama a al_progreso(estadisticas).
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+# Motivos de poda
+PODA_SIN_ENERGIA = "sin_energia"
+PODA_AGUJERO_NEGRO = "agujero_negro_sin_estrella"
+PODA_CARGA_REQUERIDA = "carga_requerida"
+PODA_LIMITE_PROFUNDIDAD = "limite_profundidad"
+PODA_TRANSPOSICION = "transposicion"
+PODA_DOMINANCIA = "dominancia"
+PODA_COTA = "cota"
+PODA_CELDA_DESCARTADA = "celda_descartada"
+PODA_RECORTE = "recorte"
+
+
+class EstadisticasBusqueda:
+    """Contadores de una resolución y gancho de progreso cada 'intervalo' nodos"""
+
+    def __init__(self, al_progreso: Optional[Callable[["EstadisticasBusqueda"], None]] = None,
+                 intervalo: int = 1000):
+        if intervalo <= 0:
+            raise ValueError("El intervalo de progreso debe ser positivo")
+        self.al_progreso = al_progreso
+        self.intervalo = intervalo
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.nodos_expandidos = 0
+        self.retrocesos = 0
+        self.profundidad_maxima = 0
+        self.podas: Dict[str, int] = {}
+        self.usos_gusano = 0
+        self.histograma_profundidad: List[int] = []
+        self.tiempos_fase: Dict[str, float] = {}
+        self.inicio = time.perf_counter()
+
+    def expandir(self, profundidad: int):
+        self.nodos_expandidos += 1
+        histograma = self.histograma_profundidad
+        if profundidad >= len(histograma):
+            histograma.extend([0] * (profundidad + 1 - len(histograma)))
+            self.profundidad_maxima = profundidad
+        histograma[profundidad] += 1
+        if self.al_progreso is not None and self.nodos_expandidos % self.intervalo == 0:
+            self.al_progreso(self)
+
+    def podar(self, motivo: str):
+        self.podas[motivo] = self.podas.get(motivo, 0) + 1
+
+    def retroceder(self):
+        self.retrocesos += 1
+
+    def usar_gusano(self):
+        self.usos_gusano += 1
+
+    def acumular(self, otras: dict):
+        """Suma los contadores de otra búsqueda (su como_dict()), p. ej. de un proceso trabajador"""
+        self.nodos_expandidos += otras['nodos_expandidos']
+        self.retrocesos += otras['retrocesos']
+        self.usos_gusano += otras['usos_gusano']
+        for motivo, cantidad in otras['podas'].items():
+            self.podas[motivo] = self.podas.get(motivo, 0) + cantidad
+        histograma = self.histograma_profundidad
+        otro_histograma = otras['histograma_profundidad']
+        if len(otro_histograma) > len(histograma):
+            histograma.extend([0] * (len(otro_histograma) - len(histograma)))
+            self.profundidad_maxima = len(histograma) - 1
+        for profundidad, cantidad in enumerate(otro_histograma):
+            histograma[profundidad] += cantidad
+
+    @contextmanager
+    def fase(self, nombre: str):
+        """Acumula el tiempo de reloj pasado dentro del bloque bajo 'nombre'"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tiempos_fase[nombre] = self.tiempos_fase.get(nombre, 0.0) + time.perf_counter() - inicio
+
+    @property
+    def segundos(self) -> float:
+        return time.perf_counter() - self.inicio
+
+    def como_dict(self) -> dict:
+        return {
+            'nodos_expandidos': self.nodos_expandidos,
+            'retrocesos': self.retrocesos,
+            'profundidad_maxima': self.profundidad_maxima,
+            'podas': dict(self.podas),
+            'usos_gusano': self.usos_gusano,
+            'histograma_profundidad': list(self.histograma_profundidad),
+            'tiempos_fase': dict(self.tiempos_fase),
+        }
+
+    def __repr__(self) -> str:
+        return (f"EstadisticasBusqueda(nodos={self.nodos_expandidos}, retrocesos={self.retrocesos}, "
+                f"profundidad_maxima={self.profundidad_maxima}, podas={self.podas})")
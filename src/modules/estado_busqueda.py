@@ -0,0 +1,396 @@
+"""
+Módulo del estado mutable de una resolución
+
+El Universo guarda solo la capa estática del mapa (costos, tipos de celda y
+elementos originales), que ninguna búsqueda modifica. Lo que cambia mientras
+se busca vive en un EstadoBusqueda propio de cada resolución:
+    - la nave (posición, energía, estrellas, camino e historiales)
+    - celdas visitadas, estrellas por recolectar, agujeros negros activos y
+      agujeros de gusano usados
+    - celdas descartadas por el análisis de factibilidad
+    - presupuesto, estadísticas, tabla de transposición y soluciones
+
+Así varias resoluciones (hilos o tareas) corren a la vez sobre un mismo
+Universo sin copiarlo, y la interfaz nunca dibuja un estado a medio cambiar.
+El backtracking (recursivo e iterativo) trabaja sobre este estado.
+"""
+
+from itertools import islice
+from typing import Callable, FrozenSet, Iterator, Optional, Tuple
+
+from modules.matriz_compacta import ZONA_RECARGA
+from modules.presupuesto import EstadoResolucion, Presupuesto
+from modules.solucion_compacta import SolucionCompacta
+from modules.tabla_transposicion import TablaTransposicion
+from modules.estadisticas import (EstadisticasBusqueda, PODA_AGUJERO_NEGRO, PODA_CARGA_REQUERIDA,
+                                  PODA_CELDA_DESCARTADA, PODA_COTA, PODA_LIMITE_PROFUNDIDAD,
+                                  PODA_SIN_ENERGIA, PODA_TRANSPOSICION)
+
+
+class Nave:
+    __slots__ = ('energia', 'posicion', 'camino', 'energia_inicial', 'estrellas_disponibles',
+                 'historial_energia', 'historial_estrellas')
+
+    def __init__(self, energia: int, posicion: Tuple[int, int]):
+        self.energia = energia
+        self.posicion = posicion
+        self.camino = [posicion]
+        self.energia_inicial = energia
+        self.estrellas_disponibles = 0
+        self.historial_energia = [energia]  # Para seguimiento de energía
+        self.historial_estrellas = [0]      # Para seguimiento de estrellas
+
+
+class EstadoBusqueda:
+    """Estado mutable de una resolución sobre la capa estática de un Universo"""
+
+    def __init__(self, universo, presupuesto: Optional[Presupuesto] = None,
+                 estadisticas: Optional[EstadisticasBusqueda] = None,
+                 tabla_transposicion: Optional[TablaTransposicion] = None,
+                 descartadas: FrozenSet[Tuple[int, int]] = frozenset()):
+        self.universo = universo
+        self.nave = Nave(universo.carga_inicial, tuple(universo.origen))
+        self.visitadas = set()  # índices planos
+        self.estrellas_activas = {tuple(eg) for eg in universo.estrellas_gigantes_originales}
+        self.agujeros_activos = {tuple(an) for an in universo.agujeros_negros_originales}
+        self.gusanos_usados = bytearray(len(universo.tabla_gusanos))
+        self.descartadas = descartadas
+        self.presupuesto = presupuesto or Presupuesto()
+        self.estadisticas = estadisticas
+        self.tabla_transposicion = tabla_transposicion
+        self.factibilidad = None
+        self.soluciones = []
+        self.estado_resolucion: Optional[EstadoResolucion] = None
+        # Lo marca un solucionador que descartó parte de la búsqueda (p. ej. el tope de etiquetas de pareto)
+        self.recortada = False
+        self._mejor_parcial = None
+
+    # --- Reglas de movimiento ---
+
+    def es_segura(self, fila: int, columna: int) -> bool:
+        posicion = (fila, columna)
+        if posicion in self.descartadas:
+            return False
+
+        if posicion in self.agujeros_activos:
+            return self.nave.estrellas_disponibles > 0
+
+        if self.universo.cargas_requeridas.get(posicion, 0) > self.nave.energia:
+            return False
+
+        return True
+
+    def _motivo_inseguro(self, fila: int, columna: int) -> str:
+        """Motivo de poda cuando es_segura() devuelve False"""
+        if (fila, columna) in self.descartadas:
+            return PODA_CELDA_DESCARTADA
+        if (fila, columna) in self.agujeros_activos:
+            return PODA_AGUJERO_NEGRO
+        return PODA_CARGA_REQUERIDA
+
+    def visitada(self, fila: int, columna: int) -> bool:
+        return fila * self.universo.columnas + columna in self.visitadas
+
+    def mover_nave(self, fila: int, columna: int, rastro: Optional[list] = None):
+        celdas = self.universo.celdas
+        indice = fila * self.universo.columnas + columna
+        nave = self.nave
+
+        # Registrar estado antes del movimiento
+        if rastro is not None:
+            rastro.append(('nave', nave.energia, nave.estrellas_disponibles))
+            rastro.append(('visitada', indice, indice in self.visitadas))
+
+        # Consumir energía (excepto en zonas de recarga)
+        recarga = celdas.vista_banderas[indice] & ZONA_RECARGA
+        if not recarga:
+            nave.energia -= celdas.vista_costos[indice]
+
+        # Recolectar estrella gigante si está disponible
+        if (fila, columna) in self.estrellas_activas:
+            nave.estrellas_disponibles += 1
+            self.estrellas_activas.discard((fila, columna))
+            if rastro is not None:
+                rastro.append(('estrella', fila, columna))
+
+        # Zonas de recarga
+        if recarga:
+            nave.energia *= celdas.vista_factor_recarga[indice]
+
+        # Usar estrella para destruir agujero negro
+        if (fila, columna) in self.agujeros_activos and nave.estrellas_disponibles > 0:
+            nave.estrellas_disponibles -= 1
+            self.agujeros_activos.discard((fila, columna))
+            if rastro is not None:
+                rastro.append(('agujero_negro', fila, columna))
+
+        # Actualizar posición y registro
+        nave.posicion = (fila, columna)
+        nave.camino.append((fila, columna))
+        self.visitadas.add(indice)
+
+        # Registrar cambios
+        nave.historial_energia.append(nave.energia)
+        nave.historial_estrellas.append(nave.estrellas_disponibles)
+
+    def _deshacer(self, rastro: list, marca: int):
+        """Revierte en O(1) por entrada los cambios registrados en el rastro desde la marca"""
+        nave = self.nave
+        while len(rastro) > marca:
+            cambio = rastro.pop()
+            tipo = cambio[0]
+            if tipo == 'nave':
+                nave.energia = cambio[1]
+                nave.estrellas_disponibles = cambio[2]
+                nave.camino.pop()
+                nave.historial_energia.pop()
+                nave.historial_estrellas.pop()
+                nave.posicion = nave.camino[-1]
+            elif tipo == 'visitada':
+                if not cambio[2]:
+                    self.visitadas.discard(cambio[1])
+            elif tipo == 'estrella':
+                self.estrellas_activas.add((cambio[1], cambio[2]))
+            elif tipo == 'agujero_negro':
+                self.agujeros_activos.add((cambio[1], cambio[2]))
+            elif tipo == 'gusano':
+                self.gusanos_usados[cambio[1].indice] = 0
+
+    def _avanzar(self, fila: int, columna: int, rastro: list) -> Optional[Tuple[int, int]]:
+        """
+        Mueve la nave registrando los cambios en el rastro, incluido el salto obligatorio
+        por agujero de gusano. Devuelve la posición final o None si el movimiento no es
+        viable (en ese caso ya quedó deshecho).
+        """
+        universo = self.universo
+        marca = len(rastro)
+        self.mover_nave(fila, columna, rastro)
+
+        # Manejar agujeros de gusano (la salida también debe ser segura)
+        ag = universo.gusanos_por_entrada.get((fila, columna))
+        if ag is not None and not self.gusanos_usados[ag.indice]:
+            salida = ag.salida
+            if not self.es_segura(salida[0], salida[1]):
+                if self.estadisticas is not None:
+                    self.estadisticas.podar(self._motivo_inseguro(salida[0], salida[1]))
+                self._deshacer(rastro, marca)
+                return None
+            self.gusanos_usados[ag.indice] = 1
+            rastro.append(('gusano', ag))
+            self.mover_nave(salida[0], salida[1], rastro)
+            fila, columna = salida
+            if self.estadisticas is not None:
+                self.estadisticas.usar_gusano()
+
+        if self.nave.energia <= 0 and not universo.es_destino(fila, columna):
+            if self.estadisticas is not None:
+                self.estadisticas.podar(PODA_SIN_ENERGIA)
+            self._deshacer(rastro, marca)
+            return None
+        return fila, columna
+
+    # --- Soluciones ---
+
+    def _solucion_actual(self, completa: bool = True) -> SolucionCompacta:
+        return SolucionCompacta.desde_listas(self.nave.camino, self.nave.historial_energia,
+                                             self.nave.historial_estrellas, completa)
+
+    def _registrar_solucion(self):
+        self.soluciones.append(self._solucion_actual())
+
+    def _anotar_parcial(self, fila: int, columna: int):
+        """Guarda el camino actual si es el que más se acerca al destino"""
+        destino = self.universo.destino
+        distancia = abs(destino[0] - fila) + abs(destino[1] - columna)
+        if self._mejor_parcial is None or distancia < self._mejor_parcial[0]:
+            self._mejor_parcial = (distancia, self._solucion_actual(completa=False))
+
+    def _tomar_solucion(self, solucion: Optional[dict]) -> bool:
+        if solucion is None:
+            return False
+        if not solucion.get('completa', True):
+            self._mejor_parcial = (0, solucion)
+            return False
+        self.soluciones.append(solucion)
+        return True
+
+    def _cerrar_resolucion(self, metodo: str, optimizable: bool, completa: bool = True):
+        """Agrega la mejor solución parcial si hizo falta y registra el estado de la resolución"""
+        presupuesto = self.presupuesto
+        completa = completa and not presupuesto.agotado and not self.recortada
+        if not self.soluciones and presupuesto.agotado and self._mejor_parcial is not None:
+            self.soluciones.append(self._mejor_parcial[1])
+        encontrada = any(sol.get('completa', True) for sol in self.soluciones)
+        self.estado_resolucion = EstadoResolucion(
+            metodo, completa, optimizable and completa and encontrada,
+            presupuesto.motivo, presupuesto.nodos, presupuesto.segundos)
+
+    # --- Backtracking ---
+
+    def _resolver_backtracking_iterativo(self) -> bool:
+        """Backtracking iterativo que se detiene en la primera solución"""
+        generador = self._iterar_backtracking()
+        try:
+            solucion = next(generador, None)
+        finally:
+            generador.close()
+        if solucion is None:
+            return False
+        self.soluciones.append(solucion)
+        return True
+
+    def _iterar_backtracking(self) -> Iterator[dict]:
+        """
+        Backtracking con pila explícita: cada movimiento se anota en un rastro
+        y se deshace en O(1), sin copiar el camino ni límite de profundidad.
+        Con tabla de transposición, las llegadas dominadas (misma posición, un superconjunto
+        de las celdas visitadas por otra llegada y sin más energía ni estrellas) se podan.
+        """
+        universo = self.universo
+        if universo.es_destino(universo.origen[0], universo.origen[1]):
+            yield self._solucion_actual()
+            return
+        if self.nave.energia <= 0:
+            return
+
+        rastro = []
+        try:
+            yield from self._explorar_con_pila(self.tabla_transposicion, rastro)
+        finally:
+            self._deshacer(rastro, 0)
+
+    def _explorar_con_pila(self, tabla: Optional[TablaTransposicion], rastro: list,
+                           podar: Optional[Callable[[int, int], bool]] = None) -> Iterator[dict]:
+        """
+        Bucle principal del backtracking iterativo desde la posición actual de la nave;
+        quien lo llama deshace el rastro al terminar. podar(fila, columna) permite cortar
+        ramas con una cota externa (p. ej. la mejor longitud encontrada).
+        """
+        universo = self.universo
+        columnas = universo.columnas
+        visitadas = self.visitadas
+        inicio_fila, inicio_columna = self.nave.posicion
+        bits_iniciales = 0
+        if tabla is not None:
+            for indice in visitadas:
+                bits_iniciales |= 1 << indice
+            tabla.dominado(inicio_fila * columnas + inicio_columna, bits_iniciales,
+                           self.nave.energia, self.nave.estrellas_disponibles)
+        # Cada marco: (fila, columna, movimientos pendientes, marca del rastro al entrar, bitboard de visitadas)
+        pila = [(inicio_fila, inicio_columna, iter(universo._movimientos_ordenados(inicio_fila, inicio_columna)),
+                 len(rastro), bits_iniciales)]
+        estadisticas = self.estadisticas
+        if estadisticas is not None:
+            # El punto de partida cuenta como expandido, igual que en el backtracking recursivo
+            estadisticas.expandir(len(self.nave.camino) - 1)
+
+        while pila:
+            fila, columna, movimientos, marca, bits_visitadas = pila[-1]
+
+            for df, dc in movimientos:
+                nueva_fila, nueva_columna = fila + df, columna + dc
+                if (not universo.es_valida(nueva_fila, nueva_columna) or
+                        nueva_fila * columnas + nueva_columna in visitadas):
+                    continue
+                if self.es_segura(nueva_fila, nueva_columna):
+                    break
+                if estadisticas is not None:
+                    estadisticas.podar(self._motivo_inseguro(nueva_fila, nueva_columna))
+            else:
+                # Sin movimientos pendientes: retroceder
+                pila.pop()
+                self._deshacer(rastro, marca)
+                if estadisticas is not None:
+                    estadisticas.retroceder()
+                continue
+
+            nueva_marca = len(rastro)
+            llegada = self._avanzar(nueva_fila, nueva_columna, rastro)
+            if llegada is None:
+                continue
+            nueva_fila, nueva_columna = llegada
+
+            presupuesto = self.presupuesto
+            if presupuesto is not None:
+                if presupuesto.consumir():
+                    return
+                self._anotar_parcial(nueva_fila, nueva_columna)
+
+            if universo.es_destino(nueva_fila, nueva_columna):
+                yield self._solucion_actual()
+                self._deshacer(rastro, nueva_marca)
+                continue
+
+            if podar is not None and podar(nueva_fila, nueva_columna):
+                self._deshacer(rastro, nueva_marca)
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_COTA)
+                continue
+
+            nuevos_bits = bits_visitadas
+            if tabla is not None:
+                nuevos_bits = self._actualizar_bits(bits_visitadas, rastro, nueva_marca)
+                if tabla.dominado(nueva_fila * columnas + nueva_columna, nuevos_bits,
+                                  self.nave.energia, self.nave.estrellas_disponibles):
+                    self._deshacer(rastro, nueva_marca)
+                    if estadisticas is not None:
+                        estadisticas.podar(PODA_TRANSPOSICION)
+                    continue
+
+            if estadisticas is not None:
+                estadisticas.expandir(len(self.nave.camino) - 1)
+            pila.append((nueva_fila, nueva_columna,
+                         iter(universo._movimientos_ordenados(nueva_fila, nueva_columna)), nueva_marca, nuevos_bits))
+
+    @staticmethod
+    def _actualizar_bits(bits_visitadas: int, rastro: list, desde: int) -> int:
+        """Agrega al bitboard las celdas que el rastro marca como visitadas desde la marca"""
+        for cambio in islice(rastro, desde, None):
+            if cambio[0] == 'visitada' and not cambio[2]:
+                bits_visitadas |= 1 << cambio[1]
+        return bits_visitadas
+
+    def _resolver_backtracking(self, fila: int, columna: int) -> bool:
+        universo = self.universo
+        if universo.es_destino(fila, columna):
+            self._registrar_solucion()
+            return True
+
+        if self.presupuesto is not None:
+            if self.presupuesto.consumir():
+                return False
+            self._anotar_parcial(fila, columna)
+
+        estadisticas = self.estadisticas
+        nave = self.nave
+        if nave.energia <= 0:
+            if estadisticas is not None:
+                estadisticas.podar(PODA_SIN_ENERGIA)
+            return False
+        if estadisticas is not None:
+            estadisticas.expandir(len(nave.camino) - 1)
+
+        # Mismas reglas de movimiento que el backtracking iterativo (ver _avanzar), deshechas con el rastro
+        rastro = []
+        for df, dc in universo._movimientos_ordenados(fila, columna):
+            nueva_fila, nueva_columna = fila + df, columna + dc
+            if not universo.es_valida(nueva_fila, nueva_columna) or self.visitada(nueva_fila, nueva_columna):
+                continue
+            if not self.es_segura(nueva_fila, nueva_columna):
+                if estadisticas is not None:
+                    estadisticas.podar(self._motivo_inseguro(nueva_fila, nueva_columna))
+                continue
+
+            llegada = self._avanzar(nueva_fila, nueva_columna, rastro)
+            if llegada is None:
+                continue
+            if len(nave.camino) < 200:  # Límite para evitar stack overflow
+                if self._resolver_backtracking(llegada[0], llegada[1]):
+                    return True
+                if estadisticas is not None:
+                    estadisticas.retroceder()
+            elif estadisticas is not None:
+                estadisticas.podar(PODA_LIMITE_PROFUNDIDAD)
+            self._deshacer(rastro, 0)
+
+        return False
@@ -0,0 +1,205 @@
+"""
+Módulo de verificación previa de factibilidad
+
+Antes de buscar, analiza una versión relajada (optimista) del universo con
+inundaciones sobre bitboards y operaciones vectorizadas, en tiempo casi lineal:
+    - los agujeros negros solo son transitables si alguna estrella se alcanza
+      sin atravesar ninguno
+    - la energía nunca supera carga_inicial * (producto de los factores de
+      recarga), así que una carga requerida mayor bloquea la celda, y también
+      un costo que dejaría la energía en cero fuera del destino
+    - la entrada de un agujero de gusano lleva a su salida (y, ya usado, a sus vecinas)
+
+Una celda puede estar en alguna ruta solo si se alcanza desde el origen y desde
+ella se alcanza el destino; las demás quedan descartadas. El universo no tiene
+solución si el destino no se alcanza o si el costo mínimo relajado hasta el
+destino agota incluso la energía máxima.
+
+Las cotas de energía suponen costos no negativos y factores de recarga >= 1
+(como los que arma generar_matriz); si no se cumplen, solo se usa la alcanzabilidad.
+"""
+
+import heapq
+from typing import FrozenSet, List, Optional, Tuple
+
+import numpy as np
+
+from modules.bitboard import GeometriaBits, desempaquetar, empaquetar
+from modules.matriz_compacta import ZONA_RECARGA
+
+MOTIVO_SIN_ENERGIA = "sin_energia_inicial"
+MOTIVO_DESTINO_INALCANZABLE = "destino_inalcanzable"
+MOTIVO_ENERGIA_INSUFICIENTE = "energia_insuficiente"
+
+
+class Factibilidad:
+    """
+    Resultado del análisis previo:
+        - factible:       False si está demostrado que no hay solución
+        - motivo:         por qué no es factible (MOTIVO_*) o None
+        - vivas:          tablero de celdas que pueden estar en alguna ruta
+        - descartadas:    tablero de celdas que ninguna ruta puede pisar (0 si no es factible)
+        - energia_maxima: cota superior de la energía (None si no se pudo acotar)
+        - costo_minimo:   cota inferior de la energía gastada antes del destino (None si no se calculó)
+    """
+
+    def __init__(self, factible: bool, motivo: Optional[str], vivas: int, descartadas: int,
+                 energia_maxima: Optional[int] = None, costo_minimo: Optional[int] = None):
+        self.factible = factible
+        self.motivo = motivo
+        self.vivas = vivas
+        self.descartadas = descartadas
+        self.energia_maxima = energia_maxima
+        self.costo_minimo = costo_minimo
+
+    def celdas_descartadas(self, filas: int, columnas: int) -> FrozenSet[Tuple[int, int]]:
+        """Coordenadas (fila, columna) de las celdas descartadas"""
+        if not self.descartadas:
+            return frozenset()
+        indices = np.flatnonzero(desempaquetar(self.descartadas, filas * columnas)).tolist()
+        return frozenset(divmod(indice, columnas) for indice in indices)
+
+    def __repr__(self) -> str:
+        return (f"Factibilidad(factible={self.factible}, motivo={self.motivo!r}, "
+                f"descartadas={GeometriaBits.contar(self.descartadas)})")
+
+
+def _indices(universo, coordenadas) -> np.ndarray:
+    """Índices planos de una lista de coordenadas [fila, columna]"""
+    pares = np.asarray(coordenadas, dtype=np.int64).reshape(-1, 2)
+    return pares[:, 0] * universo.columnas + pares[:, 1]
+
+
+def _tablero(total: int, indices: np.ndarray) -> int:
+    mascara = np.zeros(total, dtype=bool)
+    mascara[indices] = True
+    return empaquetar(mascara)
+
+
+def _inundar_con_gusanos(geometria: GeometriaBits, semilla: int, libres: int,
+                         entradas: np.ndarray, salidas: np.ndarray) -> int:
+    """Relleno desde la semilla por celdas libres, siguiendo además los saltos entradas[i] -> salidas[i]"""
+    total = geometria.total
+    transitables = libres | semilla
+    alcanzadas = geometria.inundar(semilla, transitables)
+    if not len(entradas):
+        return alcanzadas
+    mascara_transitables = desempaquetar(transitables, total)
+    while True:
+        mascara = desempaquetar(alcanzadas, total)
+        nuevas = salidas[mascara[entradas] & mascara_transitables[salidas] & ~mascara[salidas]]
+        if not len(nuevas):
+            return alcanzadas
+        alcanzadas = geometria.inundar(alcanzadas | _tablero(total, nuevas), transitables)
+
+
+def _costo_minimo(universo, vivas: np.ndarray, costos: List[int],
+                  entradas: np.ndarray, salidas: np.ndarray) -> Optional[int]:
+    """
+    Dijkstra sobre las celdas vivas: energía mínima gastada antes de la última entrada
+    (entrar al destino, o a un gusano que salta al destino, no necesita energía restante)
+    """
+    columnas = universo.columnas
+    filas = universo.filas
+    origen = universo.origen[0] * columnas + universo.origen[1]
+    destino = universo.destino[0] * columnas + universo.destino[1]
+    saltos = dict(zip(entradas.tolist(), salidas.tolist()))
+    finales = {destino}
+    finales.update(entrada for entrada, salida in saltos.items() if salida == destino)
+
+    distancias = {origen: 0}
+    abiertos = [(0, origen)]
+    while abiertos:
+        distancia, indice = heapq.heappop(abiertos)
+        if indice == destino:
+            return distancia
+        if distancia > distancias[indice]:
+            continue
+        fila, columna = divmod(indice, columnas)
+        vecinos = []
+        if fila > 0:
+            vecinos.append(indice - columnas)
+        if fila < filas - 1:
+            vecinos.append(indice + columnas)
+        if columna > 0:
+            vecinos.append(indice - 1)
+        if columna < columnas - 1:
+            vecinos.append(indice + 1)
+        if indice in saltos:
+            vecinos.append(saltos[indice])
+        for vecino in vecinos:
+            if not vivas[vecino]:
+                continue
+            candidata = distancia + (0 if vecino in finales else costos[vecino])
+            if candidata < distancias.get(vecino, candidata + 1):
+                distancias[vecino] = candidata
+                heapq.heappush(abiertos, (candidata, vecino))
+    return None
+
+
+def analizar(universo) -> Factibilidad:
+    """Analiza el universo en su estado inicial (agujeros negros y estrellas originales)"""
+    geometria = GeometriaBits(universo.filas, universo.columnas)
+    celdas = universo.celdas
+    columnas = universo.columnas
+    total = geometria.total
+    bit_origen = geometria.bit(*universo.origen)
+    bit_destino = geometria.bit(*universo.destino)
+
+    if bit_origen == bit_destino:
+        return Factibilidad(True, None, bit_origen, geometria.todo & ~bit_origen, costo_minimo=0)
+    if universo.carga_inicial <= 0:
+        return Factibilidad(False, MOTIVO_SIN_ENERGIA, bit_origen, 0)
+
+    tabla = universo.tabla_gusanos
+    entradas = _indices(universo, tabla.entradas)
+    salidas = _indices(universo, tabla.salidas)
+    recargas = (celdas.banderas & ZONA_RECARGA) != 0
+    factores = celdas.factor_recarga[recargas]
+    costos = np.where(recargas, 0, celdas.costos.astype(np.int64))
+
+    energia_maxima = None
+    transitables = np.ones(total, dtype=bool)
+    if celdas.costos.min(initial=0) >= 0 and factores.min(initial=1) >= 1:
+        energia_maxima = universo.carga_inicial
+        for factor in factores.tolist():
+            energia_maxima *= factor
+        tope = min(energia_maxima, np.iinfo(np.int64).max)
+        transitables &= celdas.carga_requerida.astype(np.int64) <= tope
+        # Fuera del destino la energía debe quedar positiva; la entrada de un gusano
+        # se controla recién en su salida
+        sin_agotar = costos < tope
+        sin_agotar[universo.destino[0] * columnas + universo.destino[1]] = True
+        sin_agotar[entradas] = True
+        transitables &= sin_agotar
+
+    libres = empaquetar(transitables)
+    negros = _tablero(total, _indices(universo, universo.agujeros_negros_originales)) & ~bit_origen
+    estrellas = _tablero(total, _indices(universo, universo.estrellas_gigantes_originales))
+
+    # Sin atravesar agujeros negros; si así se alcanza alguna estrella, pasan a ser transitables
+    alcanzables = _inundar_con_gusanos(geometria, bit_origen, libres & ~negros, entradas, salidas)
+    if negros & libres and alcanzables & estrellas:
+        alcanzables = _inundar_con_gusanos(geometria, bit_origen, libres, entradas, salidas)
+    else:
+        libres &= ~negros
+
+    if not alcanzables & bit_destino:
+        return Factibilidad(False, MOTIVO_DESTINO_INALCANZABLE, alcanzables, 0, energia_maxima)
+
+    # Celdas desde las que se llega al destino: el mismo relleno con los saltos invertidos
+    regreso = _inundar_con_gusanos(geometria, bit_destino, libres | bit_origen, salidas, entradas)
+    vivas = alcanzables & regreso
+
+    costo_minimo = None
+    if energia_maxima is not None:
+        mascara_vivas = desempaquetar(vivas, total)
+        # Un camino simple no gasta más que todas las celdas vivas juntas: si eso ya
+        # entra en la energía máxima, no hace falta calcular el costo mínimo
+        if int(costos[mascara_vivas].sum()) >= energia_maxima:
+            costo_minimo = _costo_minimo(universo, mascara_vivas, costos.tolist(), entradas, salidas)
+            if costo_minimo is not None and costo_minimo >= energia_maxima:
+                return Factibilidad(False, MOTIVO_ENERGIA_INSUFICIENTE, vivas, 0,
+                                    energia_maxima, costo_minimo)
+
+    return Factibilidad(True, None, vivas, geometria.todo & ~vivas, energia_maxima, costo_minimo)
@@ -0,0 +1,167 @@
+"""
+Módulo de generación masiva de universos
+
+Genera corpus de muchos universos con semillas consecutivas, repartidos entre
+procesos, y los guarda en fragmentos comprimidos:
+    - cada fragmento es un .jsonl.gz con un universo por línea; cada línea es
+      un miembro gzip propio, así que el archivo se lee entero con gzip.open o
+      se descomprime un solo universo desde su desplazamiento
+    - indice.npy guarda por semilla (fragmento, desplazamiento, largo) y se abre
+      mapeado en memoria: cargar un universo es una lectura del índice, un seek
+      y una descompresión, sin recorrer los fragmentos
+    - corpus.json guarda los parámetros de generación y los nombres de fragmento
+
+Cada proceso escribe sus propios fragmentos; el índice y corpus.json se
+escriben al final, cuando todos los fragmentos están completos.
+"""
+
+import gzip
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from modules.generar_matriz import generar_matriz_universo
+from modules.rendimiento import AREA_BASE, ELEMENTOS_BASE
+
+ARCHIVO_CORPUS = "corpus.json"
+ARCHIVO_INDICE = "indice.npy"
+VERSION_CORPUS = 1
+
+# Elementos por celda del universo original (30x30)
+DENSIDADES_POR_DEFECTO = {nombre: base / AREA_BASE for nombre, base in ELEMENTOS_BASE.items()}
+
+
+def cantidades_por_densidad(filas: int, columnas: int,
+                            densidades: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+    """Cantidad de cada elemento para el área dada (al menos uno si la densidad es positiva)"""
+    densidades = {**DENSIDADES_POR_DEFECTO, **(densidades or {})}
+    desconocidos = set(densidades) - set(DENSIDADES_POR_DEFECTO)
+    if desconocidos:
+        raise ValueError(f"Elementos desconocidos: {', '.join(sorted(desconocidos))}")
+    area = filas * columnas
+    return {nombre: max(1, round(densidad * area)) if densidad > 0 else 0
+            for nombre, densidad in densidades.items()}
+
+
+def _nombre_fragmento(numero: int) -> str:
+    return f"fragmento-{numero:05d}.jsonl.gz"
+
+
+def _generar_fragmento(argumentos: tuple) -> np.ndarray:
+    """Escribe un fragmento y devuelve (desplazamiento, largo) de cada universo"""
+    ruta, semillas, filas, columnas, cantidades, carga_inicial, nivel_compresion = argumentos
+    posiciones = np.empty((len(semillas), 2), dtype=np.int64)
+    desplazamiento = 0
+    with open(ruta + ".tmp", "wb") as archivo:
+        for i, semilla in enumerate(semillas):
+            universo = generar_matriz_universo(filas, columnas, carga_inicial=carga_inicial,
+                                               semilla=semilla, **cantidades)
+            linea = json.dumps(universo, separators=(",", ":")).encode("utf-8") + b"\n"
+            miembro = gzip.compress(linea, compresslevel=nivel_compresion, mtime=0)
+            archivo.write(miembro)
+            posiciones[i] = (desplazamiento, len(miembro))
+            desplazamiento += len(miembro)
+    os.replace(ruta + ".tmp", ruta)
+    return posiciones
+
+
+def generar_corpus(directorio: str, cantidad: int, semilla_inicial: int = 0, filas: int = 30,
+                   columnas: int = 30, densidades: Optional[Dict[str, float]] = None,
+                   carga_inicial: int = 200, por_fragmento: int = 1000,
+                   trabajadores: Optional[int] = None, nivel_compresion: int = 6) -> dict:
+    """
+    Genera 'cantidad' universos con semillas semilla_inicial, semilla_inicial + 1, ... en
+    fragmentos de 'por_fragmento' universos, con un pool de 'trabajadores' procesos (por
+    defecto os.cpu_count()). Devuelve los metadatos guardados en corpus.json.
+    """
+    if cantidad <= 0:
+        raise ValueError("La cantidad de universos debe ser positiva")
+    if por_fragmento <= 0:
+        raise ValueError("La cantidad de universos por fragmento debe ser positiva")
+    cantidades = cantidades_por_densidad(filas, columnas, densidades)
+    os.makedirs(directorio, exist_ok=True)
+
+    tareas = []
+    for numero, inicio in enumerate(range(0, cantidad, por_fragmento)):
+        semillas = range(semilla_inicial + inicio, semilla_inicial + min(inicio + por_fragmento, cantidad))
+        tareas.append((os.path.join(directorio, _nombre_fragmento(numero)), semillas, filas, columnas,
+                       cantidades, carga_inicial, nivel_compresion))
+
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if trabajadores == 1 or len(tareas) == 1:
+        posiciones = [_generar_fragmento(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+            posiciones = list(ejecutor.map(_generar_fragmento, tareas))
+
+    # Índice por semilla: (fragmento, desplazamiento, largo)
+    indice = np.empty((cantidad, 3), dtype=np.int64)
+    for numero, (inicio, tramo) in enumerate(zip(range(0, cantidad, por_fragmento), posiciones)):
+        indice[inicio:inicio + len(tramo), 0] = numero
+        indice[inicio:inicio + len(tramo), 1:] = tramo
+    np.save(os.path.join(directorio, ARCHIVO_INDICE), indice)
+
+    metadatos = {
+        'version': VERSION_CORPUS,
+        'semilla_inicial': semilla_inicial,
+        'cantidad': cantidad,
+        'filas': filas,
+        'columnas': columnas,
+        'cantidades': cantidades,
+        'carga_inicial': carga_inicial,
+        'fragmentos': [_nombre_fragmento(numero) for numero in range(len(tareas))],
+    }
+    with open(os.path.join(directorio, ARCHIVO_CORPUS), "w", encoding="utf-8") as f:
+        json.dump(metadatos, f, indent=2)
+    return metadatos
+
+
+class CorpusUniversos:
+    """Lectura de un corpus generado con generar_corpus: acceso directo por semilla"""
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        with open(os.path.join(directorio, ARCHIVO_CORPUS), encoding="utf-8") as f:
+            self.metadatos = json.load(f)
+        if self.metadatos.get('version') != VERSION_CORPUS:
+            raise ValueError(f"Versión de corpus no soportada: {self.metadatos.get('version')}")
+        self.semilla_inicial = self.metadatos['semilla_inicial']
+        self.fragmentos: List[str] = self.metadatos['fragmentos']
+        self._indice = np.load(os.path.join(directorio, ARCHIVO_INDICE), mmap_mode='r')
+
+    def __len__(self) -> int:
+        return len(self._indice)
+
+    def __contains__(self, semilla: int) -> bool:
+        return 0 <= semilla - self.semilla_inicial < len(self._indice)
+
+    def ubicacion(self, semilla: int) -> Tuple[str, int, int]:
+        """(ruta del fragmento, desplazamiento, largo) del universo de esa semilla"""
+        if semilla not in self:
+            raise ValueError(f"Semilla fuera del corpus: {semilla}")
+        numero, desplazamiento, largo = self._indice[semilla - self.semilla_inicial].tolist()
+        return os.path.join(self.directorio, self.fragmentos[numero]), desplazamiento, largo
+
+    def cargar(self, semilla: int) -> dict:
+        """Datos del universo de esa semilla, en el formato de generar_matriz_universo"""
+        ruta, desplazamiento, largo = self.ubicacion(semilla)
+        with open(ruta, "rb") as archivo:
+            archivo.seek(desplazamiento)
+            miembro = archivo.read(largo)
+        return json.loads(gzip.decompress(miembro))
+
+    def __iter__(self) -> Iterator[Tuple[int, dict]]:
+        """(semilla, universo) de todo el corpus, leyendo cada fragmento de corrido"""
+        semilla = self.semilla_inicial
+        for fragmento in self.fragmentos:
+            with gzip.open(os.path.join(self.directorio, fragmento), "rt", encoding="utf-8") as archivo:
+                for linea in archivo:
+                    yield semilla, json.loads(linea)
+                    semilla += 1
+
+    def __repr__(self) -> str:
+        return (f"CorpusUniversos(directorio={self.directorio!r}, universos={len(self)}, "
+                f"fragmentos={len(self.fragmentos)})")
@@ -1,115 +1,54 @@
 import json
-import random
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional
 
-def generar_matriz_universo():
+import numpy as np
+
+def _partir(posiciones: List[List[int]], cantidades: List[int]) -> List[List[List[int]]]:
+    """Divide la muestra de posiciones en grupos consecutivos de las cantidades dadas"""
+    grupos, inicio = [], 0
+    for cantidad in cantidades:
+        grupos.append(posiciones[inicio:inicio + cantidad])
+        inicio += cantidad
+    return grupos
+
+def generar_matriz_universo(filas: int = 30, columnas: int = 30, num_agujeros_negros: int = 5,
+                            num_estrellas: int = 5, num_gusanos: int = 3, num_recargas: int = 10,
+                            num_cargas_requeridas: int = 3, carga_inicial: int = 200,
+                            semilla: Optional[int] = None) -> Dict:
+    """
+    Genera un universo aleatorio. Con 'semilla' el resultado es reproducible (mismo
+    universo para la misma semilla) y no altera el estado global de random ni de NumPy.
+    Las celdas especiales son todas distintas entre sí y distintas del origen y el destino.
+    """
+    if filas * columnas - 2 < (num_agujeros_negros + num_estrellas + 2 * num_gusanos +
+                               num_recargas + num_cargas_requeridas):
+        raise ValueError("La matriz es demasiado chica para la cantidad de elementos pedida")
+    azar = np.random.default_rng(semilla)
+    
     # Configuración básica
-    filas = 30
-    columnas = 30
     origen = [0, 0]
     destino = [filas-1, columnas-1]
-    carga_inicial = 200
     
     # Generar matriz inicial con valores aleatorios (0-10)
-    matriz_inicial = [[random.randint(0, 10) for _ in range(columnas)] for _ in range(filas)]
-    
-    # Generar agujeros negros (5 posiciones aleatorias)
-    agujeros_negros = []
-    for _ in range(5):
-        while True:
-            fila = random.randint(0, filas-1)
-            columna = random.randint(0, columnas-1)
-            # No poner en origen/destino ni repetidos
-            if [fila, columna] != origen and [fila, columna] != destino and [fila, columna] not in agujeros_negros:
-                agujeros_negros.append([fila, columna])
-                break
-    
-    # Generar estrellas gigantes (5 posiciones aleatorias)
-    estrellas_gigantes = []
-    for _ in range(5):
-        while True:
-            fila = random.randint(0, filas-1)
-            columna = random.randint(0, columnas-1)
-            # No poner en origen/destino/agujeros negros ni repetidos
-            if ([fila, columna] != origen and [fila, columna] != destino and 
-                [fila, columna] not in agujeros_negros and [fila, columna] not in estrellas_gigantes):
-                estrellas_gigantes.append([fila, columna])
-                break
-    
-    # Generar agujeros de gusano (3 pares entrada/salida)
-    agujeros_gusano = []
-    for _ in range(3):
-        while True:
-            # Entrada
-            entrada_fila = random.randint(0, filas-1)
-            entrada_col = random.randint(0, columnas-1)
-            # Salida
-            salida_fila = random.randint(0, filas-1)
-            salida_col = random.randint(0, columnas-1)
-            
-            # Validar posiciones
-            if ([entrada_fila, entrada_col] != origen and [entrada_fila, entrada_col] != destino and
-                [entrada_fila, entrada_col] not in agujeros_negros and
-                [entrada_fila, entrada_col] not in estrellas_gigantes and
-                [salida_fila, salida_col] != origen and [salida_fila, salida_col] != destino and
-                [entrada_fila, entrada_col] != [salida_fila, salida_col]):
-                
-                # Verificar que no se solapen con otros agujeros de gusano
-                entrada_valida = True
-                for ag in agujeros_gusano:
-                    if [entrada_fila, entrada_col] == ag["entrada"] or [entrada_fila, entrada_col] == ag["salida"]:
-                        entrada_valida = False
-                    if [salida_fila, salida_col] == ag["entrada"] or [salida_fila, salida_col] == ag["salida"]:
-                        entrada_valida = False
-                
-                if entrada_valida:
-                    agujeros_gusano.append({
-                        "entrada": [entrada_fila, entrada_col],
-                        "salida": [salida_fila, salida_col]
-                    })
-                    break
+    matriz_inicial = azar.integers(0, 10, size=(filas, columnas), endpoint=True).tolist()
     
-    # Generar zonas de recarga (10 posiciones con factores 2-5)
-    zonas_recarga = []
-    for _ in range(10):
-        while True:
-            fila = random.randint(0, filas-1)
-            columna = random.randint(0, columnas-1)
-            factor = random.randint(2, 5)
-            
-            # Validar posición
-            if ([fila, columna] != origen and [fila, columna] != destino and
-                [fila, columna] not in agujeros_negros and
-                [fila, columna] not in estrellas_gigantes and
-                not any([fila, columna] == ag["entrada"] or [fila, columna] == ag["salida"] for ag in agujeros_gusano) and
-                [fila, columna] not in [z[:2] for z in zonas_recarga]):
-                
-                zonas_recarga.append([fila, columna, factor])
-                break
+    # Todas las celdas especiales salen de una sola muestra sin reemplazo de las celdas libres:
+    # los índices planos 1..filas*columnas-2 excluyen el origen (0) y el destino (el último)
+    cantidades = [num_agujeros_negros, num_estrellas, num_gusanos, num_gusanos,
+                  num_recargas, num_cargas_requeridas]
+    indices = azar.choice(filas * columnas - 2, size=sum(cantidades), replace=False) + 1
+    posiciones = np.stack(np.divmod(indices, columnas), axis=1).tolist()
+    agujeros_negros, estrellas_gigantes, entradas, salidas, recargas, requeridas = _partir(posiciones, cantidades)
     
-    # Generar celdas con carga requerida (3 posiciones con valores 5-15)
-    celdas_carga_requerida = []
-    for _ in range(3):
-        while True:
-            fila = random.randint(0, filas-1)
-            columna = random.randint(0, columnas-1)
-            carga = random.randint(5, 15)
-            
-            # Validar posición
-            if ([fila, columna] != origen and [fila, columna] != destino and
-                [fila, columna] not in agujeros_negros and
-                [fila, columna] not in estrellas_gigantes and
-                not any([fila, columna] == ag["entrada"] or [fila, columna] == ag["salida"] for ag in agujeros_gusano) and
-                [fila, columna] not in [z[:2] for z in zonas_recarga] and
-                [fila, columna] not in [c["coordenada"] for c in celdas_carga_requerida]):
-                
-                celdas_carga_requerida.append({
-                    "coordenada": [fila, columna],
-                    "cargaGastada": carga
-                })
-                break
+    # Factores de recarga (2-5) y cargas requeridas (5-15)
+    factores = azar.integers(2, 5, size=num_recargas, endpoint=True).tolist()
+    cargas = azar.integers(5, 15, size=num_cargas_requeridas, endpoint=True).tolist()
     
     # Crear estructura final
+    agujeros_gusano = [{"entrada": entrada, "salida": salida} for entrada, salida in zip(entradas, salidas)]
+    zonas_recarga = [posicion + [factor] for posicion, factor in zip(recargas, factores)]
+    celdas_carga_requerida = [{"coordenada": posicion, "cargaGastada": carga}
+                              for posicion, carga in zip(requeridas, cargas)]
     universo = {
         "matriz": {
             "filas": filas,
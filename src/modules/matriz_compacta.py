@@ -0,0 +1,110 @@
+"""
+Módulo de almacenamiento compacto del universo (struct-of-arrays)
+
+En lugar de un objeto por celda, cada atributo vive en un arreglo NumPy plano
+de tamaño filas * columnas, indexado por fila * columnas + columna:
+    - costos:          costo de energía (int32)
+    - factor_recarga:  factor multiplicador de las zonas de recarga (int16)
+    - carga_requerida: carga mínima para entrar a la celda (int32)
+    - banderas:        bits con el tipo de celda y si quedó descartada (uint8)
+"""
+
+import hashlib
+import numpy as np
+from array import array
+from typing import Iterable, Tuple
+from modules.bitboard import desempaquetar
+
+# Bits del arreglo de banderas
+AGUJERO_NEGRO = 1
+ESTRELLA_GIGANTE = 2
+ENTRADA_GUSANO = 4
+SALIDA_GUSANO = 8
+ZONA_RECARGA = 16
+DESCARTADA = 64  # no puede estar en ninguna ruta al destino (ver factibilidad)
+
+
+class MatrizCompacta:
+    """Atributos de todas las celdas guardados como arreglos paralelos"""
+    en_memoria = True  # ver MatrizMapeada para universos fuera de memoria
+
+    def __init__(self, filas: int, columnas: int, costos: Iterable):
+        self.filas = filas
+        self.columnas = columnas
+        total = filas * columnas
+        self.costos = np.asarray(costos, dtype=np.int32).reshape(total).copy()
+        self.factor_recarga = np.ones(total, dtype=np.int16)
+        self.carga_requerida = np.zeros(total, dtype=np.int32)
+        self.banderas = np.zeros(total, dtype=np.uint8)
+        self._crear_vistas()
+
+    def _crear_vistas(self):
+        # Las memoryview devuelven int de Python: acceso escalar rápido en el camino caliente
+        self.vista_costos = memoryview(self.costos)
+        self.vista_factor_recarga = memoryview(self.factor_recarga)
+        self.vista_carga_requerida = memoryview(self.carga_requerida)
+        self.vista_banderas = memoryview(self.banderas)
+
+    def __getstate__(self):
+        return {
+            'filas': self.filas,
+            'columnas': self.columnas,
+            'costos': self.costos,
+            'factor_recarga': self.factor_recarga,
+            'carga_requerida': self.carga_requerida,
+            'banderas': self.banderas,
+        }
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._crear_vistas()
+
+    def indice(self, fila: int, columna: int) -> int:
+        return fila * self.columnas + columna
+
+    def tiene(self, indice: int, bandera: int) -> bool:
+        return bool(self.vista_banderas[indice] & bandera)
+
+    def marcar(self, indice: int, bandera: int, valor: bool = True):
+        if valor:
+            self.vista_banderas[indice] |= bandera
+        else:
+            self.vista_banderas[indice] &= ~bandera & 0xFF
+
+    def limpiar(self, bandera: int):
+        """Apaga una bandera en todas las celdas con una sola operación vectorizada"""
+        self.banderas &= np.uint8(~bandera & 0xFF)
+
+    def cargar_bitboard(self, bandera: int, tablero: int):
+        """Enciende la bandera exactamente en las celdas del tablero y la apaga en las demás"""
+        encendidas = desempaquetar(tablero, self.filas * self.columnas)
+        self.limpiar(bandera)
+        self.banderas[encendidas] |= np.uint8(bandera)
+
+    def costos_en(self, indices: np.ndarray) -> np.ndarray:
+        """Costos de muchas celdas a la vez (índices planos)"""
+        return self.costos[indices]
+
+    def huella_costos(self) -> str:
+        """SHA-256 de los costos por filas (int32 little-endian)"""
+        return hashlib.sha256(self.costos.astype('<i4').tobytes()).hexdigest()
+
+    def coordenadas_con(self, bandera: int):
+        """Coordenadas (fila, columna) de las celdas que tienen la bandera"""
+        return [divmod(int(i), self.columnas) for i in np.flatnonzero(self.banderas & bandera)]
+
+
+class TablaAgujerosGusano:
+    """Entradas y salidas de los agujeros de gusano en arreglos planos (el uso vive en EstadoBusqueda)"""
+
+    def __init__(self):
+        self.entradas = array('i')  # fila, columna intercaladas
+        self.salidas = array('i')
+
+    def agregar(self, entrada: Tuple[int, int], salida: Tuple[int, int]) -> int:
+        self.entradas.extend(entrada)
+        self.salidas.extend(salida)
+        return len(self) - 1
+
+    def __len__(self) -> int:
+        return len(self.entradas) // 2
@@ -0,0 +1,276 @@
+"""
+Módulo de universos fuera de memoria (archivo binario mapeado)
+
+Para grillas que no entran en RAM, los costos se guardan en un archivo binario
+en teselas de tamano_tesela x tamano_tesela celdas (teselas en orden por filas y
+celdas en orden por filas dentro de cada tesela) y se leen con np.memmap: abrir
+el universo no lee la matriz, y la búsqueda solo trae a memoria las páginas de
+las teselas que visita. Una tesela de 64x64 ocupa una página con costos de un
+byte, y los vecinos de una celda casi siempre caen en la misma tesela.
+
+Los demás atributos (tipo de celda, factor de recarga, carga requerida, descartada)
+son dispersos: solo los tienen los elementos especiales y las celdas que marca el
+análisis de factibilidad, así que se guardan en diccionarios y limpiarlos no
+recorre la grilla.
+
+Formato del archivo:
+    cabecera   mágico, versión, tamaño de tesela, filas, columnas, desplazamiento
+               de los datos y largo de los metadatos
+    metadatos  JSON con el mismo formato que el universo en JSON, sin 'matrizInicial',
+               más el tipo de los costos y la huella SHA-256 de los costos por filas
+    datos      teselas de costos, alineadas a 4096 bytes
+"""
+
+import hashlib
+import json
+import struct
+from typing import Dict, Iterable
+
+import numpy as np
+
+_MAGICO = b'UMAP'
+_VERSION = 1
+# magico, versión, tamaño de tesela, filas, columnas, desplazamiento de los datos, largo de los metadatos
+_CABECERA = struct.Struct('<4sB3xIQQQI')
+_ALINEACION = 4096
+TAMANO_TESELA_POR_DEFECTO = 64
+EXTENSION_MAPA = ".umap"
+
+
+class _VistaTeselas:
+    """Acceso por índice plano (fila * columnas + columna) a los costos guardados en teselas"""
+    __slots__ = ('_datos', '_columnas', '_tesela', '_teselas_por_fila', '_editados', '_total')
+
+    def __init__(self, datos, filas: int, columnas: int, tesela: int, editados: Dict[int, int]):
+        self._datos = datos
+        self._columnas = columnas
+        self._tesela = tesela
+        self._teselas_por_fila = -(-columnas // tesela)
+        self._editados = editados
+        self._total = filas * columnas
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, indice: int) -> int:
+        editado = self._editados.get(indice)
+        if editado is not None:
+            return editado
+        tesela = self._tesela
+        fila, columna = divmod(indice, self._columnas)
+        fila_tesela, fila_interna = divmod(fila, tesela)
+        columna_tesela, columna_interna = divmod(columna, tesela)
+        return self._datos[((fila_tesela * self._teselas_por_fila + columna_tesela) * tesela
+                            + fila_interna) * tesela + columna_interna]
+
+    def __setitem__(self, indice: int, valor: int):
+        # El archivo se abre solo para lectura: las ediciones quedan en memoria
+        self._editados[indice] = int(valor)
+
+
+class _VistaDispersa:
+    """Arreglo plano virtual: solo guarda los índices cuyo valor difiere del valor por defecto"""
+    __slots__ = ('_valores', '_defecto', '_total')
+
+    def __init__(self, valores: Dict[int, int], defecto: int, total: int):
+        self._valores = valores
+        self._defecto = defecto
+        self._total = total
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __getitem__(self, indice: int) -> int:
+        return self._valores.get(indice, self._defecto)
+
+    def __setitem__(self, indice: int, valor: int):
+        if valor == self._defecto:
+            self._valores.pop(indice, None)
+        else:
+            self._valores[indice] = int(valor)
+
+
+class MatrizMapeada:
+    """
+    Misma interfaz que MatrizCompacta (vistas por índice plano, banderas, limpiar,
+    coordenadas_con, ...) sobre un archivo de costos mapeado en memoria
+    """
+    en_memoria = False
+
+    def __init__(self, ruta: str):
+        with open(ruta, 'rb') as f:
+            cabecera = f.read(_CABECERA.size)
+            if len(cabecera) < _CABECERA.size:
+                raise ValueError(f"{ruta} no es un universo binario conocido")
+            magico, version, tesela, filas, columnas, desplazamiento, largo = _CABECERA.unpack(cabecera)
+            if magico != _MAGICO or version != _VERSION:
+                raise ValueError(f"{ruta} no es un universo binario conocido")
+            self.metadatos = json.loads(f.read(largo).decode('utf-8'))
+        self.ruta = ruta
+        self.filas = filas
+        self.columnas = columnas
+        self.tamano_tesela = tesela
+        self._desplazamiento = desplazamiento
+        self._costos_editados: Dict[int, int] = {}
+        self._banderas: Dict[int, int] = {}
+        self._factor_recarga: Dict[int, int] = {}
+        self._carga_requerida: Dict[int, int] = {}
+        self._crear_vistas()
+
+    def _crear_vistas(self):
+        tesela = self.tamano_tesela
+        celdas = (-(-self.filas // tesela)) * (-(-self.columnas // tesela)) * tesela * tesela
+        self._mapa = np.memmap(self.ruta, dtype=np.dtype(self.metadatos['tipoCostos']), mode='r',
+                               offset=self._desplazamiento, shape=(celdas,))
+        total = self.filas * self.columnas
+        # memoryview devuelve int de Python sin pasar por los escalares de NumPy
+        self.vista_costos = _VistaTeselas(memoryview(self._mapa), self.filas, self.columnas, tesela,
+                                          self._costos_editados)
+        self.vista_banderas = _VistaDispersa(self._banderas, 0, total)
+        self.vista_factor_recarga = _VistaDispersa(self._factor_recarga, 1, total)
+        self.vista_carga_requerida = _VistaDispersa(self._carga_requerida, 0, total)
+
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        for nombre in ('_mapa', 'vista_costos', 'vista_banderas', 'vista_factor_recarga',
+                       'vista_carga_requerida'):
+            del estado[nombre]
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._crear_vistas()
+
+    def indice(self, fila: int, columna: int) -> int:
+        return fila * self.columnas + columna
+
+    def tiene(self, indice: int, bandera: int) -> bool:
+        return bool(self._banderas.get(indice, 0) & bandera)
+
+    def marcar(self, indice: int, bandera: int, valor: bool = True):
+        if valor:
+            self.vista_banderas[indice] |= bandera
+        else:
+            self.vista_banderas[indice] &= ~bandera & 0xFF
+
+    def limpiar(self, bandera: int):
+        """Apaga una bandera recorriendo solo las celdas que tienen alguna"""
+        banderas = self._banderas
+        for indice, valor in list(banderas.items()):
+            if valor & bandera:
+                if valor & ~bandera:
+                    banderas[indice] = valor & ~bandera
+                else:
+                    del banderas[indice]
+
+    def _indices_con(self, bandera: int):
+        return sorted(indice for indice, valor in self._banderas.items() if valor & bandera)
+
+    def cargar_bitboard(self, bandera: int, tablero: int):
+        """Enciende la bandera exactamente en las celdas del tablero y la apaga en las demás"""
+        self.limpiar(bandera)
+        while tablero:
+            menor = tablero & -tablero
+            self.marcar(menor.bit_length() - 1, bandera)
+            tablero ^= menor
+
+    def coordenadas_con(self, bandera: int):
+        """Coordenadas (fila, columna) de las celdas que tienen la bandera"""
+        return [divmod(indice, self.columnas) for indice in self._indices_con(bandera)]
+
+    def costos_en(self, indices: np.ndarray) -> np.ndarray:
+        """Costos de muchas celdas a la vez (índices planos), leyendo solo sus teselas"""
+        indices = np.asarray(indices, dtype=np.int64)
+        tesela = self.tamano_tesela
+        fila, columna = np.divmod(indices, self.columnas)
+        teselas_por_fila = -(-self.columnas // tesela)
+        desplazamientos = (((fila // tesela) * teselas_por_fila + columna // tesela) * tesela
+                           + fila % tesela) * tesela + columna % tesela
+        costos = self._mapa[desplazamientos].astype(np.int64)
+        if self._costos_editados:
+            editados = np.fromiter(self._costos_editados, dtype=np.int64, count=len(self._costos_editados))
+            for posicion in np.flatnonzero(np.isin(indices, editados)).tolist():
+                costos[posicion] = self._costos_editados[int(indices[posicion])]
+        return costos
+
+    def huella_costos(self) -> str:
+        """SHA-256 de los costos por filas (calculada al escribir el archivo) con las ediciones"""
+        if not self._costos_editados:
+            return self.metadatos['huellaCostos']
+        huella = hashlib.sha256(self.metadatos['huellaCostos'].encode('ascii'))
+        huella.update(json.dumps(sorted(self._costos_editados.items())).encode('ascii'))
+        return huella.hexdigest()
+
+
+def escribir_mapa(ruta: str, filas: int, columnas: int, bandas_costos: Iterable[np.ndarray],
+                  elementos: dict, tamano_tesela: int = TAMANO_TESELA_POR_DEFECTO,
+                  tipo_costos: str = '<i4'):
+    """
+    Escribe un universo binario sin tener la matriz completa en memoria.
+    bandas_costos entrega, en orden, bloques de filas completas (arreglos de k x columnas);
+    elementos tiene las claves del JSON salvo 'matriz' y 'matrizInicial' (origen, destino,
+    cargaInicial, agujerosNegros, ...). Solo se retiene en memoria una franja de teselas.
+    """
+    if tamano_tesela <= 0:
+        raise ValueError("El tamaño de tesela debe ser positivo")
+    tipo = np.dtype(tipo_costos)
+    teselas_por_fila = -(-columnas // tamano_tesela)
+    ancho = teselas_por_fila * tamano_tesela
+    franja = np.zeros((tamano_tesela, ancho), dtype=tipo)
+    huella = hashlib.sha256()
+
+    metadatos = {clave: valor for clave, valor in elementos.items() if clave not in ('matriz', 'matrizInicial')}
+    metadatos['tipoCostos'] = tipo.str
+    # La huella se completa al final; se reserva su lugar con un valor del mismo largo
+    metadatos['huellaCostos'] = "0" * 64
+    texto = json.dumps(metadatos).encode('utf-8')
+    desplazamiento = -(-(_CABECERA.size + len(texto)) // _ALINEACION) * _ALINEACION
+
+    def volcar(f, filas_llenas: int):
+        franja[filas_llenas:] = 0
+        # (filas de tesela, teselas, columnas de tesela) -> teselas contiguas
+        teselas = franja.reshape(tamano_tesela, teselas_por_fila, tamano_tesela).transpose(1, 0, 2)
+        f.write(np.ascontiguousarray(teselas).tobytes())
+
+    with open(ruta, 'wb') as f:
+        f.seek(desplazamiento)
+        llenas = 0
+        escritas = 0
+        for banda in bandas_costos:
+            banda = np.asarray(banda).reshape(-1, columnas)
+            if banda.size and (banda.min() < np.iinfo(tipo).min or banda.max() > np.iinfo(tipo).max):
+                raise ValueError(f"Hay costos que no entran en el tipo {tipo.str}")
+            huella.update(banda.astype('<i4').tobytes())
+            inicio = 0
+            while inicio < len(banda):
+                cantidad = min(tamano_tesela - llenas, len(banda) - inicio)
+                franja[llenas:llenas + cantidad, :columnas] = banda[inicio:inicio + cantidad]
+                llenas += cantidad
+                inicio += cantidad
+                if llenas == tamano_tesela:
+                    volcar(f, llenas)
+                    escritas += llenas
+                    llenas = 0
+        if llenas:
+            volcar(f, llenas)
+            escritas += llenas
+        if escritas != filas:
+            raise ValueError(f"Se esperaban {filas} filas de costos y llegaron {escritas}")
+
+        metadatos['huellaCostos'] = huella.hexdigest()
+        f.seek(0)
+        f.write(_CABECERA.pack(_MAGICO, _VERSION, tamano_tesela, filas, columnas, desplazamiento, len(texto)))
+        f.write(json.dumps(metadatos).encode('utf-8'))
+
+
+def convertir_json(archivo_json: str, ruta: str, tamano_tesela: int = TAMANO_TESELA_POR_DEFECTO,
+                   tipo_costos: str = '<i4'):
+    """Convierte un universo en JSON al formato binario mapeable"""
+    with open(archivo_json, 'r') as f:
+        datos = json.load(f)
+    filas = datos['matriz']['filas']
+    columnas = datos['matriz']['columnas']
+    costos = np.asarray(datos['matrizInicial']).reshape(filas, columnas)
+    escribir_mapa(ruta, filas, columnas, (costos[i:i + tamano_tesela] for i in range(0, filas, tamano_tesela)),
+                  datos, tamano_tesela, tipo_costos)
+
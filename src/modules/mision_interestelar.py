@@ -1,69 +1,226 @@
-import pygame
-import sys
 import json
-from typing import List, Tuple, Dict, Optional
+import heapq
+import threading
+from contextlib import closing, nullcontext
+from typing import Callable, List, Tuple, Dict, Iterator, Optional
+from modules.matriz_compacta import (MatrizCompacta, TablaAgujerosGusano, AGUJERO_NEGRO,
+                                     ESTRELLA_GIGANTE, ENTRADA_GUSANO, SALIDA_GUSANO,
+                                     ZONA_RECARGA, DESCARTADA)
+from modules.motor_busqueda import ProblemaUniverso, buscar
+from modules.busqueda_incremental import BusquedaIncremental
+from modules.busqueda_pareto import buscar_pareto
+from modules.factibilidad import Factibilidad, analizar
+from modules.consultas_rutas import ConsultasRutas
+from modules.verificacion_caminos import VerificacionCaminos, verificar_caminos
+from modules.matriz_mapeada import MatrizMapeada
+from modules.estado_busqueda import EstadoBusqueda, Nave
+from modules.cache_soluciones import CacheSoluciones, clave_resolucion, huella_universo
+from modules.solucion_compacta import SolucionCompacta, deserializar_soluciones, serializar_soluciones
+from modules.busqueda_paralela import resolver_en_paralelo
+from modules.rutas_alternativas import buscar_k_rutas
+from modules.contraccion import GrafoContraido, buscar_contraido
+from modules.tabla_transposicion import TablaTransposicion
+from modules.presupuesto import EstadoResolucion, Presupuesto, TokenCancelacion
+from modules.estadisticas import EstadisticasBusqueda
 
 class Celda:
-    def __init__(self, fila: int, columna: int, costo_energia: int):
+    """Vista sobre una celda de la MatrizCompacta; no guarda datos propios"""
+    __slots__ = ('_datos', '_indice', 'fila', 'columna')
+    
+    def __init__(self, datos: MatrizCompacta, fila: int, columna: int):
+        self._datos = datos
+        self._indice = fila * datos.columnas + columna
         self.fila = fila
         self.columna = columna
-        self.costo_energia = costo_energia
-        self.es_agujero_negro = False
-        self.es_estrella_gigante = False
-        self.es_entrada_agujero_gusano = False
-        self.es_salida_agujero_gusano = False
-        self.es_zona_recarga = False
-        self.factor_recarga = 1
-        self.carga_requerida = 0
-        self.visitada = False
+    
+    def _bandera(bandera):
+        def leer(self):
+            return bool(self._datos.vista_banderas[self._indice] & bandera)
+        
+        def escribir(self, valor):
+            self._datos.marcar(self._indice, bandera, valor)
+        
+        return property(leer, escribir)
+    
+    def _valor(nombre):
+        def leer(self):
+            return getattr(self._datos, nombre)[self._indice]
+        
+        def escribir(self, valor):
+            getattr(self._datos, nombre)[self._indice] = valor
+        
+        return property(leer, escribir)
+    
+    es_agujero_negro = _bandera(AGUJERO_NEGRO)
+    es_estrella_gigante = _bandera(ESTRELLA_GIGANTE)
+    es_entrada_agujero_gusano = _bandera(ENTRADA_GUSANO)
+    es_salida_agujero_gusano = _bandera(SALIDA_GUSANO)
+    es_zona_recarga = _bandera(ZONA_RECARGA)
+    descartada = _bandera(DESCARTADA)
+    costo_energia = _valor('vista_costos')
+    factor_recarga = _valor('vista_factor_recarga')
+    carga_requerida = _valor('vista_carga_requerida')
+    del _bandera, _valor
 
-class AgujeroGusano:
-    def __init__(self, entrada: Tuple[int, int], salida: Tuple[int, int]):
-        self.entrada = entrada
-        self.salida = salida
-        self.usado = False
+class FilaMatriz:
+    """Fila de vistas Celda creadas bajo demanda"""
+    __slots__ = ('_datos', '_fila')
+    
+    def __init__(self, datos: MatrizCompacta, fila: int):
+        self._datos = datos
+        self._fila = fila
+    
+    def __len__(self) -> int:
+        return self._datos.columnas
+    
+    def __getitem__(self, columna: int) -> Celda:
+        if columna < 0:
+            columna += self._datos.columnas
+        if not 0 <= columna < self._datos.columnas:
+            raise IndexError("Columna fuera de la matriz")
+        return Celda(self._datos, self._fila, columna)
+    
+    def __iter__(self):
+        for columna in range(self._datos.columnas):
+            yield Celda(self._datos, self._fila, columna)
+
+class VistaMatriz:
+    """Permite seguir usando matriz[fila][columna] sobre la MatrizCompacta"""
+    __slots__ = ('_datos',)
+    
+    def __init__(self, datos: MatrizCompacta):
+        self._datos = datos
+    
+    def __len__(self) -> int:
+        return self._datos.filas
+    
+    def __getitem__(self, fila: int) -> FilaMatriz:
+        if fila < 0:
+            fila += self._datos.filas
+        if not 0 <= fila < self._datos.filas:
+            raise IndexError("Fila fuera de la matriz")
+        return FilaMatriz(self._datos, fila)
+    
+    def __iter__(self):
+        for fila in range(self._datos.filas):
+            yield FilaMatriz(self._datos, fila)
 
-class Nave:
-    def __init__(self, energia: int, posicion: Tuple[int, int]):
-        self.energia = energia
-        self.posicion = posicion
-        self.camino = [posicion]
-        self.energia_inicial = energia
-        self.estrellas_disponibles = 0
-        self.historial_energia = [energia]  # Para seguimiento de energía
-        self.historial_estrellas = [0]      # Para seguimiento de estrellas
+class AgujeroGusano:
+    """Vista sobre un agujero de gusano de la TablaAgujerosGusano"""
+    __slots__ = ('_tabla', '_indice')
+    
+    def __init__(self, tabla: TablaAgujerosGusano, indice: int):
+        self._tabla = tabla
+        self._indice = indice
+    
+    @property
+    def indice(self) -> int:
+        return self._indice
+    
+    @property
+    def entrada(self) -> Tuple[int, int]:
+        i = 2 * self._indice
+        return (self._tabla.entradas[i], self._tabla.entradas[i + 1])
+    
+    @property
+    def salida(self) -> Tuple[int, int]:
+        i = 2 * self._indice
+        return (self._tabla.salidas[i], self._tabla.salidas[i + 1])
 
 class Universo:
-    def __init__(self, archivo_json: str):
+    # Métodos cuya solución es óptima (en pasos) cuando la búsqueda termina completa. El paralelo
+    # no está: es la ruta más corta entre caminos simples, y A* puede acortarla volviendo a una celda
+    METODOS_OPTIMOS = ("astar", "dijkstra", "incremental", "contraido", "pareto")
+    # Métodos que reparten la búsqueda entre procesos hijos
+    METODOS_MULTIPROCESO = ("paralelo",)
+    
+    def __init__(self, archivo_json: Optional[str] = None, datos: Optional[dict] = None,
+                 archivo_mapa: Optional[str] = None):
         self.estrellas_gigantes_originales = []  # Mantener registro original
-        self.estrellas_gigantes_activas = []     # Estrellas disponibles
+        self.agujeros_negros_originales = []
         self.agujeros_gusano = []
-        self.cargar_desde_json(archivo_json)
-        self.nave = Nave(self.carga_inicial, tuple(self.origen))
+        self.gusanos_por_entrada = {}            # (fila, columna) de entrada -> AgujeroGusano
+        self.cargas_requeridas = {}              # (fila, columna) -> carga requerida
+        self.tabla_gusanos = TablaAgujerosGusano()
+        if datos is not None:
+            self.cargar_desde_datos(datos)
+        elif archivo_json is not None:
+            self.cargar_desde_json(archivo_json)
+        elif archivo_mapa is not None:
+            self.cargar_desde_mapa(archivo_mapa)
+        else:
+            raise ValueError("Se necesita un archivo JSON, un archivo mapeado o los datos del universo")
+        # Estado de la nave fuera de las resoluciones (cada resolución usa uno propio)
+        self.estado = EstadoBusqueda(self)
         self.soluciones = []
+        self.presupuesto = None
+        self.tabla_transposicion = None
+        self.estado_resolucion = None
+        self._busqueda_incremental = None
+        self._cerrojo_incremental = threading.Lock()
+        # Protege la creación perezosa del grafo contraído y de las consultas de rutas
+        self._cerrojo_perezoso = threading.Lock()
+        self._consultas: Optional[ConsultasRutas] = None
+        self._grafo_contraido: Optional[GrafoContraido] = None
+        self.estadisticas = None
+        self.factibilidad: Optional[Factibilidad] = None
+        self.cache: Optional[CacheSoluciones] = None  # caché de soluciones opcional
+    
+    def __getstate__(self):
+        # El presupuesto lleva un token de cancelación local a este proceso
+        estado = self.__dict__.copy()
+        estado['presupuesto'] = None
+        estado['_busqueda_incremental'] = None
+        estado['_cerrojo_incremental'] = None
+        estado['_cerrojo_perezoso'] = None
+        estado['_consultas'] = None
+        estado['_grafo_contraido'] = None
+        estado['estadisticas'] = None
+        estado['cache'] = None
+        return estado
+    
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._cerrojo_incremental = threading.Lock()
+        self._cerrojo_perezoso = threading.Lock()
     
     def cargar_desde_json(self, archivo_json: str):
         with open(archivo_json, 'r') as f:
             data = json.load(f)
-        
-        self.filas = data['matriz']['filas']
-        self.columnas = data['matriz']['columnas']
+        self.cargar_desde_datos(data)
+    
+    def cargar_desde_datos(self, data: dict):
+        """Carga el universo desde un diccionario con el mismo formato que el JSON"""
+        filas, columnas = data['matriz']['filas'], data['matriz']['columnas']
+        self._configurar(data, MatrizCompacta(filas, columnas, data['matrizInicial']))
+    
+    def cargar_desde_mapa(self, archivo_mapa: str):
+        """
+        Abre un universo binario (ver modules.matriz_mapeada) sin leer la matriz de costos:
+        las páginas se cargan a medida que la búsqueda las visita
+        """
+        celdas = MatrizMapeada(archivo_mapa)
+        self._configurar(celdas.metadatos, celdas)
+    
+    def _configurar(self, data: dict, celdas):
+        """Ubica los elementos del universo sobre la matriz de celdas ya creada"""
+        self.filas = celdas.filas
+        self.columnas = celdas.columnas
         self.origen = data['origen']
         self.destino = data['destino']
         self.carga_inicial = data['cargaInicial']
         
-        # Inicializar matriz
-        self.matriz = [[Celda(i, j, data['matrizInicial'][i][j]) 
-                      for j in range(self.columnas)] 
-                      for i in range(self.filas)]
+        # Matriz (arreglos compactos o mapeados + vistas por celda)
+        self.celdas = celdas
+        self.matriz = VistaMatriz(self.celdas)
         
         # Configurar agujeros negros
+        self.agujeros_negros_originales = data['agujerosNegros'].copy()
         for an in data['agujerosNegros']:
             self.matriz[an[0]][an[1]].es_agujero_negro = True
         
-        # Configurar estrellas gigantes (mantener dos listas)
+        # Configurar estrellas gigantes
         self.estrellas_gigantes_originales = data['estrellasGigantes'].copy()
-        self.estrellas_gigantes_activas = data['estrellasGigantes'].copy()
         for eg in data['estrellasGigantes']:
             self.matriz[eg[0]][eg[1]].es_estrella_gigante = True
         
@@ -71,7 +228,9 @@ class Universo:
         for ag in data['agujerosGusano']:
             entrada = tuple(ag['entrada'])
             salida = tuple(ag['salida'])
-            self.agujeros_gusano.append(AgujeroGusano(entrada, salida))
+            indice = self.tabla_gusanos.agregar(entrada, salida)
+            self.agujeros_gusano.append(AgujeroGusano(self.tabla_gusanos, indice))
+            self.gusanos_por_entrada[entrada] = self.agujeros_gusano[-1]
             self.matriz[entrada[0]][entrada[1]].es_entrada_agujero_gusano = True
             self.matriz[salida[0]][salida[1]].es_salida_agujero_gusano = True
         
@@ -84,61 +243,34 @@ class Universo:
         for ccr in data['celdasCargaRequerida']:
             coord = tuple(ccr['coordenada'])
             self.matriz[coord[0]][coord[1]].carga_requerida = ccr['cargaGastada']
+            self.cargas_requeridas[coord] = ccr['cargaGastada']
+    
+    @property
+    def nave(self) -> Nave:
+        return self.estado.nave
+    
+    @property
+    def estrellas_gigantes_activas(self) -> set:
+        """Estrellas todavía disponibles (fila, columna) en el estado de la nave"""
+        return self.estado.estrellas_activas
     
     def reiniciar_estrellas(self):
         """Restablece las estrellas gigantes a su estado original"""
-        self.estrellas_gigantes_activas = self.estrellas_gigantes_originales.copy()
-        for eg in self.estrellas_gigantes_originales:
-            self.matriz[eg[0]][eg[1]].es_estrella_gigante = True
+        self.estado.estrellas_activas = {tuple(eg) for eg in self.estrellas_gigantes_originales}
+    
+    def reiniciar_nave(self):
+        """Vuelve la nave, las estrellas, los agujeros negros y los gusanos a su estado inicial"""
+        self.estado = EstadoBusqueda(self)
     
     def es_valida(self, fila: int, columna: int) -> bool:
         return 0 <= fila < self.filas and 0 <= columna < self.columnas
     
     def es_segura(self, fila: int, columna: int) -> bool:
-        celda = self.matriz[fila][columna]
-        
-        if celda.es_agujero_negro:
-            return self.nave.estrellas_disponibles > 0
-        
-        if celda.carga_requerida > self.nave.energia:
-            return False
-        
-        return True
+        return self.estado.es_segura(fila, columna)
     
-    def mover_nave(self, fila: int, columna: int):
-        celda = self.matriz[fila][columna]
-        
-        # Registrar estado antes del movimiento
-        energia_previa = self.nave.energia
-        estrellas_previa = self.nave.estrellas_disponibles
-        
-        # Consumir energía (excepto en zonas de recarga)
-        if not celda.es_zona_recarga:
-            self.nave.energia -= celda.costo_energia
-        
-        # Recolectar estrella gigante si está disponible
-        if [fila, columna] in self.estrellas_gigantes_activas:
-            self.nave.estrellas_disponibles += 1
-            self.estrellas_gigantes_activas.remove([fila, columna])
-            self.matriz[fila][columna].es_estrella_gigante = False
-        
-        # Zonas de recarga
-        if celda.es_zona_recarga:
-            self.nave.energia *= celda.factor_recarga
-        
-        # Usar estrella para destruir agujero negro
-        if celda.es_agujero_negro and self.nave.estrellas_disponibles > 0:
-            self.nave.estrellas_disponibles -= 1
-            celda.es_agujero_negro = False
-        
-        # Actualizar posición y registro
-        self.nave.posicion = (fila, columna)
-        self.nave.camino.append((fila, columna))
-        celda.visitada = True
-        
-        # Registrar cambios
-        self.nave.historial_energia.append(self.nave.energia)
-        self.nave.historial_estrellas.append(self.nave.estrellas_disponibles)
+    def mover_nave(self, fila: int, columna: int, rastro: Optional[list] = None):
+        """Mueve la nave del estado propio del Universo (ver EstadoBusqueda.mover_nave)"""
+        self.estado.mover_nave(fila, columna, rastro)
     
     def obtener_estado_nave_en_camino(self, paso: int) -> Tuple[int, int]:
         """Obtiene energía y estrellas en un paso específico del camino"""
@@ -150,88 +282,453 @@ class Universo:
     def es_destino(self, fila: int, columna: int) -> bool:
         return fila == self.destino[0] and columna == self.destino[1]
     
-    def resolver(self):
-        # Reiniciar estado antes de resolver
-        self.reiniciar_estrellas()
-        self.nave = Nave(self.carga_inicial, tuple(self.origen))
-        self.soluciones = []
+    # --- Edición del universo ---
+    
+    def set_costo(self, fila: int, columna: int, costo: int):
+        """Cambia el costo de energía de una celda"""
+        self._validar_celda(fila, columna)
+        if costo < 0:
+            raise ValueError("El costo de energía no puede ser negativo")
+        self.matriz[fila][columna].costo_energia = costo
+        self._notificar_cambio([(fila, columna)])
+    
+    def add_agujero_negro(self, fila: int, columna: int):
+        """Agrega un agujero negro en una celda libre"""
+        self._validar_celda(fila, columna)
+        if self.matriz[fila][columna].es_agujero_negro or [fila, columna] in self.agujeros_negros_originales:
+            raise ValueError(f"Ya hay un agujero negro en ({fila}, {columna})")
+        self.agujeros_negros_originales.append([fila, columna])
+        self.matriz[fila][columna].es_agujero_negro = True
+        self._notificar_cambio([(fila, columna)],
+                               lambda problema: problema.agregar_agujero_negro((fila, columna)))
+    
+    def remove_agujero_negro(self, fila: int, columna: int):
+        """Quita un agujero negro existente"""
+        if [fila, columna] not in self.agujeros_negros_originales:
+            raise ValueError(f"No hay un agujero negro en ({fila}, {columna})")
+        self.agujeros_negros_originales.remove([fila, columna])
+        self.matriz[fila][columna].es_agujero_negro = False
+        self._notificar_cambio([(fila, columna)],
+                               lambda problema: problema.quitar_agujero_negro((fila, columna)))
+    
+    def move_estrella(self, desde: Tuple[int, int], hacia: Tuple[int, int]):
+        """Mueve una estrella gigante a otra celda"""
+        desde, hacia = tuple(desde), tuple(hacia)
+        self._validar_celda(*hacia)
+        if list(desde) not in self.estrellas_gigantes_originales:
+            raise ValueError(f"No hay una estrella gigante en {desde}")
+        if list(hacia) in self.estrellas_gigantes_originales:
+            raise ValueError(f"Ya hay una estrella gigante en {hacia}")
+        self.estrellas_gigantes_originales[self.estrellas_gigantes_originales.index(list(desde))] = list(hacia)
+        self.matriz[desde[0]][desde[1]].es_estrella_gigante = False
+        self.matriz[hacia[0]][hacia[1]].es_estrella_gigante = True
+        self._notificar_cambio([desde, hacia], lambda problema: problema.mover_estrella(desde, hacia))
+    
+    def move_zona_recarga(self, desde: Tuple[int, int], hacia: Tuple[int, int]):
+        """Mueve una zona de recarga (con su factor) a otra celda"""
+        desde, hacia = tuple(desde), tuple(hacia)
+        self._validar_celda(*hacia)
+        origen, destino = self.matriz[desde[0]][desde[1]], self.matriz[hacia[0]][hacia[1]]
+        if not origen.es_zona_recarga:
+            raise ValueError(f"No hay una zona de recarga en {desde}")
+        if destino.es_zona_recarga:
+            raise ValueError(f"Ya hay una zona de recarga en {hacia}")
+        destino.es_zona_recarga = True
+        destino.factor_recarga = origen.factor_recarga
+        origen.es_zona_recarga = False
+        origen.factor_recarga = 1
+        self._notificar_cambio([desde, hacia], lambda problema: problema.mover_recarga(desde, hacia))
+    
+    def _validar_celda(self, fila: int, columna: int):
+        if not self.es_valida(fila, columna):
+            raise ValueError(f"Celda fuera de la matriz: ({fila}, {columna})")
+    
+    def _notificar_cambio(self, celdas: List[Tuple[int, int]],
+                          actualizar: Optional[Callable[[ProblemaUniverso], None]] = None):
+        """
+        Propaga una edición a la búsqueda incremental, que repara solo lo afectado, y a las
+        consultas de rutas (sus mapas de costo restante no dependen de lo editable).
+        La nave vuelve al estado inicial del universo editado y el grafo contraído se rehace.
+        """
+        self.reiniciar_nave()
+        self._grafo_contraido = None
+        if self._consultas is not None and actualizar is not None:
+            actualizar(self._consultas.problema)
+        busqueda = self._busqueda_incremental
+        if busqueda is None:
+            return
+        if actualizar is not None:
+            actualizar(busqueda.problema)
+        busqueda.invalidar(celdas)
+    
+    def resolver(self, metodo: str = "backtracking", capacidad_tabla: Optional[int] = None,
+                 trabajadores: Optional[int] = None, max_segundos: Optional[float] = None,
+                 max_nodos: Optional[int] = None, cancelacion: Optional[TokenCancelacion] = None,
+                 estadisticas: Optional[EstadisticasBusqueda] = None):
+        """
+        Resuelve la misión con el método indicado: backtracking, backtracking_iterativo, astar,
+        dijkstra, paralelo, incremental, contraido o pareto.
+        Con capacidad_tabla el backtracking iterativo usa una tabla de transposición de ese tamaño
+        (queda en self.tabla_transposicion para consultar aciertos y podas).
+        El método paralelo reparte la búsqueda en 'trabajadores' procesos (por defecto os.cpu_count()).
+        Como el backtracking, recorre caminos simples (sin repetir celdas): su resultado es la ruta
+        más corta de ese modelo, y si termina sin solución puede existir una ruta que vuelve sobre
+        una celda (la que encuentra A*).
+        El método incremental es un A* que conserva su árbol entre llamadas: después de editar el
+        universo (set_costo, add_agujero_negro, move_estrella, ...) solo repara lo afectado.
+        El método contraido es un A* sobre el grafo de corredores entre celdas especiales
+        (self.grafo_contraido, ver modules.contraccion).
+        El método pareto deja en self.soluciones las rutas no dominadas en pasos, energía final y
+        estrellas finales, de la más corta a la más larga. Guarda un número acotado de etiquetas
+        por celda (ver modules.busqueda_pareto): si tuvo que descartar alguna, el frente queda
+        marcado como incompleto en estado_resolucion.
+        
+        max_segundos, max_nodos y cancelacion acotan la búsqueda: al agotarse se devuelve lo mejor
+        encontrado (una solución parcial marcada con 'completa': False si no se llegó al destino).
+        self.estado_resolucion indica si el resultado está completo y si es óptimo.
         
-        # Resetear celdas visitadas
-        for fila in self.matriz:
-            for celda in fila:
-                celda.visitada = False
+        Si se pasa un objeto EstadisticasBusqueda, queda en self.estadisticas con los contadores
+        de la búsqueda y el tiempo por fase; su al_progreso se llama cada 'intervalo' nodos.
         
-        # Resetear agujeros de gusano
-        for ag in self.agujeros_gusano:
-            ag.usado = False
+        Antes de buscar se verifica la factibilidad (self.factibilidad): si está demostrado que
+        no hay solución no se busca, y las celdas que no pueden estar en ninguna ruta quedan
+        descartadas para todos los métodos salvo el incremental.
+        
+        Con self.cache, un universo sin cambios resuelto antes con el mismo método y
+        capacidad_tabla devuelve el resultado guardado (estado_resolucion.desde_cache).
+        'trabajadores' no forma parte de la clave: solo cambia cómo se reparte la búsqueda
+        paralela, no la longitud de la mejor ruta.
+        
+        La búsqueda trabaja sobre un EstadoBusqueda propio y los resultados se publican en el
+        Universo recién al terminar; resolucion() hace lo mismo sin publicarlos.
+        """
+        return self._publicar(self.resolucion(metodo, capacidad_tabla, trabajadores, max_segundos,
+                                              max_nodos, cancelacion, estadisticas))
+    
+    def resolucion(self, metodo: str = "backtracking", capacidad_tabla: Optional[int] = None,
+                   trabajadores: Optional[int] = None, max_segundos: Optional[float] = None,
+                   max_nodos: Optional[int] = None, cancelacion: Optional[TokenCancelacion] = None,
+                   estadisticas: Optional[EstadisticasBusqueda] = None) -> EstadoBusqueda:
+        """
+        Igual que resolver(), pero sin modificar el Universo: devuelve el EstadoBusqueda de la
+        resolución (soluciones, estado_resolucion, factibilidad, presupuesto, ...). Varias
+        resoluciones pueden correr a la vez en hilos distintos sobre el mismo Universo; el
+        método incremental comparte su árbol y se ejecuta de a una resolución por vez.
+        """
+        solucionadores = {
+            "backtracking": lambda estado: estado._resolver_backtracking(self.origen[0], self.origen[1]),
+            "backtracking_iterativo": lambda estado: estado._resolver_backtracking_iterativo(),
+            "astar": lambda estado: self._resolver_por_estados(estado, usar_heuristica=True),
+            "dijkstra": lambda estado: self._resolver_por_estados(estado, usar_heuristica=False),
+            "paralelo": lambda estado: self._resolver_paralelo(estado, trabajadores),
+            "incremental": self._resolver_incremental,
+            "contraido": self._resolver_contraido,
+            "pareto": self._resolver_pareto,
+        }
+        if metodo not in solucionadores:
+            raise ValueError(f"Método de resolución desconocido: {metodo}")
         
-        self._resolver_backtracking(self.origen[0], self.origen[1])
+        estado = self._nuevo_estado(capacidad_tabla, max_segundos, max_nodos, cancelacion, estadisticas)
+        clave = self._clave_cache(metodo, {'capacidad_tabla': capacidad_tabla})
+        if self._restaurar_de_cache(estado, clave):
+            return estado
+        with self._fase(estadisticas, "factibilidad"):
+            factible = self._analizar_factibilidad(estado)
+        with self._fase(estadisticas, "busqueda"):
+            if factible:
+                solucionadores[metodo](estado)
+        with self._fase(estadisticas, "cierre"):
+            estado._cerrar_resolucion(metodo, optimizable=metodo in self.METODOS_OPTIMOS)
+        self._guardar_en_cache(estado, clave)
+        return estado
+    
+    def _nuevo_estado(self, capacidad_tabla: Optional[int], max_segundos: Optional[float],
+                      max_nodos: Optional[int], cancelacion: Optional[TokenCancelacion],
+                      estadisticas: Optional[EstadisticasBusqueda]) -> EstadoBusqueda:
+        presupuesto = Presupuesto(max_segundos, max_nodos, cancelacion)
+        if estadisticas is not None:
+            estadisticas.reiniciar()
+        with self._fase(estadisticas, "preparacion"):
+            tabla = None
+            if capacidad_tabla:
+                tabla = TablaTransposicion(capacidad_tabla, exactas=self._bits_salidas_gusano())
+            return EstadoBusqueda(self, presupuesto, estadisticas, tabla)
+    
+    def _bits_salidas_gusano(self) -> int:
+        """Bitboard de las salidas de agujeros de gusano (un salto puede caer en una ya visitada)"""
+        salidas = self.tabla_gusanos.salidas
+        bits = 0
+        for i in range(0, len(salidas), 2):
+            bits |= 1 << (salidas[i] * self.columnas + salidas[i + 1])
+        return bits
+    
+    def _publicar(self, estado: EstadoBusqueda) -> list:
+        """Deja en el Universo los resultados de una resolución terminada"""
+        self.tabla_transposicion = estado.tabla_transposicion
+        self.presupuesto = estado.presupuesto
+        self.estadisticas = estado.estadisticas
+        self.factibilidad = estado.factibilidad
+        self.estado_resolucion = estado.estado_resolucion
+        self.soluciones = estado.soluciones
         return self.soluciones
     
-    def _resolver_backtracking(self, fila: int, columna: int) -> bool:
-        if self.es_destino(fila, columna):
-            self.soluciones.append({
-                'camino': self.nave.camino.copy(),
-                'energia': self.nave.historial_energia.copy(),
-                'estrellas': self.nave.historial_estrellas.copy()
-            })
+    def _clave_cache(self, metodo: str, parametros: dict) -> Optional[str]:
+        if self.cache is None:
+            return None
+        return clave_resolucion(huella_universo(self), metodo, parametros)
+    
+    def _restaurar_de_cache(self, estado: EstadoBusqueda, clave: Optional[str]) -> bool:
+        """Carga soluciones y estado guardados con la clave; False si no hay caché o no está"""
+        if clave is None:
+            return False
+        entrada = self.cache.obtener(clave)
+        if entrada is None:
+            return False
+        soluciones, guardado = entrada
+        estado.soluciones = soluciones
+        estado.estado_resolucion = EstadoResolucion(**guardado, desde_cache=True)
+        return True
+    
+    def _guardar_en_cache(self, estado: EstadoBusqueda, clave: Optional[str]):
+        """Guarda la resolución si terminó sin que la cortara el presupuesto"""
+        if clave is None or estado.presupuesto.agotado:
+            return
+        resultado = estado.estado_resolucion
+        self.cache.guardar(clave, estado.soluciones, {
+            'metodo': resultado.metodo, 'completa': resultado.completa, 'optima': resultado.optima,
+            'motivo': resultado.motivo, 'nodos_expandidos': resultado.nodos_expandidos,
+            'segundos': resultado.segundos,
+        })
+    
+    @staticmethod
+    def _fase(estadisticas: Optional[EstadisticasBusqueda], nombre: str):
+        """Mide una fase si hay estadísticas activas (sin costo en caso contrario)"""
+        if estadisticas is None:
+            return nullcontext()
+        return estadisticas.fase(nombre)
+    
+    def verificar_factibilidad(self) -> bool:
+        """
+        Análisis previo en tiempo casi lineal (ver modules.factibilidad): guarda el resultado en
+        self.factibilidad, marca las celdas descartadas en la grilla y devuelve False si no hay
+        solución. Las resoluciones hacen su propio análisis y no marcan la grilla.
+        """
+        if not self.celdas.en_memoria:
+            # Inundar la grilla entera leería todo el archivo: fuera de memoria no se analiza
+            self.factibilidad = None
+            return True
+        self.factibilidad = analizar(self)
+        self.celdas.cargar_bitboard(DESCARTADA, self.factibilidad.descartadas)
+        return self.factibilidad.factible
+    
+    def _analizar_factibilidad(self, estado: EstadoBusqueda) -> bool:
+        """Análisis previo de una resolución: deja en el estado el resultado y las celdas descartadas"""
+        if not self.celdas.en_memoria:
             return True
+        estado.factibilidad = analizar(self)
+        estado.descartadas = estado.factibilidad.celdas_descartadas(self.filas, self.columnas)
+        return estado.factibilidad.factible
+    
+    def iter_soluciones(self, capacidad_tabla: Optional[int] = None, max_segundos: Optional[float] = None,
+                        max_nodos: Optional[int] = None,
+                        cancelacion: Optional[TokenCancelacion] = None,
+                        estadisticas: Optional[EstadisticasBusqueda] = None) -> Iterator[dict]:
+        """
+        Genera las soluciones a medida que el backtracking iterativo las encuentra.
+        Solo la solución en curso vive en memoria, en un EstadoBusqueda propio del generador.
+        El generador termina si se agota el presupuesto.
+        """
+        estado = self._nuevo_estado(capacidad_tabla, max_segundos, max_nodos, cancelacion, estadisticas)
+        self.tabla_transposicion = estado.tabla_transposicion
+        self.presupuesto = estado.presupuesto
+        self.estadisticas = estadisticas
+        factible = self._analizar_factibilidad(estado)
+        self.factibilidad = estado.factibilidad
+        if factible:
+            yield from estado._iterar_backtracking()
+    
+    def mejores_soluciones(self, k: int, criterio: str = "energia",
+                           max_soluciones: Optional[int] = None,
+                           capacidad_tabla: Optional[int] = None, max_segundos: Optional[float] = None,
+                           max_nodos: Optional[int] = None,
+                           cancelacion: Optional[TokenCancelacion] = None,
+                           estadisticas: Optional[EstadisticasBusqueda] = None) -> List[dict]:
+        """
+        Conserva las k mejores soluciones según el criterio, usando un heap acotado:
+            - energia:   mayor energía final
+            - longitud:  camino más corto
+            - estrellas: más estrellas disponibles al llegar
+        max_soluciones limita cuántas soluciones se examinan (None = todas).
+        Si se enumeraron todas las soluciones (sin corte ni podas de la tabla de transposición),
+        estado_resolucion las marca completas y óptimas.
+        Usa self.cache igual que resolver() y, como resolver(), publica el resultado al terminar.
+        """
+        claves = {
+            "energia": lambda sol: sol['energia'][-1],
+            "longitud": lambda sol: -len(sol['camino']),
+            "estrellas": lambda sol: sol['estrellas'][-1],
+        }
+        if criterio not in claves:
+            raise ValueError(f"Criterio de ordenamiento desconocido: {criterio}")
+        if k <= 0:
+            raise ValueError("k debe ser positivo")
+        clave = claves[criterio]
         
-        if self.nave.energia <= 0:
-            return False
+        estado = self._nuevo_estado(capacidad_tabla, max_segundos, max_nodos, cancelacion, estadisticas)
+        clave_cache = self._clave_cache("mejores_soluciones", {
+            'k': k, 'criterio': criterio, 'max_soluciones': max_soluciones, 'capacidad_tabla': capacidad_tabla})
+        if self._restaurar_de_cache(estado, clave_cache):
+            return self._publicar(estado)
+        
+        mejores = []  # heap mínimo de (clave, -orden, solución): la peor queda en la cima
+        recortada = False
+        if self._analizar_factibilidad(estado):
+            with closing(estado._iterar_backtracking()) as generador:
+                for orden, solucion in enumerate(generador):
+                    if max_soluciones is not None and orden >= max_soluciones:
+                        recortada = True
+                        break
+                    elemento = (clave(solucion), -orden, solucion)
+                    if len(mejores) < k:
+                        heapq.heappush(mejores, elemento)
+                    else:
+                        heapq.heappushpop(mejores, elemento)
+        
+        estado.soluciones = [solucion for _, _, solucion in sorted(mejores, reverse=True)]
+        # Una poda de la tabla conserva la existencia de solución, pero saltea los caminos de la
+        # llegada dominada: con podas la enumeración ya no es completa
+        tabla = estado.tabla_transposicion
+        estado._cerrar_resolucion("mejores_soluciones", optimizable=capacidad_tabla is None,
+                                  completa=not recortada and (tabla is None or tabla.podas == 0))
+        self._guardar_en_cache(estado, clave_cache)
+        return self._publicar(estado)
+    
+    def rutas_alternativas(self, k: int, similitud_maxima: Optional[float] = None,
+                           max_examinadas: Optional[int] = None, max_segundos: Optional[float] = None,
+                           max_nodos: Optional[int] = None,
+                           cancelacion: Optional[TokenCancelacion] = None,
+                           estadisticas: Optional[EstadisticasBusqueda] = None) -> List[SolucionCompacta]:
+        """
+        Las k rutas distintas de menos pasos, por el algoritmo de Yen sobre el espacio de estados
+        (ver modules.rutas_alternativas). Con similitud_maxima (0 a 1) se descartan las rutas que
+        comparten con otra ya elegida más que esa fracción de celdas; max_examinadas limita
+        cuántas candidatas se revisan. Quedan en self.soluciones, de la más corta a la más larga;
+        estado_resolucion las marca óptimas si son exactamente las k más cortas.
+        Usa self.cache igual que resolver().
+        """
+        if k <= 0:
+            raise ValueError("k debe ser positivo")
+        estado = self._nuevo_estado(None, max_segundos, max_nodos, cancelacion, estadisticas)
+        clave_cache = self._clave_cache("rutas_alternativas", {
+            'k': k, 'similitud_maxima': similitud_maxima, 'max_examinadas': max_examinadas})
+        if self._restaurar_de_cache(estado, clave_cache):
+            return self._publicar(estado)
         
+        with self._fase(estadisticas, "factibilidad"):
+            factible = self._analizar_factibilidad(estado)
+        completa = True
+        with self._fase(estadisticas, "busqueda"):
+            if factible:
+                estado.soluciones, completa = buscar_k_rutas(
+                    ProblemaUniverso(self, estado.descartadas), k, similitud_maxima, max_examinadas,
+                    self.consultas.heuristica(tuple(self.destino)), estado.presupuesto, estadisticas)
+        with self._fase(estadisticas, "cierre"):
+            estado._cerrar_resolucion("rutas_alternativas", optimizable=similitud_maxima is None,
+                                      completa=completa)
+        self._guardar_en_cache(estado, clave_cache)
+        return self._publicar(estado)
+    
+    def exportar_soluciones(self) -> bytes:
+        """Serializa self.soluciones en un bloque binario compacto"""
+        return serializar_soluciones(self.soluciones)
+    
+    def importar_soluciones(self, datos: bytes) -> List[SolucionCompacta]:
+        """Reemplaza self.soluciones por las guardadas con exportar_soluciones()"""
+        self.soluciones = deserializar_soluciones(datos)
+        return self.soluciones
+    
+    def verificar_caminos(self, caminos: Optional[list] = None) -> VerificacionCaminos:
+        """
+        Verifica en lote caminos candidatos (por defecto, los de self.soluciones) contra
+        las reglas de movimiento, sin mover la nave (ver modules.verificacion_caminos)
+        """
+        if caminos is None:
+            caminos = [solucion['camino'] for solucion in self.soluciones]
+        return verificar_caminos(self, caminos)
+    
+    @property
+    def grafo_contraido(self) -> GrafoContraido:
+        """Corredores entre celdas especiales; se arma en el primer uso y se rehace tras editar"""
+        grafo = self._grafo_contraido
+        if grafo is None:
+            if not self.celdas.en_memoria:
+                # Los corredores recorren la grilla entera: fuera de memoria leería todo el archivo
+                raise ValueError("El grafo contraído necesita el universo en memoria")
+            with self._cerrojo_perezoso:
+                if self._grafo_contraido is None:
+                    self._grafo_contraido = GrafoContraido(ProblemaUniverso(self))
+                grafo = self._grafo_contraido
+        return grafo
+    
+    # --- Consultas de rutas ---
+    
+    @property
+    def consultas(self) -> ConsultasRutas:
+        """Precálculos compartidos por las consultas de rutas; se arman en la primera consulta"""
+        if self._consultas is None:
+            with self._cerrojo_perezoso:
+                if self._consultas is None:
+                    self._consultas = ConsultasRutas(self)
+        return self._consultas
+    
+    def ruta(self, origen: Tuple[int, int], destino: Tuple[int, int], carga: Optional[int] = None,
+             max_segundos: Optional[float] = None, max_nodos: Optional[int] = None) -> Optional[SolucionCompacta]:
+        """
+        Ruta A* de menos pasos entre dos celdas cualesquiera con la carga indicada (por defecto
+        carga_inicial), desde el estado inicial del universo. No toca self.soluciones ni la nave.
+        """
+        return self.consultas.ruta(origen, destino, carga, Presupuesto(max_segundos, max_nodos))
+    
+    def rutas(self, consultas: List[tuple], max_segundos: Optional[float] = None,
+              max_nodos: Optional[int] = None) -> List[Optional[SolucionCompacta]]:
+        """Responde en lote consultas (origen, destino) u (origen, destino, carga), en el mismo orden"""
+        return self.consultas.rutas(consultas, max_segundos, max_nodos)
+    
+    # --- Solucionadores (cada uno trabaja sobre el estado de su resolución) ---
+    
+    def _resolver_por_estados(self, estado: EstadoBusqueda, usar_heuristica: bool = True) -> bool:
+        """Búsqueda A*/Dijkstra sobre el espacio de estados explícito"""
+        problema = ProblemaUniverso(self, estado.descartadas)
+        return estado._tomar_solucion(buscar(problema, usar_heuristica, estado.presupuesto, estado.estadisticas))
+    
+    def _resolver_incremental(self, estado: EstadoBusqueda) -> bool:
+        """A* persistente: la primera llamada construye el árbol, las siguientes lo reutilizan"""
+        with self._cerrojo_incremental:
+            if self._busqueda_incremental is None:
+                self._busqueda_incremental = BusquedaIncremental(ProblemaUniverso(self))
+            return estado._tomar_solucion(self._busqueda_incremental.resolver(estado.presupuesto,
+                                                                               estado.estadisticas))
+    
+    def _resolver_pareto(self, estado: EstadoBusqueda) -> bool:
+        """Frente de Pareto (pasos, energía, estrellas) en una sola búsqueda por etiquetas"""
+        estado.soluciones, completo = buscar_pareto(ProblemaUniverso(self, estado.descartadas),
+                                                    estado.presupuesto, estado.estadisticas)
+        estado.recortada = not completo
+        return bool(estado.soluciones)
+    
+    def _resolver_contraido(self, estado: EstadoBusqueda) -> bool:
+        """A* sobre el grafo contraído; la solución se expande a la grilla"""
+        problema = ProblemaUniverso(self, estado.descartadas)
+        return estado._tomar_solucion(buscar_contraido(self.grafo_contraido, problema, estado.presupuesto,
+                                                       estado.estadisticas))
+    
+    def _resolver_paralelo(self, estado: EstadoBusqueda, trabajadores: Optional[int] = None) -> bool:
+        """Ramificación y poda repartida entre procesos; las soluciones quedan de la mejor a la peor"""
+        estado.soluciones = resolver_en_paralelo(estado, trabajadores)
+        return bool(estado.soluciones)
+    
+    def _movimientos_ordenados(self, fila: int, columna: int) -> List[Tuple[int, int]]:
+        """Movimientos ordenados por distancia Manhattan al destino"""
         movimientos = [(0, 1), (1, 0), (0, -1), (-1, 0)]
         movimientos.sort(key=lambda m: abs(self.destino[0] - (fila + m[0])) + abs(self.destino[1] - (columna + m[1])))
-        
-        for df, dc in movimientos:
-            nueva_fila, nueva_columna = fila + df, columna + dc
-            
-            if self.es_valida(nueva_fila, nueva_columna) and not self.matriz[nueva_fila][nueva_columna].visitada:
-                celda = self.matriz[nueva_fila][nueva_columna]
-                
-                # Guardar estado completo para backtracking
-                estado_anterior = {
-                    'energia': self.nave.energia,
-                    'estrellas': self.nave.estrellas_disponibles,
-                    'camino': self.nave.camino.copy(),
-                    'estrella_activa': [nueva_fila, nueva_columna] in self.estrellas_gigantes_activas,
-                    'agujero_activo': celda.es_agujero_negro,
-                    'visitada': celda.visitada
-                }
-                
-                if self.es_segura(nueva_fila, nueva_columna):
-                    self.mover_nave(nueva_fila, nueva_columna)
-                    
-                    # Manejar agujeros de gusano
-                    for ag in self.agujeros_gusano:
-                        if not ag.usado and (nueva_fila, nueva_columna) == ag.entrada:
-                            ag.usado = True
-                            self.mover_nave(ag.salida[0], ag.salida[1])
-                            nueva_fila, nueva_columna = ag.salida
-                            break
-                    
-                    if len(self.nave.camino) < 200:  # Límite para evitar stack overflow
-                        if self._resolver_backtracking(nueva_fila, nueva_columna):
-                            return True
-                
-                # Backtracking: restaurar estado completo
-                self.nave.energia = estado_anterior['energia']
-                self.nave.estrellas_disponibles = estado_anterior['estrellas']
-                self.nave.camino = estado_anterior['camino'].copy()
-                self.nave.historial_energia = self.nave.historial_energia[:len(self.nave.camino)]
-                self.nave.historial_estrellas = self.nave.historial_estrellas[:len(self.nave.camino)]
-                
-                # Restaurar estado de la celda
-                if estado_anterior['estrella_activa'] and [nueva_fila, nueva_columna] not in self.estrellas_gigantes_activas:
-                    self.estrellas_gigantes_activas.append([nueva_fila, nueva_columna])
-                    self.matriz[nueva_fila][nueva_columna].es_estrella_gigante = True
-                
-                self.matriz[nueva_fila][nueva_columna].es_agujero_negro = estado_anterior['agujero_activo']
-                self.matriz[nueva_fila][nueva_columna].visitada = estado_anterior['visitada']
-                
-                # Restaurar agujeros de gusano
-                for ag in self.agujeros_gusano:
-                    if (nueva_fila, nueva_columna) == ag.entrada:
-                        ag.usado = False
-        
-        return False
\ No newline at end of file
+        return movimientos
@@ -0,0 +1,274 @@
+"""
+Módulo de búsqueda en el espacio de estados del universo (A*/Dijkstra)
+
+Cada estado de la búsqueda se compone de:
+    - posición de la nave
+    - energía disponible
+    - estrellas disponibles
+    - máscara de estrellas gigantes recolectadas
+    - máscara de agujeros negros destruidos
+    - máscara de agujeros de gusano usados
+    - máscara de zonas de recarga ya aprovechadas
+
+Reglas de movimiento (las mismas de Universo.mover_nave):
+    - Un agujero negro activo solo se puede atravesar gastando una estrella.
+    - Una celda con carga requerida exige tener al menos esa energía antes de entrar.
+    - Las zonas de recarga no cobran costo y multiplican la energía una sola vez.
+    - Entrar a la entrada de un agujero de gusano sin usar obliga a saltar a su salida.
+    - Fuera del destino la energía debe seguir siendo positiva.
+    - Las celdas descartadas por el análisis de factibilidad no se pisan.
+
+A diferencia del backtracking, una celda puede volver a pisarse si el estado
+cambió (p. ej. tras recolectar una estrella); las etiquetas dominadas se descartan.
+"""
+
+import heapq
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from modules.matriz_compacta import ZONA_RECARGA
+from modules.presupuesto import Presupuesto
+from modules.solucion_compacta import SolucionCompacta
+from modules.estadisticas import (EstadisticasBusqueda, PODA_AGUJERO_NEGRO, PODA_CARGA_REQUERIDA,
+                                  PODA_CELDA_DESCARTADA, PODA_DOMINANCIA, PODA_SIN_ENERGIA)
+
+MOVIMIENTOS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+class ProblemaUniverso:
+    """
+    Vista estática e indexada del universo para la búsqueda por estados.
+    'descartadas' son las celdas que el análisis de factibilidad de la resolución descartó;
+    la búsqueda incremental no las usa porque el universo puede editarse entre búsquedas.
+    """
+
+    def __init__(self, universo, descartadas: FrozenSet[Tuple[int, int]] = frozenset()):
+        self.filas = universo.filas
+        self.columnas = universo.columnas
+        self.origen = tuple(universo.origen)
+        self.destino = tuple(universo.destino)
+        self.carga_inicial = universo.carga_inicial
+
+        celdas = universo.celdas
+        self.costos = celdas.vista_costos
+        self.cargas_requeridas = universo.cargas_requeridas
+
+        # Cada elemento especial recibe un bit dentro de su máscara
+        self.estrellas = {tuple(eg): i for i, eg in enumerate(universo.estrellas_gigantes_originales)}
+        self.agujeros_negros = {tuple(an): i for i, an in enumerate(universo.agujeros_negros_originales)}
+        self.recargas = {}
+        for fila, columna in celdas.coordenadas_con(ZONA_RECARGA):
+            factor = celdas.vista_factor_recarga[fila * self.columnas + columna]
+            self.recargas[(fila, columna)] = (len(self.recargas), factor)
+        self.gusanos = {entrada: (ag.indice, ag.salida) for entrada, ag in universo.gusanos_por_entrada.items()}
+        self._siguiente_bit_negro = len(self.agujeros_negros)
+        self.descartadas = descartadas
+
+        self._calcular_cotas_gusanos()
+
+    # --- Ediciones locales (mantienen los bits ya asignados a los demás elementos) ---
+
+    def mover_estrella(self, desde: Tuple[int, int], hacia: Tuple[int, int]):
+        self.estrellas[hacia] = self.estrellas.pop(desde)
+
+    def agregar_agujero_negro(self, posicion: Tuple[int, int]):
+        self.agujeros_negros[posicion] = self._siguiente_bit_negro
+        self._siguiente_bit_negro += 1
+
+    def quitar_agujero_negro(self, posicion: Tuple[int, int]):
+        del self.agujeros_negros[posicion]
+
+    def mover_recarga(self, desde: Tuple[int, int], hacia: Tuple[int, int]):
+        self.recargas[hacia] = self.recargas.pop(desde)
+
+    def _calcular_cotas_gusanos(self):
+        """Pasos mínimos (relajados) desde la salida de cada agujero de gusano hasta el destino"""
+        salidas = [(bit, entrada, salida) for entrada, (bit, salida) in self.gusanos.items()]
+        cotas = {bit: self.manhattan(salida, self.destino) for bit, _, salida in salidas}
+
+        # Bellman-Ford sobre los agujeros de gusano (a lo sumo un encadenamiento por gusano)
+        for _ in range(len(salidas)):
+            cambio = False
+            for bit, _, salida in salidas:
+                for otro, entrada, _ in salidas:
+                    candidata = self.manhattan(salida, entrada) + 1 + cotas[otro]
+                    if candidata < cotas[bit]:
+                        cotas[bit] = candidata
+                        cambio = True
+            if not cambio:
+                break
+
+        self.cotas_gusanos = [(entrada, 1 + cotas[bit]) for bit, entrada, _ in salidas]
+
+    @staticmethod
+    def manhattan(a: Tuple[int, int], b: Tuple[int, int]) -> int:
+        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+    def heuristica(self, posicion: Tuple[int, int]) -> int:
+        """Cota inferior admisible de pasos hasta el destino, considerando agujeros de gusano"""
+        mejor = self.manhattan(posicion, self.destino)
+        for entrada, cota in self.cotas_gusanos:
+            candidata = self.manhattan(posicion, entrada) + cota
+            if candidata < mejor:
+                mejor = candidata
+        return mejor
+
+    def es_valida(self, fila: int, columna: int) -> bool:
+        return 0 <= fila < self.filas and 0 <= columna < self.columnas
+
+    def entrar(self, posicion: Tuple[int, int], energia: int, estrellas: int,
+               m_est: int, m_neg: int, m_rec: int) -> Optional[Tuple[int, int, int, int, int]]:
+        """Aplica los efectos de entrar a una celda; devuelve None si no es segura"""
+        if posicion in self.descartadas:
+            return None
+        bit_negro = self.agujeros_negros.get(posicion)
+        negro_activo = bit_negro is not None and not (m_neg >> bit_negro) & 1
+        if negro_activo and estrellas == 0:
+            return None
+        if self.cargas_requeridas.get(posicion, 0) > energia:
+            return None
+
+        recarga = self.recargas.get(posicion)
+        if recarga is None:
+            energia -= self.costos[posicion[0] * self.columnas + posicion[1]]
+
+        bit_estrella = self.estrellas.get(posicion)
+        if bit_estrella is not None and not (m_est >> bit_estrella) & 1:
+            estrellas += 1
+            m_est |= 1 << bit_estrella
+
+        if recarga is not None and not (m_rec >> recarga[0]) & 1:
+            energia *= recarga[1]
+            m_rec |= 1 << recarga[0]
+
+        if negro_activo:
+            estrellas -= 1
+            m_neg |= 1 << bit_negro
+
+        return energia, estrellas, m_est, m_neg, m_rec
+
+    def motivo_rechazo(self, posicion: Tuple[int, int], m_neg: int) -> str:
+        """Motivo de poda cuando entrar() devuelve None"""
+        if posicion in self.descartadas:
+            return PODA_CELDA_DESCARTADA
+        bit_negro = self.agujeros_negros.get(posicion)
+        if bit_negro is not None and not (m_neg >> bit_negro) & 1:
+            return PODA_AGUJERO_NEGRO
+        return PODA_CARGA_REQUERIDA
+
+
+def buscar(problema: ProblemaUniverso, usar_heuristica: bool = True,
+           presupuesto: Optional[Presupuesto] = None,
+           estadisticas: Optional[EstadisticasBusqueda] = None) -> Optional[dict]:
+    """
+    Búsqueda A* (o Dijkstra si usar_heuristica es False) minimizando la cantidad de pasos.
+    Devuelve una solución con el mismo formato que el backtracking o None si no existe.
+    Si el presupuesto se agota devuelve el camino que más se acercó al destino,
+    marcado con 'completa': False.
+    """
+    heuristica = problema.heuristica if usar_heuristica else (lambda posicion: 0)
+    destino = problema.destino
+
+    # Nodos del árbol de búsqueda: (padre, posición, energía, estrellas)
+    nodos: List[Tuple[int, Tuple[int, int], int, int]] = [(-1, problema.origen, problema.carga_inicial, 0)]
+    # Etiquetas no dominadas por estado discreto: clave -> [(pasos, energía, id)]
+    etiquetas: Dict[tuple, List[Tuple[int, int, int]]] = {}
+    descartados = set()
+    abiertos = []
+    mejor_parcial = (problema.heuristica(problema.origen), 0)
+
+    def insertar(id_nodo, posicion, energia, pasos, m_est, m_neg, m_gus, m_rec):
+        clave = (posicion, m_est, m_neg, m_gus, m_rec)
+        lista = etiquetas.setdefault(clave, [])
+        for pasos_e, energia_e, _ in lista:
+            if pasos_e <= pasos and energia_e >= energia:
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_DOMINANCIA)
+                return
+        vigentes = []
+        for etiqueta in lista:
+            if pasos <= etiqueta[0] and energia >= etiqueta[1]:
+                descartados.add(etiqueta[2])
+            else:
+                vigentes.append(etiqueta)
+        vigentes.append((pasos, energia, id_nodo))
+        etiquetas[clave] = vigentes
+        heapq.heappush(abiertos, (pasos + heuristica(posicion), -energia, id_nodo,
+                                  pasos, m_est, m_neg, m_gus, m_rec))
+
+    if problema.carga_inicial > 0 or problema.origen == destino:
+        insertar(0, problema.origen, problema.carga_inicial, 0, 0, 0, 0, 0)
+
+    while abiertos:
+        _, _, id_nodo, pasos, m_est, m_neg, m_gus, m_rec = heapq.heappop(abiertos)
+        if id_nodo in descartados:
+            continue
+        _, posicion, energia, estrellas = nodos[id_nodo]
+
+        if posicion == destino:
+            return reconstruir(nodos, id_nodo)
+
+        if presupuesto is not None:
+            if presupuesto.consumir():
+                return reconstruir(nodos, mejor_parcial[1], completa=False)
+            cercania = problema.heuristica(posicion)
+            if cercania < mejor_parcial[0]:
+                mejor_parcial = (cercania, id_nodo)
+        if estadisticas is not None:
+            estadisticas.expandir(pasos)
+
+        for df, dc in MOVIMIENTOS:
+            fila, columna = posicion[0] + df, posicion[1] + dc
+            if not problema.es_valida(fila, columna):
+                continue
+            siguiente = (fila, columna)
+            efecto = problema.entrar(siguiente, energia, estrellas, m_est, m_neg, m_rec)
+            if efecto is None:
+                if estadisticas is not None:
+                    estadisticas.podar(problema.motivo_rechazo(siguiente, m_neg))
+                continue
+            n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+            n_gus = m_gus
+            n_pasos = pasos + 1
+            id_hijo = len(nodos)
+            nodos.append((id_nodo, siguiente, n_energia, n_estrellas))
+
+            # Salto obligatorio por agujero de gusano
+            gusano = problema.gusanos.get(siguiente)
+            if gusano is not None and not (m_gus >> gusano[0]) & 1:
+                bit, salida = gusano
+                efecto = problema.entrar(salida, n_energia, n_estrellas, n_est, n_neg, n_rec)
+                if efecto is None:
+                    if estadisticas is not None:
+                        estadisticas.podar(problema.motivo_rechazo(salida, n_neg))
+                    continue
+                n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+                n_gus |= 1 << bit
+                n_pasos += 1
+                if estadisticas is not None:
+                    estadisticas.usar_gusano()
+                siguiente = salida
+                nodos.append((id_hijo, siguiente, n_energia, n_estrellas))
+                id_hijo += 1
+
+            if n_energia <= 0 and siguiente != destino:
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_SIN_ENERGIA)
+                continue
+            insertar(id_hijo, siguiente, n_energia, n_pasos, n_est, n_neg, n_gus, n_rec)
+
+    return None
+
+
+def reconstruir(nodos: List[Tuple[int, Tuple[int, int], int, int]], id_nodo: int,
+                completa: bool = True) -> SolucionCompacta:
+    """Reconstruye camino, energía y estrellas siguiendo los punteros al padre"""
+    camino, energia, estrellas = [], [], []
+    while id_nodo != -1:
+        padre, posicion, e, s = nodos[id_nodo]
+        camino.append(posicion)
+        energia.append(e)
+        estrellas.append(s)
+        id_nodo = padre
+    camino.reverse()
+    energia.reverse()
+    estrellas.reverse()
+    return SolucionCompacta.desde_listas(camino, energia, estrellas, completa)
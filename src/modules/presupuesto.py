@@ -0,0 +1,101 @@
+"""
+Módulo de presupuestos de búsqueda y cancelación cooperativa
+
+Los solucionadores consultan el presupuesto en cada nodo que expanden; cuando se
+agota el tiempo, el número de nodos o alguien cancela, la búsqueda se detiene y
+devuelve lo mejor que haya encontrado hasta ese momento.
+"""
+
+import threading
+import time
+from typing import Optional
+
+# Cada cuántos nodos se consulta el reloj y el token de cancelación
+INTERVALO_CONSULTA = 64
+
+
+class TokenCancelacion:
+    """Señal compartida entre hilos (o procesos) para pedir que una búsqueda se detenga"""
+
+    def __init__(self, evento=None):
+        # Acepta cualquier objeto tipo Event (threading o multiprocessing)
+        self._evento = evento if evento is not None else threading.Event()
+
+    def cancelar(self):
+        self._evento.set()
+
+    @property
+    def cancelado(self) -> bool:
+        return self._evento.is_set()
+
+
+class Presupuesto:
+    """Límites de tiempo y de nodos expandidos de una resolución"""
+
+    def __init__(self, max_segundos: Optional[float] = None, max_nodos: Optional[int] = None,
+                 cancelacion: Optional[TokenCancelacion] = None):
+        self.max_segundos = max_segundos
+        self.max_nodos = max_nodos
+        self.cancelacion = cancelacion
+        self.inicio = time.perf_counter()
+        self.nodos = 0
+        self.motivo: Optional[str] = None
+
+    def consumir(self) -> bool:
+        """Cuenta un nodo expandido; devuelve True si la búsqueda debe detenerse"""
+        if self.motivo is not None:
+            return True
+        self.nodos += 1
+        if self.max_nodos is not None and self.nodos > self.max_nodos:
+            self.motivo = "max_nodos"
+        elif self.nodos % INTERVALO_CONSULTA == 0:
+            self.verificar()
+        return self.motivo is not None
+
+    def verificar(self) -> bool:
+        """Consulta reloj y cancelación sin contar un nodo"""
+        if self.motivo is None:
+            if self.cancelacion is not None and self.cancelacion.cancelado:
+                self.motivo = "cancelado"
+            elif self.max_segundos is not None and self.segundos >= self.max_segundos:
+                self.motivo = "max_segundos"
+        return self.motivo is not None
+
+    @property
+    def agotado(self) -> bool:
+        return self.motivo is not None
+
+    @property
+    def segundos(self) -> float:
+        return time.perf_counter() - self.inicio
+
+    def restante(self) -> Optional[float]:
+        if self.max_segundos is None:
+            return None
+        return max(0.0, self.max_segundos - self.segundos)
+
+
+class EstadoResolucion:
+    """
+    Resumen de la última resolución:
+        - completa: la búsqueda terminó sin que la cortara el presupuesto
+        - optima:   la mejor solución devuelta está demostrada óptima para el método
+        - motivo:   por qué se detuvo antes (max_segundos, max_nodos, cancelado) o None
+        - desde_cache: el resultado salió de la caché de soluciones (los contadores son
+          los de la resolución original)
+    """
+
+    def __init__(self, metodo: str, completa: bool, optima: bool, motivo: Optional[str],
+                 nodos_expandidos: int, segundos: float, desde_cache: bool = False):
+        self.metodo = metodo
+        self.completa = completa
+        self.optima = optima
+        self.motivo = motivo
+        self.nodos_expandidos = nodos_expandidos
+        self.segundos = segundos
+        self.desde_cache = desde_cache
+
+    def __repr__(self) -> str:
+        return (f"EstadoResolucion(metodo={self.metodo!r}, completa={self.completa}, "
+                f"optima={self.optima}, motivo={self.motivo!r}, nodos={self.nodos_expandidos}, "
+                f"desde_cache={self.desde_cache})")
@@ -0,0 +1,168 @@
+"""
+Módulo de medición de rendimiento de los solucionadores
+
+Genera universos reproducibles (semillas fijas) en varias escalas, con
+cantidades de elementos proporcionales al área del universo original de 30x30,
+y corre cada método de resolución sobre ellos. Cada corrida registra:
+    - tiempo de reloj (medido sin tracemalloc, para no distorsionarlo)
+    - pico de memoria (una segunda corrida bajo tracemalloc); tracemalloc solo ve
+      el proceso actual, así que en los métodos que reparten la búsqueda entre
+      procesos no se mide y el resultado lo indica en 'nota_memoria'
+    - nodos expandidos y si la búsqueda terminó o la cortó el presupuesto
+    - calidad de la solución: pasos y energía final
+
+Los resultados se guardan en JSON; comparar() los contrasta con una línea base
+y devuelve las regresiones de tiempo y de calidad.
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from modules.generar_matriz import generar_matriz_universo
+from modules.mision_interestelar import Universo
+
+TAMANOS_POR_DEFECTO = (10, 30, 100, 300, 500)
+SEMILLAS_POR_DEFECTO = (1, 2, 3)
+# Métodos de Universo.resolver; "contraido" se mide solo si se pide (arma corredores de toda la grilla)
+METODOS_POR_DEFECTO = ("astar", "dijkstra", "incremental", "pareto", "backtracking_iterativo",
+                       "backtracking", "paralelo")
+
+# Elementos del universo original (30x30) que se escalan con el área
+AREA_BASE = 30 * 30
+ELEMENTOS_BASE = {
+    'num_agujeros_negros': 5,
+    'num_estrellas': 5,
+    'num_gusanos': 3,
+    'num_recargas': 10,
+    'num_cargas_requeridas': 3,
+}
+
+# Por debajo de este tiempo las diferencias son ruido de medición
+SEGUNDOS_MINIMOS_COMPARABLES = 0.005
+
+
+def generar_caso(tamano: int, semilla: int) -> dict:
+    """Universo cuadrado de tamano x tamano con elementos proporcionales al área"""
+    escala = tamano * tamano / AREA_BASE
+    cantidades = {nombre: max(1, round(base * escala)) for nombre, base in ELEMENTOS_BASE.items()}
+    return generar_matriz_universo(tamano, tamano, semilla=semilla, **cantidades)
+
+
+def medir(datos: dict, metodo: str, max_segundos: Optional[float] = None,
+          max_nodos: Optional[int] = None, medir_memoria: bool = True) -> dict:
+    """Resuelve un universo con un método y devuelve las métricas de la corrida"""
+    universo = Universo(datos=datos)
+    inicio = time.perf_counter()
+    soluciones = universo.resolver(metodo, max_segundos=max_segundos, max_nodos=max_nodos)
+    segundos = time.perf_counter() - inicio
+    estado = universo.estado_resolucion
+    mejor = soluciones[0] if soluciones and soluciones[0].get('completa', True) else None
+
+    memoria_pico = None
+    nota_memoria = None
+    if medir_memoria and metodo in Universo.METODOS_MULTIPROCESO:
+        nota_memoria = "no medida: tracemalloc no ve la memoria de los procesos hijos"
+    elif medir_memoria:
+        universo = Universo(datos=datos)
+        tracemalloc.start()
+        try:
+            universo.resolver(metodo, max_segundos=max_segundos, max_nodos=max_nodos)
+            memoria_pico = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'segundos': round(segundos, 6),
+        'memoria_pico': memoria_pico,
+        'nota_memoria': nota_memoria,
+        'nodos_expandidos': estado.nodos_expandidos,
+        'completa': estado.completa,
+        'optima': estado.optima,
+        'motivo': estado.motivo,
+        'resuelto': mejor is not None,
+        'pasos': len(mejor['camino']) - 1 if mejor else None,
+        'energia_final': mejor['energia'][-1] if mejor else None,
+    }
+
+
+def ejecutar(tamanos: Iterable[int] = TAMANOS_POR_DEFECTO,
+             semillas: Iterable[int] = SEMILLAS_POR_DEFECTO,
+             metodos: Iterable[str] = METODOS_POR_DEFECTO,
+             max_segundos: Optional[float] = 10.0, max_nodos: Optional[int] = None,
+             medir_memoria: bool = True, informar=None) -> dict:
+    """
+    Corre todos los métodos sobre todos los casos. 'informar(resultado)' se llama
+    después de cada corrida (p. ej. para mostrar avance).
+    """
+    resultados = []
+    for tamano in tamanos:
+        for semilla in semillas:
+            datos = generar_caso(tamano, semilla)
+            for metodo in metodos:
+                resultado = {'tamano': tamano, 'semilla': semilla, 'metodo': metodo}
+                resultado.update(medir(datos, metodo, max_segundos, max_nodos, medir_memoria))
+                resultados.append(resultado)
+                if informar is not None:
+                    informar(resultado)
+    return {
+        'version': 1,
+        'entorno': {
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+        },
+        'parametros': {'max_segundos': max_segundos, 'max_nodos': max_nodos},
+        'resultados': resultados,
+    }
+
+
+def guardar(informe: dict, archivo: str):
+    with open(archivo, 'w') as f:
+        json.dump(informe, f, indent=2)
+
+
+def cargar(archivo: str) -> dict:
+    with open(archivo, 'r') as f:
+        return json.load(f)
+
+
+def _clave(resultado: dict) -> Tuple[int, int, str]:
+    return resultado['tamano'], resultado['semilla'], resultado['metodo']
+
+
+def comparar(actual: dict, base: dict, tolerancia: float = 0.2) -> List[dict]:
+    """
+    Compara dos informes caso por caso. Devuelve una lista de regresiones:
+        - tiempo:  más lento que la base en más de 'tolerancia' (fracción)
+        - calidad: dejó de resolver, o un método óptimo devolvió más pasos
+        - memoria: pico de memoria mayor que la base en más de 'tolerancia'
+    """
+    if tolerancia < 0:
+        raise ValueError("La tolerancia no puede ser negativa")
+    previos: Dict[Tuple[int, int, str], dict] = {_clave(r): r for r in base['resultados']}
+    regresiones = []
+
+    for resultado in actual['resultados']:
+        previo = previos.get(_clave(resultado))
+        if previo is None:
+            continue
+        caso = dict(zip(('tamano', 'semilla', 'metodo'), _clave(resultado)))
+
+        limite = previo['segundos'] * (1 + tolerancia)
+        if resultado['segundos'] > max(limite, SEGUNDOS_MINIMOS_COMPARABLES):
+            regresiones.append(dict(caso, tipo='tiempo', base=previo['segundos'],
+                                    actual=resultado['segundos']))
+
+        if previo['resuelto'] and not resultado['resuelto']:
+            regresiones.append(dict(caso, tipo='calidad', base=previo['pasos'], actual=None))
+        elif (previo['resuelto'] and resultado['optima'] and previo['optima'] and
+              resultado['pasos'] > previo['pasos']):
+            regresiones.append(dict(caso, tipo='calidad', base=previo['pasos'], actual=resultado['pasos']))
+
+        if previo.get('memoria_pico') and resultado.get('memoria_pico'):
+            if resultado['memoria_pico'] > previo['memoria_pico'] * (1 + tolerancia):
+                regresiones.append(dict(caso, tipo='memoria', base=previo['memoria_pico'],
+                                        actual=resultado['memoria_pico']))
+    return regresiones
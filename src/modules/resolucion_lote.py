@@ -0,0 +1,127 @@
+"""
+Módulo de resolución por lotes (sin interfaz gráfica)
+
+Resuelve muchos archivos de universo repartidos entre procesos y emite un
+registro JSON por línea (JSONL) a medida que cada archivo termina. Un archivo
+que falla (JSON inválido, datos incompletos, ...) se registra con su error y
+no detiene el resto del lote.
+"""
+
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from modules.mision_interestelar import Universo
+from modules.cache_soluciones import CacheSoluciones
+from modules.matriz_mapeada import EXTENSION_MAPA
+
+# Métodos correctos y acotados por archivo. El paralelo ya reparte un universo entre procesos
+# (en lote se paraleliza por archivo) y el contraido guarda capas de la grilla por nodo
+METODOS_LOTE = ("astar", "dijkstra", "incremental", "backtracking", "backtracking_iterativo")
+
+# Una caché por directorio y por proceso: abrirla recorre el directorio una vez, no una por archivo
+_caches: Dict[str, CacheSoluciones] = {}
+
+
+def _cache_de(directorio: str) -> CacheSoluciones:
+    cache = _caches.get(directorio)
+    if cache is None:
+        cache = _caches[directorio] = CacheSoluciones(directorio)
+    return cache
+
+
+def expandir_entradas(entradas: Iterable[str]) -> List[str]:
+    """Convierte directorios, patrones glob y archivos sueltos en una lista ordenada de rutas de universos"""
+    rutas = []
+    for entrada in entradas:
+        if os.path.isdir(entrada):
+            rutas.extend(glob.glob(os.path.join(entrada, "*.json")))
+            rutas.extend(glob.glob(os.path.join(entrada, "*" + EXTENSION_MAPA)))
+        elif glob.has_magic(entrada):
+            rutas.extend(glob.glob(entrada, recursive=True))
+        else:
+            rutas.append(entrada)
+    return sorted(set(rutas))
+
+
+def resolver_archivo(ruta: str, metodo: str = "astar", max_segundos: Optional[float] = None,
+                     max_nodos: Optional[int] = None, directorio_cache: Optional[str] = None) -> dict:
+    """
+    Resuelve un archivo y devuelve su registro; los errores quedan en el campo 'error'.
+    Con directorio_cache, los universos ya resueltos se leen de la caché en disco.
+    Los archivos EXTENSION_MAPA se abren mapeados en memoria, sin cargar la grilla.
+    """
+    inicio = time.perf_counter()
+    registro = {
+        'archivo': ruta,
+        'resuelto': False,
+        'pasos': None,
+        'energia_final': None,
+        'nodos_expandidos': 0,
+        'segundos': 0.0,
+        'completa': False,
+        'optima': False,
+        'desde_cache': False,
+        'error': None,
+    }
+    try:
+        if ruta.endswith(EXTENSION_MAPA):
+            universo = Universo(archivo_mapa=ruta)
+        else:
+            universo = Universo(ruta)
+        if directorio_cache is not None:
+            universo.cache = _cache_de(directorio_cache)
+        soluciones = universo.resolver(metodo, max_segundos=max_segundos, max_nodos=max_nodos)
+        estado = universo.estado_resolucion
+        registro['nodos_expandidos'] = estado.nodos_expandidos
+        registro['completa'] = estado.completa
+        registro['optima'] = estado.optima
+        registro['desde_cache'] = estado.desde_cache
+        if soluciones and soluciones[0].get('completa', True):
+            registro['resuelto'] = True
+            registro['pasos'] = len(soluciones[0]['camino']) - 1
+            registro['energia_final'] = soluciones[0]['energia'][-1]
+    except Exception as e:
+        registro['error'] = f"{type(e).__name__}: {e}"
+    registro['segundos'] = round(time.perf_counter() - inicio, 6)
+    return registro
+
+
+def _resolver_con_opciones(argumentos: tuple) -> dict:
+    return resolver_archivo(*argumentos)
+
+
+def resolver_lote(rutas: List[str], salida: TextIO, metodo: str = "astar",
+                  trabajadores: Optional[int] = None, max_segundos: Optional[float] = None,
+                  max_nodos: Optional[int] = None, directorio_cache: Optional[str] = None) -> dict:
+    """
+    Resuelve las rutas con un pool de 'trabajadores' procesos (por defecto os.cpu_count())
+    y escribe en 'salida' un registro JSONL por archivo, en el orden de las rutas.
+    Devuelve un resumen con totales de archivos, resueltos y errores.
+    """
+    if metodo not in METODOS_LOTE:
+        raise ValueError(f"Método no disponible en lote: {metodo}")
+    trabajadores = trabajadores or os.cpu_count() or 1
+    tareas = [(ruta, metodo, max_segundos, max_nodos, directorio_cache) for ruta in rutas]
+    resumen = {'archivos': 0, 'resueltos': 0, 'errores': 0}
+
+    def emitir(registro: dict):
+        salida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+        salida.flush()
+        resumen['archivos'] += 1
+        resumen['resueltos'] += registro['resuelto']
+        resumen['errores'] += registro['error'] is not None
+
+    if trabajadores == 1 or len(tareas) <= 1:
+        for tarea in tareas:
+            emitir(_resolver_con_opciones(tarea))
+    else:
+        # Lotes de tareas por envío para no pagar la comunicación archivo por archivo
+        tamano_lote = max(1, min(32, len(tareas) // (trabajadores * 4)))
+        with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+            for registro in ejecutor.map(_resolver_con_opciones, tareas, chunksize=tamano_lote):
+                emitir(registro)
+    return resumen
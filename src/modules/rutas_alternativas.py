@@ -0,0 +1,261 @@
+"""
+Módulo de rutas alternativas (las k más cortas, opcionalmente diversas)
+
+Algoritmo de Yen sobre el mismo espacio de estados que motor_busqueda: cada
+ruta examinada se desvía en cada una de sus paradas (celdas donde la nave queda
+tras un movimiento completo, sin contar la entrada de un agujero de gusano).
+El desvío es un A* desde el estado de esa parada que:
+    - no puede repetir el siguiente movimiento de las rutas ya examinadas que
+      comparten la misma raíz
+    - no puede volver a una celda de la raíz con los mismos elementos usados
+      (estrellas, agujeros negros, gusanos y recargas)
+
+Una ruta nunca repite celda sin que algo haya cambiado: con costos no negativos
+esa vuelta solo gasta energía. Por eso la dominancia por (pasos, energía) de
+motor_busqueda sigue siendo exacta dentro de cada desvío.
+
+Se reutiliza lo ya calculado:
+    - cada ruta guarda el estado completo de sus paradas, así el desvío arranca
+      sin reproducir la raíz
+    - regla de Lawler: una ruta solo se desvía desde la parada donde ella misma
+      se separó de su madre; los desvíos anteriores ya se buscaron
+    - todos los desvíos comparten la heurística (por ejemplo, el mapa de costo
+      restante de ConsultasRutas)
+
+Con similitud_maxima, una ruta se acepta solo si su similitud de Jaccard (celdas
+compartidas sobre celdas totales) con cada ruta aceptada no la supera; las
+rechazadas igual se desvían, porque de ellas salen rutas que sí pueden diferir.
+"""
+
+import heapq
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from modules.motor_busqueda import MOVIMIENTOS, ProblemaUniverso
+from modules.presupuesto import Presupuesto
+from modules.solucion_compacta import SolucionCompacta
+from modules.estadisticas import EstadisticasBusqueda, PODA_DOMINANCIA, PODA_SIN_ENERGIA
+
+# Estado completo de una parada: (posición, energía, estrellas, m_est, m_neg, m_gus, m_rec)
+Estado = Tuple[Tuple[int, int], int, int, int, int, int, int]
+
+
+class _Ruta:
+    __slots__ = ('camino', 'energia', 'estrellas', 'paradas', 'desvio')
+
+    def __init__(self, camino: List[Tuple[int, int]], energia: List[int], estrellas: List[int],
+                 paradas: List[Tuple[int, Estado]], desvio: int):
+        self.camino = camino
+        self.energia = energia
+        self.estrellas = estrellas
+        self.paradas = paradas  # (índice en el camino, estado) de cada parada
+        self.desvio = desvio    # primera parada desde la que se desvía
+
+    def solucion(self) -> SolucionCompacta:
+        return SolucionCompacta.desde_listas(self.camino, self.energia, self.estrellas)
+
+
+def similitud_rutas(camino_a: Sequence[Tuple[int, int]], camino_b: Sequence[Tuple[int, int]]) -> float:
+    """Similitud de Jaccard entre las celdas de dos caminos (1.0 = mismas celdas)"""
+    a, b = set(map(tuple, camino_a)), set(map(tuple, camino_b))
+    return len(a & b) / len(a | b)
+
+
+def _clave(estado: Estado) -> tuple:
+    """Celda y elementos usados, sin la energía"""
+    return (estado[0],) + estado[3:]
+
+
+def _desviar(problema: ProblemaUniverso, inicio: Estado, prohibidas: Set[Tuple[int, int]],
+             raiz: FrozenSet[tuple], heuristica: Callable[[Tuple[int, int]], int],
+             presupuesto: Presupuesto, estadisticas: Optional[EstadisticasBusqueda],
+             max_pasos: Optional[int] = None) -> Optional[list]:
+    """
+    A* desde 'inicio' hasta el destino sin entrar primero a una celda prohibida ni volver
+    a una clave (celda y elementos usados) de la raíz. Con max_pasos no sigue caminos que
+    no puedan llegar en esa cantidad de pasos. Devuelve los nodos (posición, energía, estrellas, estado o None
+    si es la entrada de un gusano) posteriores a 'inicio', o None si no hay desvío.
+    """
+    destino = problema.destino
+    # Nodos del árbol: (padre, posición, energía, estrellas, estado de parada o None)
+    nodos = [(-1,) + inicio[:3] + (inicio,)]
+    etiquetas: Dict[tuple, List[Tuple[int, int, int]]] = {}
+    descartados = set()
+    abiertos = []
+
+    def insertar(id_nodo, estado: Estado, pasos: int):
+        posicion, energia = estado[:2]
+        estimado = pasos + heuristica(posicion)
+        if max_pasos is not None and estimado > max_pasos:
+            return
+        clave = _clave(estado)
+        lista = etiquetas.setdefault(clave, [])
+        for pasos_e, energia_e, _ in lista:
+            if pasos_e <= pasos and energia_e >= energia:
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_DOMINANCIA)
+                return
+        vigentes = []
+        for etiqueta in lista:
+            if pasos <= etiqueta[0] and energia >= etiqueta[1]:
+                descartados.add(etiqueta[2])
+            else:
+                vigentes.append(etiqueta)
+        vigentes.append((pasos, energia, id_nodo))
+        etiquetas[clave] = vigentes
+        # A igual estimación se profundiza primero: entre caminos igual de cortos no recorre la meseta
+        heapq.heappush(abiertos, (estimado, -pasos, -energia, id_nodo))
+
+    insertar(0, inicio, 0)
+    while abiertos:
+        _, pasos, _, id_nodo = heapq.heappop(abiertos)
+        pasos = -pasos
+        if id_nodo in descartados:
+            continue
+        estado = nodos[id_nodo][4]
+        posicion, energia, estrellas, m_est, m_neg, m_gus, m_rec = estado
+        if posicion == destino:
+            tramo = []
+            while id_nodo > 0:
+                tramo.append(nodos[id_nodo][1:])
+                id_nodo = nodos[id_nodo][0]
+            tramo.reverse()
+            return tramo
+        if presupuesto.consumir():
+            return None
+        if estadisticas is not None:
+            estadisticas.expandir(pasos)
+
+        for df, dc in MOVIMIENTOS:
+            fila, columna = posicion[0] + df, posicion[1] + dc
+            siguiente = (fila, columna)
+            if not problema.es_valida(fila, columna) or (id_nodo == 0 and siguiente in prohibidas):
+                continue
+            efecto = problema.entrar(siguiente, energia, estrellas, m_est, m_neg, m_rec)
+            if efecto is None:
+                if estadisticas is not None:
+                    estadisticas.podar(problema.motivo_rechazo(siguiente, m_neg))
+                continue
+            n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+            n_gus = m_gus
+            n_pasos = pasos + 1
+            padre = id_nodo
+
+            # Salto obligatorio por agujero de gusano: la entrada queda como nodo intermedio
+            gusano = problema.gusanos.get(siguiente)
+            if gusano is not None and not (m_gus >> gusano[0]) & 1:
+                bit, salida = gusano
+                efecto = problema.entrar(salida, n_energia, n_estrellas, n_est, n_neg, n_rec)
+                if efecto is None:
+                    if estadisticas is not None:
+                        estadisticas.podar(problema.motivo_rechazo(salida, n_neg))
+                    continue
+                nodos.append((padre, siguiente, n_energia, n_estrellas, None))
+                padre = len(nodos) - 1
+                n_energia, n_estrellas, n_est, n_neg, n_rec = efecto
+                n_gus |= 1 << bit
+                n_pasos += 1
+                if estadisticas is not None:
+                    estadisticas.usar_gusano()
+                siguiente = salida
+
+            if n_energia <= 0 and siguiente != destino:
+                if estadisticas is not None:
+                    estadisticas.podar(PODA_SIN_ENERGIA)
+                continue
+            if (siguiente, n_est, n_neg, n_gus, n_rec) in raiz:
+                continue
+            n_estado = (siguiente, n_energia, n_estrellas, n_est, n_neg, n_gus, n_rec)
+            nodos.append((padre, siguiente, n_energia, n_estrellas, n_estado))
+            insertar(len(nodos) - 1, n_estado, n_pasos)
+
+    return None
+
+
+def _extender(ruta: _Ruta, parada: int, tramo: list) -> _Ruta:
+    """Raíz de 'ruta' hasta la parada indicada seguida del tramo de desvío"""
+    indice = ruta.paradas[parada][0]
+    camino = ruta.camino[:indice + 1]
+    energia = ruta.energia[:indice + 1]
+    estrellas = ruta.estrellas[:indice + 1]
+    paradas = ruta.paradas[:parada + 1]
+    for posicion, e, s, estado in tramo:
+        camino.append(posicion)
+        energia.append(e)
+        estrellas.append(s)
+        if estado is not None:
+            paradas.append((len(camino) - 1, estado))
+    return _Ruta(camino, energia, estrellas, paradas, parada)
+
+
+def buscar_k_rutas(problema: ProblemaUniverso, k: int, similitud_maxima: Optional[float] = None,
+                   max_examinadas: Optional[int] = None,
+                   heuristica: Optional[Callable[[Tuple[int, int]], int]] = None,
+                   presupuesto: Optional[Presupuesto] = None,
+                   estadisticas: Optional[EstadisticasBusqueda] = None) -> Tuple[List[SolucionCompacta], bool]:
+    """
+    Hasta k rutas distintas de menos pasos (a igual cantidad, más energía final primero).
+    Con similitud_maxima solo se aceptan rutas que no se parezcan más que eso a otra aceptada;
+    max_examinadas limita cuántas rutas candidatas se examinan en total.
+    Devuelve (rutas, completa): completa es False si se cortó por presupuesto o por max_examinadas.
+    """
+    if k <= 0:
+        raise ValueError("k debe ser positivo")
+    if similitud_maxima is not None and not 0 <= similitud_maxima <= 1:
+        raise ValueError("La similitud máxima debe estar entre 0 y 1")
+    heuristica = heuristica or problema.heuristica
+    presupuesto = presupuesto or Presupuesto()
+    destino = problema.destino
+
+    inicio = (problema.origen, problema.carga_inicial, 0, 0, 0, 0, 0)
+    inicial = _Ruta([problema.origen], [problema.carga_inicial], [0], [(0, inicio)], 0)
+    if problema.origen == destino:
+        return [inicial.solucion()], True
+    if problema.carga_inicial <= 0:
+        return [], True
+
+    candidatas = []  # heap de (pasos, -energía final, orden, ruta)
+    vistas = set()
+
+    def proponer(ruta: _Ruta):
+        clave = tuple(ruta.camino)
+        if clave not in vistas:
+            vistas.add(clave)
+            heapq.heappush(candidatas, (len(ruta.camino) - 1, -ruta.energia[-1], len(vistas), ruta))
+
+    tramo = _desviar(problema, inicio, set(), frozenset(), heuristica, presupuesto, estadisticas)
+    if tramo is not None:
+        proponer(_extender(inicial, 0, tramo))
+
+    examinadas: List[_Ruta] = []
+    aceptadas: List[_Ruta] = []
+    while candidatas and len(aceptadas) < k and not presupuesto.agotado:
+        if max_examinadas is not None and len(examinadas) >= max_examinadas:
+            break
+        ruta = heapq.heappop(candidatas)[3]
+        examinadas.append(ruta)
+        if similitud_maxima is None or all(similitud_rutas(ruta.camino, otra.camino) <= similitud_maxima
+                                           for otra in aceptadas):
+            aceptadas.append(ruta)
+            if len(aceptadas) == k:
+                break
+
+        # Sin umbral de similitud, un desvío más largo que la candidata que todavía entraría es inútil
+        cota = None
+        faltan = k - len(aceptadas)
+        if similitud_maxima is None and len(candidatas) >= faltan:
+            cota = heapq.nsmallest(faltan, candidatas)[-1][0]
+        for parada in range(ruta.desvio, len(ruta.paradas) - 1):
+            indice, estado = ruta.paradas[parada]
+            raiz = ruta.camino[:indice + 1]
+            prohibidas = {otra.camino[indice + 1] for otra in examinadas
+                          if len(otra.camino) > indice + 1 and otra.camino[:indice + 1] == raiz}
+            claves_raiz = frozenset(_clave(e) for _, e in ruta.paradas[:parada + 1])
+            tramo = _desviar(problema, estado, prohibidas, claves_raiz, heuristica, presupuesto, estadisticas,
+                             None if cota is None else cota - indice)
+            if presupuesto.agotado:
+                break
+            if tramo is not None:
+                proponer(_extender(ruta, parada, tramo))
+
+    completa = not presupuesto.agotado and (len(aceptadas) == k or not candidatas)
+    return [ruta.solucion() for ruta in aceptadas], completa
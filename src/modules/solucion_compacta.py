@@ -0,0 +1,212 @@
+"""
+Módulo de almacenamiento compacto de soluciones
+
+Una solución guarda la celda inicial y un código de un byte por paso:
+    0..3  movimiento a una celda vecina (mismo orden que MOVIMIENTOS)
+    4     salto a una celda no vecina (agujero de gusano); el destino se lee,
+          en orden, del arreglo de saltos
+Los historiales de energía y estrellas se guardan en arreglos tipados. Si la
+energía no entra en 64 bits (muchas recargas encadenadas) queda como lista.
+
+SolucionCompacta se comporta como un diccionario de solo lectura con las claves
+'camino', 'energia' y 'estrellas' (más 'completa' si es parcial), de modo que el
+código que leía los diccionarios anteriores sigue funcionando.
+"""
+
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Iterable, List, Sequence, Tuple, Union
+
+CODIGO_SALTO = 4
+_CODIGOS = {(0, 1): 0, (1, 0): 1, (0, -1): 2, (-1, 0): 3}
+_DESPLAZAMIENTOS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+_MAGICO = b'SOLC'
+_MAGICO_LISTA = b'SOLS'
+_VERSION = 1
+# magico, versión, banderas, fila y columna iniciales, pasos, saltos, largo de la energía
+_CABECERA = struct.Struct('<4sBBiiIII')
+_BANDERA_PARCIAL = 1
+_BANDERA_ENERGIA_TEXTO = 2
+
+
+def _a_little_endian(arreglo: array) -> bytes:
+    if sys.byteorder == 'big':
+        arreglo = array(arreglo.typecode, arreglo)
+        arreglo.byteswap()
+    return arreglo.tobytes()
+
+
+def _desde_little_endian(tipo: str, datos: bytes) -> array:
+    arreglo = array(tipo)
+    arreglo.frombytes(datos)
+    if sys.byteorder == 'big':
+        arreglo.byteswap()
+    return arreglo
+
+
+class SolucionCompacta(Mapping):
+    """Camino codificado por movimientos e historiales en arreglos tipados"""
+    __slots__ = ('inicio', 'movimientos', 'saltos', 'energia', 'estrellas', 'completa')
+
+    def __init__(self, inicio: Tuple[int, int], movimientos: array, saltos: array,
+                 energia: Union[array, List[int]], estrellas: array, completa: bool = True):
+        self.inicio = inicio
+        self.movimientos = movimientos
+        self.saltos = saltos
+        self.energia = energia
+        self.estrellas = estrellas
+        self.completa = completa
+
+    @classmethod
+    def desde_listas(cls, camino: Sequence[Tuple[int, int]], energia: Iterable[int],
+                     estrellas: Iterable[int], completa: bool = True) -> "SolucionCompacta":
+        movimientos = array('b')
+        saltos = array('i')
+        fila, columna = camino[0]
+        for siguiente in camino[1:]:
+            codigo = _CODIGOS.get((siguiente[0] - fila, siguiente[1] - columna))
+            if codigo is None:
+                movimientos.append(CODIGO_SALTO)
+                saltos.extend(siguiente)
+            else:
+                movimientos.append(codigo)
+            fila, columna = siguiente
+        try:
+            historial_energia = array('q', energia)
+        except OverflowError:
+            historial_energia = list(energia)
+        return cls(tuple(camino[0]), movimientos, saltos, historial_energia,
+                   array('i', estrellas), completa)
+
+    @classmethod
+    def desde_dict(cls, solucion: Mapping) -> "SolucionCompacta":
+        return cls.desde_listas(solucion['camino'], solucion['energia'], solucion['estrellas'],
+                                solucion.get('completa', True))
+
+    @property
+    def camino(self) -> List[Tuple[int, int]]:
+        """Decodifica el camino completo"""
+        fila, columna = self.inicio
+        camino = [(fila, columna)]
+        saltos = self.saltos
+        j = 0
+        for codigo in self.movimientos:
+            if codigo == CODIGO_SALTO:
+                fila, columna = saltos[j], saltos[j + 1]
+                j += 2
+            else:
+                df, dc = _DESPLAZAMIENTOS[codigo]
+                fila += df
+                columna += dc
+            camino.append((fila, columna))
+        return camino
+
+    @property
+    def pasos(self) -> int:
+        return len(self.movimientos)
+
+    # --- Interfaz de diccionario de solo lectura ---
+
+    def __getitem__(self, clave: str):
+        if clave == 'camino':
+            return self.camino
+        if clave == 'energia':
+            return self.energia
+        if clave == 'estrellas':
+            return self.estrellas
+        if clave == 'completa' and not self.completa:
+            return False
+        raise KeyError(clave)
+
+    def __iter__(self):
+        yield 'camino'
+        yield 'energia'
+        yield 'estrellas'
+        if not self.completa:
+            yield 'completa'
+
+    def __len__(self) -> int:
+        return 3 if self.completa else 4
+
+    def como_dict(self) -> dict:
+        """Copia con listas comunes (el formato anterior)"""
+        solucion = {'camino': self.camino, 'energia': list(self.energia), 'estrellas': list(self.estrellas)}
+        if not self.completa:
+            solucion['completa'] = False
+        return solucion
+
+    def __repr__(self) -> str:
+        return (f"SolucionCompacta(inicio={self.inicio}, pasos={self.pasos}, "
+                f"energia_final={self.energia[-1]}, completa={self.completa})")
+
+    # --- Serialización binaria ---
+
+    def a_bytes(self) -> bytes:
+        banderas = 0 if self.completa else _BANDERA_PARCIAL
+        if isinstance(self.energia, array):
+            energia = _a_little_endian(self.energia)
+        else:
+            banderas |= _BANDERA_ENERGIA_TEXTO
+            energia = ",".join(map(str, self.energia)).encode('ascii')
+        cabecera = _CABECERA.pack(_MAGICO, _VERSION, banderas, self.inicio[0], self.inicio[1],
+                                  len(self.movimientos), len(self.saltos), len(energia))
+        return b''.join((cabecera, self.movimientos.tobytes(), _a_little_endian(self.saltos),
+                         energia, _a_little_endian(self.estrellas)))
+
+    @classmethod
+    def desde_bytes(cls, datos: bytes) -> "SolucionCompacta":
+        if len(datos) < _CABECERA.size:
+            raise ValueError("Datos de solución incompletos")
+        magico, version, banderas, fila, columna, pasos, n_saltos, largo_energia = _CABECERA.unpack_from(datos)
+        if magico != _MAGICO or version != _VERSION:
+            raise ValueError("Formato de solución desconocido")
+        posicion = _CABECERA.size
+        movimientos = array('b')
+        movimientos.frombytes(datos[posicion:posicion + pasos])
+        posicion += pasos
+        tamano_saltos = n_saltos * array('i').itemsize
+        saltos = _desde_little_endian('i', datos[posicion:posicion + tamano_saltos])
+        posicion += tamano_saltos
+        bloque_energia = datos[posicion:posicion + largo_energia]
+        posicion += largo_energia
+        if banderas & _BANDERA_ENERGIA_TEXTO:
+            energia = [int(valor) for valor in bloque_energia.decode('ascii').split(",")]
+        else:
+            energia = _desde_little_endian('q', bloque_energia)
+        tamano_estrellas = (pasos + 1) * array('i').itemsize
+        estrellas = _desde_little_endian('i', datos[posicion:posicion + tamano_estrellas])
+        if len(movimientos) != pasos or len(estrellas) != pasos + 1 or len(energia) != pasos + 1:
+            raise ValueError("Datos de solución incompletos")
+        return cls((fila, columna), movimientos, saltos, energia, estrellas,
+                   completa=not banderas & _BANDERA_PARCIAL)
+
+
+def serializar_soluciones(soluciones: Iterable[Mapping]) -> bytes:
+    """Empaqueta una lista de soluciones (compactas o diccionarios) en un solo bloque binario"""
+    bloques = [(sol if isinstance(sol, SolucionCompacta) else SolucionCompacta.desde_dict(sol)).a_bytes()
+               for sol in soluciones]
+    partes = [_MAGICO_LISTA, struct.pack('<I', len(bloques))]
+    for bloque in bloques:
+        partes.append(struct.pack('<I', len(bloque)))
+        partes.append(bloque)
+    return b''.join(partes)
+
+
+def deserializar_soluciones(datos: bytes) -> List[SolucionCompacta]:
+    if datos[:4] != _MAGICO_LISTA:
+        raise ValueError("Formato de lista de soluciones desconocido")
+    try:
+        (cantidad,) = struct.unpack_from('<I', datos, 4)
+        posicion = 8
+        soluciones = []
+        for _ in range(cantidad):
+            (largo,) = struct.unpack_from('<I', datos, posicion)
+            posicion += 4
+            soluciones.append(SolucionCompacta.desde_bytes(datos[posicion:posicion + largo]))
+            posicion += largo
+    except struct.error:
+        raise ValueError("Datos de lista de soluciones incompletos") from None
+    return soluciones
@@ -0,0 +1,105 @@
+"""
+Módulo de tabla de transposición para la búsqueda en el universo
+
+El backtracking no repite celdas, así que lo que puede hacer desde un estado
+depende de la posición y del conjunto de celdas visitadas; ese conjunto también
+determina las estrellas recolectadas, los agujeros negros destruidos, los
+gusanos usados y las recargas aprovechadas. Las visitadas se guardan como un
+bitboard (un entero con un bit por celda, ver modules.bitboard).
+
+Una llegada B a una celda está dominada por una llegada anterior A a la misma
+celda si A visitó un subconjunto de las celdas de B y tiene al menos su energía
+y sus estrellas: cualquier continuación de B pisa solo celdas que ninguna de las
+dos visitó, que están igual para ambas, así que A también puede seguirla. La
+excepción son las salidas de agujeros de gusano, a las que un salto puede llegar
+aunque ya estén visitadas: en esas celdas ('exactas') A y B deben coincidir.
+Podar B conserva la existencia de solución pero no cada camino distinto.
+
+Por celda se guardan hasta 'por_celda' llegadas (se reemplaza la más vieja) y en
+total hasta 'capacidad', con desalojo LRU por celda.
+
+Límite: solo poda cuando dos caminos a la misma celda pisaron conjuntos de
+celdas anidados (p. ej. un desvío que contiene a otro). Enumerar todas las
+soluciones sigue siendo exponencial: con la tabla, la de 5x5 expande de 2.5 a 4
+veces menos nodos y la de 6x6 termina en menos de un minuto, pero desde 8x8 ya
+no. Si la primera solución aparece enseguida, la tabla casi no se consulta.
+"""
+
+from collections import OrderedDict
+from typing import List, Tuple
+
+# Llegada guardada: (bitboard de visitadas, energía, estrellas)
+Llegada = Tuple[int, int, int]
+
+
+class TablaTransposicion:
+    """Llegadas por celda con poda por dominancia, capacidad máxima y desalojo LRU"""
+
+    def __init__(self, capacidad: int = 1_000_000, por_celda: int = 8, exactas: int = 0):
+        if capacidad <= 0:
+            raise ValueError("La capacidad de la tabla debe ser positiva")
+        if por_celda <= 0:
+            raise ValueError("Las llegadas por celda deben ser positivas")
+        self.capacidad = capacidad
+        self.por_celda = por_celda
+        self.exactas = exactas
+        self._entradas: "OrderedDict[int, List[Llegada]]" = OrderedDict()
+        self._total = 0
+        self.aciertos = 0
+        self.podas = 0
+        self.desalojos = 0
+
+    def dominado(self, indice_celda: int, visitadas: int, energia: int, estrellas: int) -> bool:
+        """
+        Consulta y actualiza la tabla. Devuelve True si una llegada anterior a la celda
+        domina a esta (la rama debe podarse); si no, la guarda.
+        """
+        llegadas = self._entradas.get(indice_celda)
+        exactas = self.exactas
+        if llegadas is None:
+            llegadas = self._entradas[indice_celda] = []
+        else:
+            self._entradas.move_to_end(indice_celda)
+            self.aciertos += 1
+            vigentes = []
+            for llegada in llegadas:
+                otras, energia_otra, estrellas_otra = llegada
+                if (energia <= energia_otra and estrellas <= estrellas_otra and not otras & ~visitadas
+                        and not (otras ^ visitadas) & exactas):
+                    self.podas += 1
+                    return True
+                # La nueva reemplaza a las que domina
+                if not (energia >= energia_otra and estrellas >= estrellas_otra and not visitadas & ~otras
+                        and not (otras ^ visitadas) & exactas):
+                    vigentes.append(llegada)
+            self._total -= len(llegadas) - len(vigentes)
+            llegadas[:] = vigentes
+            if len(llegadas) >= self.por_celda:
+                llegadas.pop(0)
+                self._total -= 1
+        llegadas.append((visitadas, energia, estrellas))
+        self._total += 1
+        while self._total > self.capacidad:
+            _, desalojadas = self._entradas.popitem(last=False)
+            self._total -= len(desalojadas)
+            self.desalojos += len(desalojadas)
+        return False
+
+    def limpiar(self):
+        self._entradas.clear()
+        self._total = 0
+        self.aciertos = 0
+        self.podas = 0
+        self.desalojos = 0
+
+    def __len__(self) -> int:
+        return self._total
+
+    def estadisticas(self) -> dict:
+        return {
+            'entradas': self._total,
+            'capacidad': self.capacidad,
+            'aciertos': self.aciertos,
+            'podas': self.podas,
+            'desalojos': self.desalojos,
+        }
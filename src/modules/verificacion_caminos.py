@@ -0,0 +1,218 @@
+"""
+Módulo de verificación de caminos por lotes (NumPy)
+
+Comprueba muchos caminos candidatos a la vez contra las reglas de movimiento
+(las mismas de motor_busqueda.ProblemaUniverso), sin mover la nave ni tocar el
+universo. Los caminos se rellenan en un arreglo de caminos x pasos y se avanza
+paso a paso sobre todos los caminos todavía válidos con operaciones vectorizadas.
+
+Cada camino parte del universo en su estado inicial (agujeros negros, estrellas
+y agujeros de gusano originales) y debe:
+    - empezar en el origen y terminar en el destino
+    - moverse a una celda vecina, salvo el salto obligatorio de un agujero de
+      gusano sin usar, que debe ser el paso siguiente a su entrada
+    - tener una estrella para cada agujero negro activo (la estrella se gasta)
+    - tener al menos la carga requerida antes de entrar a una celda
+    - mantener la energía positiva fuera del destino (las zonas de recarga no
+      cobran costo y multiplican la energía una sola vez)
+
+Las celdas descartadas por el análisis de factibilidad no se consideran: son
+una poda de la búsqueda, no una regla del universo.
+"""
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from modules.estadisticas import PODA_AGUJERO_NEGRO, PODA_CARGA_REQUERIDA, PODA_SIN_ENERGIA
+from modules.matriz_compacta import ZONA_RECARGA
+
+MOTIVO_CAMINO_VACIO = "camino_vacio"
+MOTIVO_ORIGEN = "origen_incorrecto"
+MOTIVO_FUERA_DE_GRILLA = "fuera_de_grilla"
+MOTIVO_NO_ADYACENTE = "no_adyacente"
+MOTIVO_SALTO_GUSANO = "salto_de_gusano"
+MOTIVO_DESTINO_NO_ALCANZADO = "destino_no_alcanzado"
+
+# Códigos internos de los motivos (0 = sin error)
+_MOTIVOS = (None, MOTIVO_CAMINO_VACIO, MOTIVO_ORIGEN, MOTIVO_FUERA_DE_GRILLA, MOTIVO_NO_ADYACENTE,
+            MOTIVO_SALTO_GUSANO, PODA_AGUJERO_NEGRO, PODA_CARGA_REQUERIDA, PODA_SIN_ENERGIA,
+            MOTIVO_DESTINO_NO_ALCANZADO)
+_CODIGOS = {motivo: codigo for codigo, motivo in enumerate(_MOTIVOS)}
+
+
+class VerificacionCaminos:
+    """
+    Resultado de verificar un lote de caminos (un elemento por camino):
+        - validos:       True si el camino cumple todas las reglas
+        - primer_error:  índice del primer paso inválido (-1 si es válido)
+        - motivos:       motivo del primer error (MOTIVO_* o PODA_*) o None
+        - energia_final: energía al terminar el camino o en el paso que falló
+    """
+
+    def __init__(self, validos: np.ndarray, primer_error: np.ndarray, codigos: np.ndarray,
+                 energia_final: np.ndarray):
+        self.validos = validos
+        self.primer_error = primer_error
+        self.motivos: List[Optional[str]] = [_MOTIVOS[codigo] for codigo in codigos.tolist()]
+        self.energia_final = energia_final
+
+    def __len__(self) -> int:
+        return len(self.validos)
+
+    def __repr__(self) -> str:
+        return f"VerificacionCaminos(caminos={len(self)}, validos={int(self.validos.sum())})"
+
+
+class _Buscador:
+    """Índice plano de celda -> dato del elemento que la ocupa, para arreglos de índices"""
+
+    def __init__(self, indices: Sequence[int], valores: Sequence[int]):
+        indices = np.asarray(indices, dtype=np.int64)
+        orden = np.argsort(indices, kind='stable')
+        self._claves = indices[orden]
+        self._valores = np.asarray(valores, dtype=np.int64)[orden]
+
+    def __call__(self, indices: np.ndarray, defecto: int = -1) -> np.ndarray:
+        if not len(self._claves):
+            return np.full(len(indices), defecto, dtype=np.int64)
+        posiciones = np.minimum(np.searchsorted(self._claves, indices), len(self._claves) - 1)
+        encontrados = self._claves[posiciones] == indices
+        return np.where(encontrados, self._valores[posiciones], defecto)
+
+
+def _planos(coordenadas, columnas: int) -> List[int]:
+    return [fila * columnas + columna for fila, columna in coordenadas]
+
+
+def _rellenar(caminos) -> tuple:
+    """Filas, columnas (caminos x pasos, rellenos con -1) y largo de cada camino"""
+    largos = np.array([len(camino) for camino in caminos], dtype=np.int64)
+    pasos = int(largos.max(initial=0))
+    filas = np.full((len(caminos), max(pasos, 1)), -1, dtype=np.int64)
+    columnas = filas.copy()
+    for i, camino in enumerate(caminos):
+        if len(camino):
+            coordenadas = np.asarray(camino, dtype=np.int64).reshape(-1, 2)
+            filas[i, :len(coordenadas)] = coordenadas[:, 0]
+            columnas[i, :len(coordenadas)] = coordenadas[:, 1]
+    return filas, columnas, largos
+
+
+def verificar_caminos(universo, caminos: Sequence) -> VerificacionCaminos:
+    """
+    Verifica cada camino (secuencia o arreglo de pares fila, columna, p. ej. soluciones['camino'])
+    partiendo del estado inicial del universo, sin modificarlo
+    """
+    filas, columnas, largos = _rellenar(caminos)
+    cantidad, pasos = filas.shape
+    ancho = universo.columnas
+    dentro = (filas >= 0) & (filas < universo.filas) & (columnas >= 0) & (columnas < ancho)
+    indices = np.where(dentro, filas * ancho + columnas, -1)
+    origen = universo.origen[0] * ancho + universo.origen[1]
+    destino = universo.destino[0] * ancho + universo.destino[1]
+
+    # Elementos especiales: cada uno con su número de bit dentro de las máscaras por camino
+    celdas = universo.celdas
+    estrellas_originales = _planos(universo.estrellas_gigantes_originales, ancho)
+    negros_originales = _planos(universo.agujeros_negros_originales, ancho)
+    recargas = _planos(celdas.coordenadas_con(ZONA_RECARGA), ancho)
+    gusanos = list(universo.gusanos_por_entrada.items())
+    id_estrella = _Buscador(estrellas_originales, range(len(estrellas_originales)))
+    id_negro = _Buscador(negros_originales, range(len(negros_originales)))
+    id_recarga = _Buscador(recargas, range(len(recargas)))
+    id_gusano = _Buscador(_planos((entrada for entrada, _ in gusanos), ancho), range(len(gusanos)))
+    carga_requerida = _Buscador(_planos(universo.cargas_requeridas, ancho),
+                                list(universo.cargas_requeridas.values()))
+    factores = np.array([celdas.vista_factor_recarga[i] for i in recargas] or [1], dtype=np.int64)
+    salidas = np.array(_planos((ag.salida for _, ag in gusanos), ancho) or [-1], dtype=np.int64)
+
+    # Costos de todas las celdas pisadas, en una sola lectura (no cobran las zonas de recarga)
+    costos = np.zeros(indices.shape, dtype=np.int64)
+    costos[dentro] = celdas.costos_en(indices[dentro])
+    costos[id_recarga(indices.ravel()).reshape(indices.shape) >= 0] = 0
+
+    # Con energías que podrían desbordar int64 se usan enteros de Python
+    cota = abs(universo.carga_inicial) + int(np.abs(costos).sum(axis=1).max(initial=0))
+    for factor in factores.tolist():
+        cota *= max(abs(factor), 1)
+    tipo_energia = np.int64 if cota < 2 ** 62 else object
+
+    energia = np.full(cantidad, universo.carga_inicial, dtype=tipo_energia)
+    estrellas = np.zeros(cantidad, dtype=np.int64)
+    estrellas_tomadas = np.zeros((cantidad, max(len(estrellas_originales), 1)), dtype=bool)
+    negros_usados = np.zeros((cantidad, max(len(negros_originales), 1)), dtype=bool)
+    recargas_usadas = np.zeros((cantidad, len(factores)), dtype=bool)
+    gusanos_usados = np.zeros((cantidad, len(salidas)), dtype=bool)
+    salto_pendiente = np.full(cantidad, -1, dtype=np.int64)
+    codigos = np.zeros(cantidad, dtype=np.int8)
+    primer_error = np.full(cantidad, -1, dtype=np.int64)
+
+    def fallar(caminos_fallidos: np.ndarray, motivo: str, paso):
+        codigos[caminos_fallidos] = _CODIGOS[motivo]
+        primer_error[caminos_fallidos] = paso
+
+    fallar(np.flatnonzero(largos == 0), MOTIVO_CAMINO_VACIO, 0)
+    fallar(np.flatnonzero((largos > 0) & (indices[:, 0] != origen)), MOTIVO_ORIGEN, 0)
+    if origen != destino and universo.carga_inicial <= 0:
+        fallar(np.flatnonzero(codigos == 0), PODA_SIN_ENERGIA, 0)
+
+    for paso in range(1, pasos):
+        activos = np.flatnonzero((codigos == 0) & (largos > paso))
+        if not len(activos):
+            break
+        actual = indices[activos, paso]
+        pendiente = salto_pendiente[activos]
+        saltando = pendiente >= 0
+        distancia = (np.abs(filas[activos, paso] - filas[activos, paso - 1])
+                     + np.abs(columnas[activos, paso] - columnas[activos, paso - 1]))
+        motivo = np.select(
+            [actual < 0, saltando & (actual != pendiente), ~saltando & (distancia != 1)],
+            [_CODIGOS[MOTIVO_FUERA_DE_GRILLA], _CODIGOS[MOTIVO_SALTO_GUSANO], _CODIGOS[MOTIVO_NO_ADYACENTE]], 0)
+        validos = motivo == 0
+        codigos[activos[~validos]] = motivo[~validos]
+        primer_error[activos[~validos]] = paso
+        activos, actual, saltando = activos[validos], actual[validos], saltando[validos]
+
+        # Reglas de entrada: agujero negro activo sin estrellas y carga requerida
+        negro = id_negro(actual)
+        negro_activo = (negro >= 0) & ~negros_usados[activos, np.maximum(negro, 0)]
+        sin_estrella = negro_activo & (estrellas[activos] == 0)
+        sin_carga = ~sin_estrella & (carga_requerida(actual, 0) > energia[activos])
+        fallar(activos[sin_estrella], PODA_AGUJERO_NEGRO, paso)
+        fallar(activos[sin_carga], PODA_CARGA_REQUERIDA, paso)
+        entran = ~(sin_estrella | sin_carga)
+        activos, actual, saltando, negro_activo = (activos[entran], actual[entran], saltando[entran],
+                                                   negro_activo[entran])
+        negro = id_negro(actual)
+
+        # Efectos, en el mismo orden que ProblemaUniverso.entrar
+        energia[activos] -= costos[activos, paso]
+        estrella = id_estrella(actual)
+        nueva = (estrella >= 0) & ~estrellas_tomadas[activos, np.maximum(estrella, 0)]
+        estrellas[activos[nueva]] += 1
+        estrellas_tomadas[activos[nueva], estrella[nueva]] = True
+        recarga = id_recarga(actual)
+        recarga_nueva = (recarga >= 0) & ~recargas_usadas[activos, np.maximum(recarga, 0)]
+        energia[activos[recarga_nueva]] *= factores[recarga[recarga_nueva]]
+        recargas_usadas[activos[recarga_nueva], recarga[recarga_nueva]] = True
+        estrellas[activos[negro_activo]] -= 1
+        negros_usados[activos[negro_activo], negro[negro_activo]] = True
+
+        # Entrar por un paso normal a un gusano sin usar obliga a saltar en el paso siguiente
+        gusano = id_gusano(actual)
+        salta = ~saltando & (gusano >= 0) & ~gusanos_usados[activos, np.maximum(gusano, 0)]
+        gusanos_usados[activos[salta], gusano[salta]] = True
+        salto_pendiente[activos] = np.where(salta, salidas[np.maximum(gusano, 0)], -1)
+
+        # La energía se controla al terminar el movimiento completo (después del salto)
+        agotada = ~salta & (energia[activos] <= 0) & (actual != destino)
+        fallar(activos[agotada], PODA_SIN_ENERGIA, paso)
+
+    # Los caminos sin error deben terminar en el destino, sin un salto pendiente
+    completos = np.flatnonzero(codigos == 0)
+    finales = indices[completos, largos[completos] - 1]
+    sin_llegar = (finales != destino) | (salto_pendiente[completos] >= 0)
+    fallar(completos[sin_llegar], MOTIVO_DESTINO_NO_ALCANZADO, largos[completos[sin_llegar]] - 1)
+
+    return VerificacionCaminos(codigos == 0, primer_error, codigos, energia)
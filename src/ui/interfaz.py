@@ -4,6 +4,7 @@ import sys
 import threading
 import os
 from typing import List, Tuple
+from modules.presupuesto import TokenCancelacion
 
 # Configuración de colores (para fondos o casos de error)
 BLANCO = (255, 255, 255)
@@ -18,6 +19,15 @@ CYAN = (0, 255, 255)
 NARANJA = (255, 165, 0)
 ROSA = (255, 192, 203)
 
+# Soluciones alternativas que se conservan y cuántas se examinan al resolver
+SOLUCIONES_A_MOSTRAR = 5
+SOLUCIONES_A_EXAMINAR = 200
+# Tiempo máximo (segundos) que se deja correr una resolución desde la interfaz
+TIEMPO_MAXIMO_RESOLUCION = 30
+# Rutas alternativas: fracción máxima de celdas que pueden compartir dos rutas mostradas
+SIMILITUD_MAXIMA_RUTAS = 0.8
+RUTAS_A_EXAMINAR = 500
+
 class InterfazUniverso:
     def __init__(self, universo, ancho_ventana=1000, alto_ventana=800):
         self.universo = universo
@@ -47,6 +57,7 @@ class InterfazUniverso:
         self.velocidad_animacion = 500
         self.calculando = False
         self.hilo_resolucion = None
+        self.cancelacion = None
 
     def cargar_imagenes(self):
         """Carga y escala todas las imágenes necesarias"""
@@ -133,7 +144,7 @@ class InterfazUniverso:
                 if self.usar_imagenes:
                     if celda.es_agujero_negro:
                         self.pantalla.blit(self.imagen_agujero_negro, (rect.x + 5, rect.y + 5))
-                    elif celda.es_estrella_gigante and [i, j] in self.universo.estrellas_gigantes_activas:
+                    elif celda.es_estrella_gigante and (i, j) in self.universo.estrellas_gigantes_activas:
                         self.pantalla.blit(self.imagen_estrella, (rect.x + 5, rect.y + 5))
                     elif celda.es_entrada_agujero_gusano:
                         self.pantalla.blit(self.imagen_portal_entrada, (rect.x + 5, rect.y + 5))
@@ -147,7 +158,7 @@ class InterfazUniverso:
                     # Representación con colores si no hay imágenes
                     if celda.es_agujero_negro:
                         pygame.draw.rect(self.pantalla, NEGRO, rect)
-                    elif celda.es_estrella_gigante and [i, j] in self.universo.estrellas_gigantes_activas:
+                    elif celda.es_estrella_gigante and (i, j) in self.universo.estrellas_gigantes_activas:
                         pygame.draw.rect(self.pantalla, AMARILLO, rect)
                     elif celda.es_entrada_agujero_gusano:
                         pygame.draw.rect(self.pantalla, MORADO, rect)
@@ -274,6 +285,7 @@ class InterfazUniverso:
         
         controles = [
             "R: Resolver",
+            "K: Rutas alternativas",
             "A: Animación",
             "P: Pausar animación",
             "→: Siguiente solución",
@@ -287,37 +299,56 @@ class InterfazUniverso:
             self.pantalla.blit(texto_control, (panel_rect.x + 10, panel_rect.y + 480 + i * 25))
 
     # ... (resto de los métodos se mantienen igual)
-    def resolver_en_hilo(self):
+    def resolver_en_hilo(self, rutas_alternativas=False):
         if not self.calculando:
             self.calculando = True
-            self.hilo_resolucion = threading.Thread(target=self._resolver_background)
+            self.cancelacion = TokenCancelacion()
+            self.hilo_resolucion = threading.Thread(target=self._resolver_background,
+                                                    args=(rutas_alternativas,))
             self.hilo_resolucion.start()
 
-    def _resolver_background(self):
-        self.universo.resolver()
+    def _resolver_background(self, rutas_alternativas=False):
+        # Varias soluciones alternativas para poder recorrerlas con ←/→
+        if rutas_alternativas:
+            self.universo.rutas_alternativas(SOLUCIONES_A_MOSTRAR, similitud_maxima=SIMILITUD_MAXIMA_RUTAS,
+                                             max_examinadas=RUTAS_A_EXAMINAR,
+                                             max_segundos=TIEMPO_MAXIMO_RESOLUCION,
+                                             cancelacion=self.cancelacion)
+        else:
+            self.universo.mejores_soluciones(SOLUCIONES_A_MOSTRAR, criterio="energia",
+                                             max_soluciones=SOLUCIONES_A_EXAMINAR,
+                                             max_segundos=TIEMPO_MAXIMO_RESOLUCION,
+                                             cancelacion=self.cancelacion)
         self.calculando = False
         self.solucion_actual = 0
         self.pasos_solucion = 0
         self.mostrar_animacion = False
 
+    def detener_resolucion(self):
+        """Pide a la búsqueda en curso que se detenga y espera a que el hilo termine"""
+        if self.hilo_resolucion and self.hilo_resolucion.is_alive():
+            self.cancelacion.cancelar()
+            self.hilo_resolucion.join()
+
     def manejar_eventos(self):
         for evento in pygame.event.get():
             if evento.type == QUIT:
-                if self.hilo_resolucion and self.hilo_resolucion.is_alive():
-                    self.hilo_resolucion.join()
+                self.detener_resolucion()
                 pygame.quit()
                 sys.exit()
             
             elif evento.type == KEYDOWN:
                 if evento.key == K_ESCAPE:
-                    if self.hilo_resolucion and self.hilo_resolucion.is_alive():
-                        self.hilo_resolucion.join()
+                    self.detener_resolucion()
                     pygame.quit()
                     sys.exit()
                 
                 elif evento.key == K_r and not self.calculando:
                     self.resolver_en_hilo()
                 
+                elif evento.key == K_k and not self.calculando:
+                    self.resolver_en_hilo(rutas_alternativas=True)
+                
                 elif evento.key == K_a:
                     if hasattr(self.universo, 'soluciones') and self.universo.soluciones:
                         self.mostrar_animacion = not self.mostrar_animacion
@@ -0,0 +1,44 @@
+import pytest
+
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+
+CASOS = [(tamano, semilla) for tamano in (5, 6, 8) for semilla in range(10)]
+
+# La salida del gusano es un agujero negro sin estrellas para destruirlo: entrar al gusano
+# no es viable y la única ruta rodea la grilla
+MAPA_SALIDA_INSEGURA = {
+    "matriz": {"filas": 3, "columnas": 3}, "origen": [0, 0], "destino": [0, 2],
+    "agujerosNegros": [[1, 1]], "estrellasGigantes": [],
+    "agujerosGusano": [{"entrada": [0, 1], "salida": [1, 1]}],
+    "zonasRecarga": [], "celdasCargaRequerida": [], "cargaInicial": 10,
+    "matrizInicial": [[0, 1, 1], [1, 1, 1], [1, 1, 1]],
+}
+
+def _caminos(soluciones):
+    return [list(s['camino']) for s in soluciones]
+
+
+@pytest.mark.parametrize("tamano,semilla", CASOS)
+def test_recursivo_e_iterativo_encuentran_el_mismo_camino(tamano, semilla):
+    datos = generar_caso(tamano, semilla)
+    recursivo = Universo(datos=datos).resolver("backtracking")
+    iterativo = Universo(datos=datos).resolver("backtracking_iterativo")
+    assert _caminos(recursivo) == _caminos(iterativo)
+
+
+@pytest.mark.parametrize("tamano,semilla", CASOS)
+def test_backtracking_no_es_mas_corto_que_astar(tamano, semilla):
+    # A* también admite volver a una celda, así que encuentra solución siempre que el backtracking
+    datos = generar_caso(tamano, semilla)
+    backtracking = Universo(datos=datos).resolver("backtracking_iterativo")
+    astar = Universo(datos=datos).resolver("astar")
+    if backtracking:
+        assert astar and len(astar[0]['camino']) <= len(backtracking[0]['camino'])
+
+
+@pytest.mark.parametrize("metodo", ["backtracking", "backtracking_iterativo"])
+def test_no_salta_a_una_salida_insegura(metodo):
+    universo = Universo(datos=MAPA_SALIDA_INSEGURA)
+    soluciones = universo.resolver(metodo)
+    assert _caminos(soluciones) == [[(0, 0), (1, 0), (2, 0), (2, 1), (2, 2), (1, 2), (0, 2)]]
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from modules.bitboard import GeometriaBits, desempaquetar, empaquetar
+
+
+@pytest.mark.parametrize("total", [1, 7, 8, 9, 100])
+def test_empaquetar_ida_y_vuelta(total):
+    mascara = np.random.default_rng(total).random(total) < 0.5
+    tablero = empaquetar(mascara)
+    assert desempaquetar(tablero, total).tolist() == mascara.tolist()
+    assert GeometriaBits.contar(tablero) == int(mascara.sum())
+
+
+def _inundar_celda_a_celda(filas, columnas, semilla, transitables):
+    alcanzadas = {semilla} if transitables[semilla] else set()
+    pendientes = list(alcanzadas)
+    while pendientes:
+        fila, columna = pendientes.pop()
+        for df, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            vecina = (fila + df, columna + dc)
+            if (0 <= vecina[0] < filas and 0 <= vecina[1] < columnas and transitables[vecina]
+                    and vecina not in alcanzadas):
+                alcanzadas.add(vecina)
+                pendientes.append(vecina)
+    return alcanzadas
+
+
+@pytest.mark.parametrize("filas,columnas,semilla", [(1, 9, 0), (9, 1, 1), (6, 7, 2), (13, 5, 3), (20, 20, 4)])
+def test_inundar_no_pasa_de_una_fila_a_otra(filas, columnas, semilla):
+    transitables = np.random.default_rng(semilla).random((filas, columnas)) < 0.65
+    geometria = GeometriaBits(filas, columnas)
+    alcanzadas = geometria.inundar(geometria.bit(0, 0), empaquetar(transitables.ravel()))
+    mascara = desempaquetar(alcanzadas, filas * columnas).reshape(filas, columnas)
+    esperadas = _inundar_celda_a_celda(filas, columnas, (0, 0), transitables)
+    assert {tuple(celda) for celda in np.argwhere(mascara)} == esperadas
@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+
+
+def _pasos(soluciones):
+    if not soluciones or not soluciones[0].get('completa', True):
+        return None
+    return len(soluciones[0]['camino']) - 1
+
+
+def _edicion_al_azar(universo, azar, camino):
+    """Edición válida como (nombre del método, argumentos), de preferencia sobre el camino actual"""
+    fijas = {tuple(universo.origen), tuple(universo.destino)}
+    libres = [(fila, columna) for fila in range(universo.filas) for columna in range(universo.columnas)
+              if (fila, columna) not in fijas and not universo.matriz[fila][columna].es_agujero_negro
+              and not universo.matriz[fila][columna].es_estrella_gigante
+              and not universo.matriz[fila][columna].es_zona_recarga]
+    en_camino = [celda for celda in libres if celda in camino]
+    celda = azar.choice(en_camino or libres)
+    opciones = [("set_costo", (*celda, azar.randint(0, 20))), ("add_agujero_negro", celda)]
+    if universo.agujeros_negros_originales:
+        opciones.append(("remove_agujero_negro", tuple(azar.choice(universo.agujeros_negros_originales))))
+    if universo.estrellas_gigantes_originales:
+        opciones.append(("move_estrella", (tuple(azar.choice(universo.estrellas_gigantes_originales)), celda)))
+    recargas = [(fila, columna) for fila in range(universo.filas) for columna in range(universo.columnas)
+                if universo.matriz[fila][columna].es_zona_recarga]
+    if recargas:
+        opciones.append(("move_zona_recarga", (azar.choice(recargas), celda)))
+    return azar.choice(opciones)
+
+
+@pytest.mark.parametrize("tamano,semilla", [(tamano, semilla) for tamano in (6, 8) for semilla in range(6)])
+def test_editar_y_resolver_coincide_con_astar(tamano, semilla):
+    datos = generar_caso(tamano, semilla)
+    datos['cargaInicial'] = 40
+    incremental = Universo(datos=datos)
+    azar = random.Random(semilla)
+    ediciones = []
+    for _ in range(10):
+        resuelto = incremental.resolver("incremental")
+        assert incremental.estado_resolucion.completa
+        # Un universo sin árbol previo con las mismas ediciones
+        nuevo = Universo(datos=datos)
+        for nombre, argumentos in ediciones:
+            getattr(nuevo, nombre)(*argumentos)
+        assert _pasos(resuelto) == _pasos(nuevo.resolver("astar"))
+        if resuelto:
+            assert incremental.verificar_caminos().validos.all()
+        camino = {tuple(celda) for celda in resuelto[0]['camino']} if resuelto else set()
+        edicion = _edicion_al_azar(incremental, azar, camino)
+        getattr(incremental, edicion[0])(*edicion[1])
+        ediciones.append(edicion)
+
+
+def test_edicion_invalida_no_cambia_la_solucion():
+    datos = generar_caso(6, 0)
+    universo = Universo(datos=datos)
+    antes = _pasos(universo.resolver("incremental"))
+    with pytest.raises(ValueError):
+        universo.set_costo(0, 0, -1)
+    with pytest.raises(ValueError):
+        universo.add_agujero_negro(*universo.agujeros_negros_originales[0])
+    assert _pasos(universo.resolver("incremental")) == antes
@@ -0,0 +1,47 @@
+import pytest
+
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+
+# La única ruta vuelve sobre (0, 1) después de buscar la estrella: A* la encuentra,
+# los métodos de caminos simples no
+MAPA_CON_REGRESO = {
+    "matriz": {"filas": 2, "columnas": 4}, "origen": [0, 0], "destino": [0, 3],
+    "agujerosNegros": [[0, 2], [1, 0], [1, 2], [1, 3]], "estrellasGigantes": [[1, 1]],
+    "agujerosGusano": [], "zonasRecarga": [], "celdasCargaRequerida": [], "cargaInicial": 20,
+    "matrizInicial": [[0, 1, 1, 1], [1, 1, 1, 1]],
+}
+
+
+def _pasos(soluciones):
+    if not soluciones or not soluciones[0].get('completa', True):
+        return None
+    return len(soluciones[0]['camino']) - 1
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_encuentra_el_camino_simple_mas_corto(semilla):
+    datos = generar_caso(5, semilla)
+    universo = Universo(datos=datos)
+    paralelo = universo.resolver("paralelo", trabajadores=2)
+    assert universo.estado_resolucion.completa
+    assert not universo.estado_resolucion.optima
+    enumeracion = Universo(datos=datos).mejores_soluciones(1, criterio="longitud")
+    assert _pasos(paralelo) == _pasos(enumeracion)
+
+
+@pytest.mark.parametrize("tamano,semilla", [(8, 0), (8, 1), (10, 2), (10, 3)])
+def test_misma_existencia_que_el_backtracking(tamano, semilla):
+    datos = generar_caso(tamano, semilla)
+    paralelo = Universo(datos=datos).resolver("paralelo", trabajadores=2)
+    backtracking = Universo(datos=datos).resolver("backtracking_iterativo")
+    assert bool(paralelo) == bool(backtracking)
+    if paralelo:
+        assert _pasos(paralelo) <= _pasos(backtracking)
+
+
+def test_no_afirma_optimalidad_sin_regresos():
+    universo = Universo(datos=MAPA_CON_REGRESO)
+    assert universo.resolver("paralelo", trabajadores=2) == []
+    assert not universo.estado_resolucion.optima
+    assert _pasos(Universo(datos=MAPA_CON_REGRESO).resolver("astar")) == 5
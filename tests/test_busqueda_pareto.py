@@ -0,0 +1,119 @@
+from collections import defaultdict
+
+import pytest
+
+from modules.busqueda_pareto import buscar_pareto
+from modules.generar_matriz import generar_matriz_universo
+from modules.motor_busqueda import MOVIMIENTOS, ProblemaUniverso
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+
+CASOS = [(tamano, semilla) for tamano in (5, 6, 8) for semilla in range(6)]
+
+
+def _objetivos(solucion):
+    return len(solucion['camino']) - 1, solucion['energia'][-1], solucion['estrellas'][-1]
+
+
+def _domina(a, b):
+    return a != b and a[0] <= b[0] and a[1] >= b[1] and a[2] >= b[2]
+
+
+def _no_dominadas(llegadas):
+    return sorted(a for a in set(llegadas) if not any(_domina(b, a) for b in llegadas))
+
+
+def _llegadas_hasta(problema, max_pasos):
+    """Todas las llegadas al destino con a lo sumo max_pasos, por capas de pasos sobre el espacio de estados"""
+    por_pasos = defaultdict(set)
+    por_pasos[0].add((problema.origen, problema.carga_inicial, 0, 0, 0, 0, 0))
+    llegadas = []
+    for pasos in range(max_pasos + 1):
+        for posicion, energia, estrellas, m_est, m_neg, m_rec, m_gus in por_pasos.pop(pasos, ()):
+            if posicion == problema.destino:
+                llegadas.append((pasos, energia, estrellas))
+                continue
+            if energia <= 0:
+                continue
+            for df, dc in MOVIMIENTOS:
+                siguiente = (posicion[0] + df, posicion[1] + dc)
+                if not problema.es_valida(*siguiente):
+                    continue
+                efecto = problema.entrar(siguiente, energia, estrellas, m_est, m_neg, m_rec)
+                if efecto is None:
+                    continue
+                n_pasos, n_gus = pasos + 1, m_gus
+                gusano = problema.gusanos.get(siguiente)
+                if gusano is not None and not (m_gus >> gusano[0]) & 1:
+                    siguiente = gusano[1]
+                    efecto = problema.entrar(siguiente, *efecto)
+                    if efecto is None:
+                        continue
+                    n_pasos, n_gus = pasos + 2, m_gus | 1 << gusano[0]
+                por_pasos[n_pasos].add((siguiente, *efecto, n_gus))
+    return llegadas
+
+
+def _resolver(datos, metodo):
+    universo = Universo(datos=datos)
+    return universo, universo.resolver(metodo)
+
+
+@pytest.mark.parametrize("tamano,semilla", CASOS)
+def test_frente_contiene_la_ruta_de_astar(tamano, semilla):
+    datos = generar_caso(tamano, semilla)
+    universo, frente = _resolver(datos, "pareto")
+    _, astar = _resolver(datos, "astar")
+    assert bool(frente) == bool(astar)
+    if frente:
+        assert _objetivos(frente[0])[0] == len(astar[0]['camino']) - 1
+        assert universo.estado_resolucion.optima == universo.estado_resolucion.completa
+
+
+@pytest.mark.parametrize("tamano,semilla", CASOS)
+def test_frente_valido_y_no_dominado(tamano, semilla):
+    universo, frente = _resolver(generar_caso(tamano, semilla), "pareto")
+    objetivos = [_objetivos(solucion) for solucion in frente]
+    assert objetivos == sorted(objetivos, key=lambda o: o[0])
+    assert not any(_domina(a, b) for a in objetivos for b in objetivos)
+    verificacion = universo.verificar_caminos()
+    assert verificacion.validos.all()
+    assert verificacion.energia_final.tolist() == [o[1] for o in objetivos]
+
+
+@pytest.mark.parametrize("semilla", range(8))
+def test_frente_exacto_en_universos_chicos(semilla):
+    # Sin recorte, el frente coincide con el de todas las llegadas de hasta max_pasos pasos
+    datos = generar_matriz_universo(4, 4, num_agujeros_negros=1, num_estrellas=2, num_gusanos=1, num_recargas=2,
+                                    num_cargas_requeridas=1, carga_inicial=30, semilla=semilla)
+    problema = ProblemaUniverso(Universo(datos=datos))
+    frente, completo = buscar_pareto(problema, max_etiquetas=1000)
+    assert completo
+    max_pasos = 12
+    esperado = _no_dominadas(_llegadas_hasta(problema, max_pasos))
+    assert sorted(o for o in map(_objetivos, frente) if o[0] <= max_pasos) == esperado
+
+
+def test_presupuesto_agotado_deja_el_frente_incompleto():
+    universo = Universo(datos=generar_caso(10, 1))
+    universo.resolver("pareto", max_nodos=50)
+    assert not universo.estado_resolucion.completa
+    assert universo.estado_resolucion.motivo == "max_nodos"
+
+
+def test_tope_de_etiquetas():
+    problema = ProblemaUniverso(Universo(datos=generar_matriz_universo(10, 10, semilla=1)))
+    recortado, completo = buscar_pareto(problema, max_etiquetas=2)
+    assert not completo
+    assert recortado
+    with pytest.raises(ValueError):
+        buscar_pareto(problema, max_etiquetas=0)
+
+
+def test_universo_por_defecto_termina_marcado_incompleto():
+    # Con la densidad por defecto el tope se alcanza: el frente termina, pero sin garantía
+    universo = Universo(datos=generar_matriz_universo(10, 10, semilla=1))
+    frente = universo.resolver("pareto")
+    _, astar = _resolver(generar_matriz_universo(10, 10, semilla=1), "astar")
+    assert not universo.estado_resolucion.completa and universo.estado_resolucion.motivo is None
+    assert _objetivos(frente[0])[0] == len(astar[0]['camino']) - 1
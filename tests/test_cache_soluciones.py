@@ -0,0 +1,109 @@
+import os
+
+import pytest
+
+from modules.cache_soluciones import CacheSoluciones
+from modules.generar_matriz import generar_matriz_universo
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+
+
+def _universo(directorio=None, semilla=1):
+    universo = Universo(datos=generar_caso(8, semilla))
+    universo.cache = CacheSoluciones(directorio)
+    return universo
+
+
+def test_fallo_y_acierto_en_memoria():
+    universo = _universo()
+    primera = [dict(s) for s in universo.resolver("astar")]
+    assert not universo.estado_resolucion.desde_cache
+    segunda = [dict(s) for s in universo.resolver("astar")]
+    assert universo.estado_resolucion.desde_cache
+    assert segunda == primera
+    assert (universo.cache.aciertos, universo.cache.fallos) == (1, 1)
+
+
+def test_otro_metodo_o_un_cambio_no_usan_la_entrada():
+    universo = _universo()
+    universo.resolver("astar")
+    universo.resolver("dijkstra")
+    assert not universo.estado_resolucion.desde_cache
+    universo.set_costo(1, 1, universo.matriz[1][1].costo_energia + 1)
+    universo.resolver("astar")
+    assert not universo.estado_resolucion.desde_cache
+
+
+def test_acierto_desde_disco(tmp_path):
+    universo = _universo(str(tmp_path))
+    primera = [dict(s) for s in universo.resolver("astar")]
+    assert universo.cache.entradas_disco == 1
+
+    # Otra caché sobre el mismo directorio (otro proceso) lee el archivo
+    otro = _universo(str(tmp_path))
+    assert otro.cache.entradas_disco == 1
+    segunda = [dict(s) for s in otro.resolver("astar")]
+    assert otro.estado_resolucion.desde_cache
+    assert segunda == primera
+
+
+def test_recorte_del_disco_por_tamano(tmp_path):
+    cache = CacheSoluciones(str(tmp_path), max_bytes_disco=2000)
+    solucion = {'camino': [(0, i) for i in range(50)], 'energia': list(range(50)), 'estrellas': [0] * 50}
+    for i in range(20):
+        cache.guardar(f"clave{i:02d}", [solucion], {'completa': True})
+    en_disco = sum(os.path.getsize(tmp_path / nombre) for nombre in os.listdir(tmp_path))
+    assert cache.bytes_disco == en_disco <= 2000
+    # Se desalojan las más viejas
+    assert not (tmp_path / "clave00.sol").exists()
+    assert (tmp_path / "clave19.sol").exists()
+
+
+def test_entrada_corrupta_es_un_fallo(tmp_path):
+    cache = CacheSoluciones(str(tmp_path), capacidad_memoria=1)
+    solucion = {'camino': [(0, 0), (0, 1)], 'energia': [5, 4], 'estrellas': [0, 0]}
+    cache.guardar("a", [solucion], {})
+    cache.guardar("b", [solucion], {})
+    (tmp_path / "a.sol").write_bytes(b"basura")
+    assert cache.obtener("a") is None
+    assert not (tmp_path / "a.sol").exists()
+    assert cache.entradas_disco == 1
+
+
+def test_capacidades_invalidas():
+    with pytest.raises(ValueError):
+        CacheSoluciones(capacidad_memoria=0)
+    with pytest.raises(ValueError):
+        CacheSoluciones(max_bytes_disco=0)
+
+
+def test_un_resultado_cortado_por_el_presupuesto_no_se_guarda():
+    universo = _universo()
+    universo.resolver("astar", max_nodos=1)
+    assert len(universo.cache) == 0
+    universo.resolver("astar")
+    assert not universo.estado_resolucion.desde_cache
+    assert universo.estado_resolucion.completa
+
+
+def test_el_estado_incompleto_se_conserva():
+    # pareto termina con el tope de etiquetas alcanzado: el resultado se guarda como incompleto
+    universo = Universo(datos=generar_matriz_universo(10, 10, semilla=1))
+    universo.cache = CacheSoluciones()
+    universo.resolver("pareto")
+    guardado = universo.estado_resolucion
+    assert not guardado.completa
+    universo.resolver("pareto")
+    assert universo.estado_resolucion.desde_cache
+    assert (universo.estado_resolucion.completa, universo.estado_resolucion.optima) == \
+        (guardado.completa, guardado.optima)
+
+
+def test_parametros_en_la_clave():
+    universo = _universo()
+    universo.rutas_alternativas(2)
+    assert universo.estado_resolucion.completa
+    universo.rutas_alternativas(3)
+    assert not universo.estado_resolucion.desde_cache
+    universo.rutas_alternativas(2)
+    assert universo.estado_resolucion.desde_cache
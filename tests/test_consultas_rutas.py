@@ -0,0 +1,119 @@
+import pytest
+
+from modules.consultas_rutas import ConsultasRutas
+from modules.generar_matriz import guardar_matriz
+from modules.matriz_mapeada import convertir_json
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+
+
+def _pasos(solucion):
+    if solucion is None or not solucion.get('completa', True):
+        return None
+    return len(solucion['camino']) - 1
+
+
+def _astar(datos, origen, destino, carga=None):
+    """A* de resolver() sobre una copia del universo con otro origen, destino y carga"""
+    datos = dict(datos, origen=list(origen), destino=list(destino))
+    if carga is not None:
+        datos['cargaInicial'] = carga
+    soluciones = Universo(datos=datos).resolver("astar")
+    return _pasos(soluciones[0]) if soluciones else None
+
+
+def _pares(universo):
+    return [((0, 0), (universo.filas - 1, universo.columnas - 1)), ((2, 3), (0, 1)),
+            ((universo.filas - 1, 0), (3, universo.columnas - 2)), ((1, 1), (1, 1))]
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_ruta_coincide_con_resolver(semilla):
+    datos = generar_caso(8, semilla)
+    universo = Universo(datos=datos)
+    for origen, destino in _pares(universo):
+        for carga in (None, 30):
+            ruta = universo.ruta(origen, destino, carga)
+            assert _pasos(ruta) == _astar(datos, origen, destino, carga)
+            if ruta is not None:
+                assert list(ruta['camino'][0]) == list(origen) and list(ruta['camino'][-1]) == list(destino)
+    # Las consultas no tocan las soluciones ni la nave
+    assert universo.soluciones == [] and universo.nave.camino == [tuple(universo.origen)]
+
+
+def test_rutas_en_lote_en_el_mismo_orden():
+    universo = Universo(datos=generar_caso(8, 1))
+    consultas = [(origen, destino) for origen, destino in _pares(universo)] + [((0, 0), (7, 7), 25)]
+    respuestas = universo.rutas(consultas)
+    assert [_pasos(r) for r in respuestas] == [_pasos(universo.ruta(*consulta)) for consulta in consultas]
+    # Un mapa de costo restante por destino distinto
+    assert universo.consultas.mapas_calculados == len({tuple(consulta[1]) for consulta in consultas})
+    assert universo.consultas.consultas == 2 * len(consultas)
+
+
+def test_heuristica_admisible():
+    datos = generar_caso(6, 2)
+    universo = Universo(datos=datos)
+    destino = tuple(universo.destino)
+    heuristica = universo.consultas.heuristica(destino)
+    for fila in range(universo.filas):
+        for columna in range(universo.columnas):
+            pasos = _pasos(universo.ruta((fila, columna), destino, 10 ** 6))
+            if pasos is not None:
+                assert heuristica((fila, columna)) <= pasos
+
+
+def test_lru_de_destinos():
+    universo = Universo(datos=generar_caso(8, 0))
+    consultas = ConsultasRutas(universo, capacidad_destinos=2)
+    for destino in ((7, 7), (5, 5), (7, 7), (3, 3)):
+        consultas.ruta((0, 0), destino)
+    assert len(consultas._mapas) == 2
+    assert list(consultas._mapas) == [(7, 7), (3, 3)]
+    assert consultas.mapas_calculados == 3
+
+
+def test_ruta_despues_de_editar():
+    datos = generar_caso(8, 3)
+    universo = Universo(datos=datos)
+    antes = universo.ruta((0, 0), (7, 7))
+    fila, columna = antes['camino'][len(antes['camino']) // 2]
+    universo.add_agujero_negro(fila, columna)
+    editado = dict(datos, agujerosNegros=datos['agujerosNegros'] + [[fila, columna]])
+    assert _pasos(universo.ruta((0, 0), (7, 7))) == _astar(editado, (0, 0), (7, 7))
+
+
+def test_fuera_de_memoria(tmp_path):
+    datos = generar_caso(8, 1)
+    guardar_matriz(datos, str(tmp_path / "u.json"))
+    convertir_json(str(tmp_path / "u.json"), str(tmp_path / "u.umap"), tamano_tesela=4)
+    mapeado = Universo(archivo_mapa=str(tmp_path / "u.umap"))
+    en_memoria = Universo(datos=datos)
+    for origen, destino in _pares(en_memoria):
+        assert _pasos(mapeado.ruta(origen, destino)) == _pasos(en_memoria.ruta(origen, destino))
+    assert mapeado.consultas.mapas_calculados == 0
+
+
+def test_argumentos_invalidos():
+    universo = Universo(datos=generar_caso(5, 0))
+    with pytest.raises(ValueError):
+        universo.ruta((0, 0), (5, 0))
+    with pytest.raises(ValueError):
+        ConsultasRutas(universo, capacidad_destinos=0)
+    assert universo.ruta((0, 0), (4, 4), max_nodos=1)['completa'] is False
+
+
+def test_consultas_desde_varios_hilos():
+    from concurrent.futures import ThreadPoolExecutor
+    datos = generar_caso(8, 2)
+    universo = Universo(datos=datos)
+    consultas = [((0, 0), (7, 7)), ((2, 3), (0, 1)), ((7, 0), (3, 6))] * 20
+    with ThreadPoolExecutor(max_workers=8) as ejecutor:
+        respuestas = list(ejecutor.map(lambda consulta: universo.ruta(*consulta), consultas))
+        contraidos = set(map(id, ejecutor.map(lambda _: universo.grafo_contraido, range(16))))
+    esperadas = [_pasos(Universo(datos=datos).ruta(*consulta)) for consulta in consultas[:3]]
+    assert [_pasos(r) for r in respuestas] == esperadas * 20
+    # Una sola instancia de cada precálculo perezoso y ninguna consulta perdida
+    assert len(contraidos) == 1
+    assert universo.consultas.consultas == len(consultas)
+    assert universo.consultas.mapas_calculados == 3
@@ -0,0 +1,68 @@
+import pytest
+
+from modules.contraccion import GrafoContraido, buscar_contraido
+from modules.generar_matriz import guardar_matriz
+from modules.matriz_mapeada import convertir_json
+from modules.mision_interestelar import Universo
+from modules.motor_busqueda import ProblemaUniverso
+from modules.rendimiento import METODOS_POR_DEFECTO, generar_caso
+
+CASOS = [(tamano, semilla) for tamano in (5, 8, 12) for semilla in range(6)]
+
+
+def _pasos(solucion):
+    if solucion is None or not solucion.get('completa', True):
+        return None
+    return len(solucion['camino']) - 1
+
+
+@pytest.mark.parametrize("tamano,semilla", CASOS)
+def test_mismos_pasos_que_astar(tamano, semilla):
+    datos = generar_caso(tamano, semilla)
+    universo = Universo(datos=datos)
+    contraido = universo.resolver("contraido")
+    astar = Universo(datos=datos).resolver("astar")
+    assert _pasos(contraido[0] if contraido else None) == _pasos(astar[0] if astar else None)
+    if contraido:
+        assert universo.verificar_caminos().validos.all()
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_capas_acotadas_y_recalculadas(semilla):
+    datos = generar_caso(12, semilla)
+    universo = Universo(datos=datos)
+    problema = ProblemaUniverso(universo)
+    sin_limite = buscar_contraido(GrafoContraido(problema), problema)
+    grafo = GrafoContraido(problema, max_capas=1)
+    acotada = buscar_contraido(grafo, problema)
+    assert len(grafo._capas) <= 1
+    if sin_limite is None:
+        assert acotada is None
+        return
+    # Las celdas de los corredores se reconstruyen igual desde capas recalculadas
+    assert acotada['camino'] == sin_limite['camino']
+    assert acotada['energia'] == sin_limite['energia']
+    assert grafo.recalculos > 0
+
+
+def test_argumentos_y_fuera_de_memoria(tmp_path):
+    datos = generar_caso(6, 0)
+    with pytest.raises(ValueError):
+        GrafoContraido(ProblemaUniverso(Universo(datos=datos)), max_capas=0)
+    guardar_matriz(datos, str(tmp_path / "u.json"))
+    convertir_json(str(tmp_path / "u.json"), str(tmp_path / "u.umap"))
+    with pytest.raises(ValueError):
+        Universo(archivo_mapa=str(tmp_path / "u.umap")).resolver("contraido")
+
+
+def test_grafo_se_rehace_al_editar():
+    universo = Universo(datos=generar_caso(8, 1))
+    grafo = universo.grafo_contraido
+    celda = next((f, c) for f in range(8) for c in range(8) if (f, c) not in grafo.nodos)
+    universo.add_agujero_negro(*celda)
+    assert universo.grafo_contraido is not grafo
+    assert celda in universo.grafo_contraido.nodos
+
+
+def test_contraido_no_entra_por_defecto_en_la_medicion():
+    assert "contraido" not in METODOS_POR_DEFECTO
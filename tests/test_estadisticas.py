@@ -0,0 +1,91 @@
+import pytest
+
+from modules.estadisticas import PODA_AGUJERO_NEGRO, PODA_SIN_ENERGIA, EstadisticasBusqueda
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+
+METODOS = ("astar", "dijkstra", "incremental", "contraido", "backtracking", "backtracking_iterativo")
+
+
+def test_contadores():
+    avisos = []
+    estadisticas = EstadisticasBusqueda(al_progreso=lambda e: avisos.append(e.nodos_expandidos), intervalo=2)
+    for profundidad in (0, 1, 1, 3):
+        estadisticas.expandir(profundidad)
+    estadisticas.podar(PODA_SIN_ENERGIA)
+    estadisticas.podar(PODA_SIN_ENERGIA)
+    estadisticas.podar(PODA_AGUJERO_NEGRO)
+    estadisticas.retroceder()
+    estadisticas.usar_gusano()
+    with estadisticas.fase("busqueda"):
+        pass
+    with estadisticas.fase("busqueda"):
+        pass
+
+    datos = estadisticas.como_dict()
+    assert avisos == [2, 4]
+    assert datos['nodos_expandidos'] == 4
+    assert datos['histograma_profundidad'] == [1, 2, 0, 1]
+    assert datos['profundidad_maxima'] == 3
+    assert datos['podas'] == {PODA_SIN_ENERGIA: 2, PODA_AGUJERO_NEGRO: 1}
+    assert datos['retrocesos'] == 1 and datos['usos_gusano'] == 1
+    assert list(datos['tiempos_fase']) == ["busqueda"]
+
+    estadisticas.reiniciar()
+    assert estadisticas.nodos_expandidos == 0 and estadisticas.podas == {}
+
+
+def test_acumular():
+    a, b = EstadisticasBusqueda(), EstadisticasBusqueda()
+    a.expandir(1)
+    a.podar(PODA_SIN_ENERGIA)
+    for profundidad in (0, 4):
+        b.expandir(profundidad)
+    b.podar(PODA_SIN_ENERGIA)
+    b.usar_gusano()
+    a.acumular(b.como_dict())
+    assert a.nodos_expandidos == 3
+    assert a.histograma_profundidad == [1, 1, 0, 0, 1]
+    assert a.profundidad_maxima == 4
+    assert a.podas == {PODA_SIN_ENERGIA: 2}
+    assert a.usos_gusano == 1
+
+
+def test_intervalo_invalido():
+    with pytest.raises(ValueError):
+        EstadisticasBusqueda(intervalo=0)
+
+
+@pytest.mark.parametrize("metodo", METODOS)
+@pytest.mark.parametrize("semilla", range(3))
+def test_nodos_coinciden_con_el_presupuesto(metodo, semilla):
+    universo = Universo(datos=generar_caso(8, semilla))
+    estadisticas = EstadisticasBusqueda()
+    universo.resolver(metodo, estadisticas=estadisticas)
+    assert estadisticas.nodos_expandidos == universo.estado_resolucion.nodos_expandidos
+    assert sum(estadisticas.histograma_profundidad) == estadisticas.nodos_expandidos
+    assert estadisticas.profundidad_maxima == len(estadisticas.histograma_profundidad) - 1
+    assert {"factibilidad", "busqueda", "cierre"} <= set(estadisticas.tiempos_fase)
+
+
+@pytest.mark.parametrize("semilla", range(3))
+def test_incremental_cuenta_como_astar(semilla):
+    datos = generar_caso(8, semilla)
+    por_metodo = {}
+    for metodo in ("astar", "incremental"):
+        estadisticas = EstadisticasBusqueda()
+        Universo(datos=datos).resolver(metodo, estadisticas=estadisticas)
+        datos_metodo = estadisticas.como_dict()
+        del datos_metodo['tiempos_fase']
+        por_metodo[metodo] = datos_metodo
+    assert por_metodo['astar'] == por_metodo['incremental']
+
+
+def test_paralelo_suma_las_estadisticas_de_los_procesos():
+    universo = Universo(datos=generar_caso(8, 1))
+    estadisticas = EstadisticasBusqueda()
+    universo.resolver("paralelo", estadisticas=estadisticas, trabajadores=2)
+    # El presupuesto también cuenta las llegadas que la cota corta antes de expandirlas
+    assert 0 < estadisticas.nodos_expandidos <= universo.estado_resolucion.nodos_expandidos
+    assert sum(estadisticas.histograma_profundidad) == estadisticas.nodos_expandidos
+    assert estadisticas.podas
@@ -0,0 +1,100 @@
+import pytest
+
+from modules.factibilidad import (MOTIVO_DESTINO_INALCANZABLE, MOTIVO_ENERGIA_INSUFICIENTE, MOTIVO_SIN_ENERGIA,
+                                  analizar)
+from modules.generar_matriz import generar_matriz_universo
+from modules.matriz_compacta import DESCARTADA
+from modules.mision_interestelar import Universo
+from modules.motor_busqueda import ProblemaUniverso, buscar
+from modules.rendimiento import generar_caso
+
+# Cargas bajas y muchos obstáculos para que haya celdas descartadas y universos sin solución
+CASOS = ([("caso", tamano, semilla) for tamano in (5, 8) for semilla in range(6)] +
+         [("denso", tamano, semilla) for tamano in (6, 8, 10) for semilla in range(12)])
+
+
+def _mapa(**cambios):
+    datos = {
+        "matriz": {"filas": 3, "columnas": 3}, "origen": [0, 0], "destino": [2, 2],
+        "agujerosNegros": [], "estrellasGigantes": [], "agujerosGusano": [],
+        "zonasRecarga": [], "celdasCargaRequerida": [], "cargaInicial": 10,
+        "matrizInicial": [[1, 1, 1], [1, 1, 1], [1, 1, 1]],
+    }
+    datos.update(cambios)
+    return datos
+
+
+def _datos(tipo, tamano, semilla):
+    if tipo == "caso":
+        datos = generar_caso(tamano, semilla)
+        datos['cargaInicial'] = 15 + 10 * semilla
+        return datos
+    return generar_matriz_universo(tamano, tamano, num_agujeros_negros=tamano * tamano // 4,
+                                   num_estrellas=semilla % 2, num_gusanos=2, num_recargas=semilla % 3,
+                                   num_cargas_requeridas=tamano, carga_inicial=60, semilla=semilla)
+
+
+def test_los_casos_cubren_descartes_y_universos_sin_solucion():
+    resultados = [analizar(Universo(datos=_datos(*caso))) for caso in CASOS]
+    assert any(resultado.factible and resultado.descartadas for resultado in resultados)
+    assert any(not resultado.factible for resultado in resultados)
+
+
+@pytest.mark.parametrize("tipo,tamano,semilla", CASOS)
+def test_no_descarta_celdas_de_ninguna_ruta(tipo, tamano, semilla):
+    universo = Universo(datos=_datos(tipo, tamano, semilla))
+    factibilidad = analizar(universo)
+    # A* sin descartar celdas
+    sin_analisis = buscar(ProblemaUniverso(universo))
+    if sin_analisis is not None:
+        assert factibilidad.factible
+        descartadas = factibilidad.celdas_descartadas(universo.filas, universo.columnas)
+        assert not descartadas & set(map(tuple, sin_analisis['camino']))
+
+
+@pytest.mark.parametrize("tipo,tamano,semilla", CASOS)
+def test_resolver_con_analisis_da_los_mismos_pasos(tipo, tamano, semilla):
+    universo = Universo(datos=_datos(tipo, tamano, semilla))
+    con_analisis = universo.resolver("astar")
+    sin_analisis = buscar(ProblemaUniverso(Universo(datos=_datos(tipo, tamano, semilla))))
+    pasos = len(con_analisis[0]['camino']) - 1 if con_analisis else None
+    assert pasos == (None if sin_analisis is None else len(sin_analisis['camino']) - 1)
+
+
+def test_sin_energia_inicial():
+    factibilidad = analizar(Universo(datos=_mapa(cargaInicial=0)))
+    assert not factibilidad.factible and factibilidad.motivo == MOTIVO_SIN_ENERGIA
+
+
+def test_destino_rodeado_de_agujeros_negros_sin_estrellas():
+    universo = Universo(datos=_mapa(agujerosNegros=[[1, 2], [2, 1], [1, 1]]))
+    factibilidad = analizar(universo)
+    assert not factibilidad.factible and factibilidad.motivo == MOTIVO_DESTINO_INALCANZABLE
+    assert universo.resolver("astar") == []
+    # Con una estrella alcanzable los agujeros negros se pueden atravesar
+    universo = Universo(datos=_mapa(agujerosNegros=[[1, 2], [2, 1], [1, 1]], estrellasGigantes=[[0, 1]]))
+    assert analizar(universo).factible
+
+
+def test_energia_insuficiente():
+    factibilidad = analizar(Universo(datos=_mapa(cargaInicial=3)))
+    assert not factibilidad.factible and factibilidad.motivo == MOTIVO_ENERGIA_INSUFICIENTE
+    assert factibilidad.costo_minimo >= factibilidad.energia_maxima
+    # Una recarga en el camino cambia la cota de energía
+    assert analizar(Universo(datos=_mapa(cargaInicial=3, zonasRecarga=[[0, 1, 3]]))).factible
+
+
+def test_carga_requerida_imposible_descarta_la_celda():
+    universo = Universo(datos=_mapa(celdasCargaRequerida=[{"coordenada": [1, 1], "cargaGastada": 500}]))
+    factibilidad = analizar(universo)
+    assert factibilidad.factible
+    assert (1, 1) in factibilidad.celdas_descartadas(3, 3)
+
+
+def test_verificar_factibilidad_marca_la_grilla():
+    universo = Universo(datos=_mapa(celdasCargaRequerida=[{"coordenada": [1, 1], "cargaGastada": 500}]))
+    assert universo.verificar_factibilidad()
+    marcadas = {(fila, columna) for fila in range(3) for columna in range(3)
+                if universo.celdas.banderas[fila * 3 + columna] & DESCARTADA}
+    assert marcadas == set(universo.factibilidad.celdas_descartadas(3, 3))
+    assert (1, 1) in marcadas
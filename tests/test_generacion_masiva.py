@@ -0,0 +1,59 @@
+import gzip
+import json
+import os
+
+import pytest
+
+from modules.generacion_masiva import (ARCHIVO_CORPUS, CorpusUniversos, cantidades_por_densidad,
+                                       generar_corpus)
+from modules.generar_matriz import generar_matriz_universo
+
+
+def _esperado(semilla):
+    return generar_matriz_universo(12, 10, semilla=semilla, **cantidades_por_densidad(12, 10))
+
+
+@pytest.mark.parametrize("trabajadores", [1, 2])
+def test_corpus_reproduce_la_generacion(tmp_path, trabajadores):
+    metadatos = generar_corpus(str(tmp_path), 7, semilla_inicial=100, filas=12, columnas=10,
+                               por_fragmento=3, trabajadores=trabajadores)
+    assert metadatos['fragmentos'] == ["fragmento-00000.jsonl.gz", "fragmento-00001.jsonl.gz",
+                                       "fragmento-00002.jsonl.gz"]
+    corpus = CorpusUniversos(str(tmp_path))
+    assert len(corpus) == 7
+    # Acceso directo por semilla y recorrido completo dan lo mismo que generar_matriz_universo
+    for semilla in (106, 100, 103):
+        assert corpus.cargar(semilla) == _esperado(semilla)
+    assert dict(corpus) == {semilla: _esperado(semilla) for semilla in range(100, 107)}
+    assert 100 in corpus and 106 in corpus and 107 not in corpus and 99 not in corpus
+    with pytest.raises(ValueError):
+        corpus.cargar(99)
+    # Cada fragmento también se lee entero con gzip
+    with gzip.open(os.path.join(str(tmp_path), metadatos['fragmentos'][2]), "rt") as archivo:
+        assert [json.loads(linea) for linea in archivo] == [_esperado(106)]
+
+
+def test_mismos_bytes_con_uno_o_varios_procesos(tmp_path):
+    uno, varios = tmp_path / "uno", tmp_path / "varios"
+    generar_corpus(str(uno), 5, filas=8, columnas=8, por_fragmento=2, trabajadores=1)
+    generar_corpus(str(varios), 5, filas=8, columnas=8, por_fragmento=2, trabajadores=2)
+    for nombre in sorted(os.listdir(uno)):
+        assert (uno / nombre).read_bytes() == (varios / nombre).read_bytes()
+
+
+def test_densidades_y_argumentos(tmp_path):
+    assert cantidades_por_densidad(30, 30)['num_estrellas'] == 5
+    assert cantidades_por_densidad(2, 2)['num_gusanos'] == 1
+    assert cantidades_por_densidad(10, 10, {'num_recargas': 0})['num_recargas'] == 0
+    with pytest.raises(ValueError):
+        cantidades_por_densidad(10, 10, {'num_cometas': 0.1})
+    with pytest.raises(ValueError):
+        generar_corpus(str(tmp_path), 0)
+    with pytest.raises(ValueError):
+        generar_corpus(str(tmp_path), 3, por_fragmento=0)
+    generar_corpus(str(tmp_path), 2, filas=6, columnas=6)
+    metadatos = json.loads((tmp_path / ARCHIVO_CORPUS).read_text())
+    metadatos['version'] = 99
+    (tmp_path / ARCHIVO_CORPUS).write_text(json.dumps(metadatos))
+    with pytest.raises(ValueError):
+        CorpusUniversos(str(tmp_path))
@@ -0,0 +1,86 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from modules.generar_matriz import generar_matriz_universo, guardar_matriz
+from modules.matriz_mapeada import MatrizMapeada, convertir_json, escribir_mapa
+from modules.mision_interestelar import Universo
+
+
+def _pasos(soluciones):
+    return len(soluciones[0]['camino']) - 1 if soluciones else None
+
+
+@pytest.fixture
+def datos():
+    return generar_matriz_universo(13, 10, semilla=4)
+
+
+@pytest.fixture
+def rutas(tmp_path, datos):
+    archivo_json = str(tmp_path / "u.json")
+    guardar_matriz(datos, archivo_json)
+    archivo_mapa = str(tmp_path / "u.umap")
+    # Teselas que no dividen la grilla: la última fila y columna de teselas quedan incompletas
+    convertir_json(archivo_json, archivo_mapa, tamano_tesela=4)
+    return archivo_json, archivo_mapa
+
+
+def test_costos_ida_y_vuelta(rutas, datos):
+    mapeado = Universo(archivo_mapa=rutas[1])
+    assert not mapeado.celdas.en_memoria
+    costos = [[mapeado.matriz[fila][columna].costo_energia for columna in range(10)] for fila in range(13)]
+    assert costos == datos['matrizInicial']
+    indices = np.arange(13 * 10)
+    assert mapeado.celdas.costos_en(indices).tolist() == np.ravel(datos['matrizInicial']).tolist()
+
+
+def test_misma_solucion_que_el_json(rutas):
+    desde_json = Universo(rutas[0]).resolver("astar")
+    desde_mapa = Universo(archivo_mapa=rutas[1]).resolver("astar")
+    assert [list(s['camino']) for s in desde_mapa] == [list(s['camino']) for s in desde_json]
+    assert [list(s['energia']) for s in desde_mapa] == [list(s['energia']) for s in desde_json]
+
+
+def test_ediciones_sobre_el_mapa(rutas):
+    mapeado = Universo(archivo_mapa=rutas[1])
+    en_memoria = Universo(rutas[0])
+    huella = mapeado.celdas.huella_costos()
+    for universo in (mapeado, en_memoria):
+        universo.set_costo(5, 5, 40)
+    assert mapeado.celdas.huella_costos() != huella
+    assert mapeado.celdas.costos_en([55]).tolist() == [40]
+    assert _pasos(mapeado.resolver("astar")) == _pasos(en_memoria.resolver("astar"))
+    # El archivo no cambia
+    assert MatrizMapeada(rutas[1]).huella_costos() == huella
+
+
+def test_escribir_por_bandas_irregulares(tmp_path, rutas, datos):
+    costos = np.asarray(datos['matrizInicial'])
+    ruta = str(tmp_path / "bandas.umap")
+    escribir_mapa(ruta, 13, 10, [costos[:3], costos[3:4], costos[4:13]], datos, tamano_tesela=4,
+                  tipo_costos='<u1')
+    por_bandas, convertido = MatrizMapeada(ruta), MatrizMapeada(rutas[1])
+    assert por_bandas.huella_costos() == convertido.huella_costos()
+    assert por_bandas.costos_en(np.arange(130)).tolist() == convertido.costos_en(np.arange(130)).tolist()
+
+
+def test_se_puede_serializar(rutas):
+    mapeado = Universo(archivo_mapa=rutas[1])
+    copia = pickle.loads(pickle.dumps(mapeado))
+    assert copia.matriz[12][9].costo_energia == mapeado.matriz[12][9].costo_energia
+    assert _pasos(copia.resolver("astar")) == _pasos(mapeado.resolver("astar"))
+
+
+def test_datos_invalidos(tmp_path, datos):
+    costos = np.asarray(datos['matrizInicial'])
+    with pytest.raises(ValueError):
+        escribir_mapa(str(tmp_path / "corto.umap"), 13, 10, [costos[:12]], datos)
+    with pytest.raises(ValueError):
+        escribir_mapa(str(tmp_path / "tipo.umap"), 13, 10, [costos + 300], datos, tipo_costos='<u1')
+    with pytest.raises(ValueError):
+        escribir_mapa(str(tmp_path / "tesela.umap"), 13, 10, [costos], datos, tamano_tesela=0)
+    (tmp_path / "otro.umap").write_bytes(b"no es un mapa" * 10)
+    with pytest.raises(ValueError):
+        MatrizMapeada(str(tmp_path / "otro.umap"))
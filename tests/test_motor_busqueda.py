@@ -0,0 +1,52 @@
+import pytest
+
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+
+CASOS = [(tamano, semilla) for tamano in (5, 6, 8) for semilla in range(8)]
+
+
+def _pasos(soluciones):
+    if not soluciones or not soluciones[0].get('completa', True):
+        return None
+    return len(soluciones[0]['camino']) - 1
+
+
+def _resolver(datos, metodo):
+    universo = Universo(datos=datos)
+    soluciones = universo.resolver(metodo)
+    return universo, soluciones
+
+
+@pytest.mark.parametrize("tamano,semilla", CASOS)
+def test_astar_y_dijkstra_coinciden_en_pasos(tamano, semilla):
+    datos = generar_caso(tamano, semilla)
+    universo, astar = _resolver(datos, "astar")
+    _, dijkstra = _resolver(datos, "dijkstra")
+    assert _pasos(astar) == _pasos(dijkstra)
+    assert universo.estado_resolucion.completa
+    assert universo.estado_resolucion.optima == (astar != [])
+
+
+@pytest.mark.parametrize("semilla", range(6))
+def test_astar_no_es_peor_que_la_enumeracion_completa(semilla):
+    # La enumeración recorre caminos simples; A* también admite volver a una celda
+    datos = generar_caso(5, semilla)
+    universo = Universo(datos=datos)
+    mejores = universo.mejores_soluciones(1, criterio="longitud")
+    assert universo.estado_resolucion.completa
+    optimo = _pasos(_resolver(datos, "astar")[1])
+    if mejores:
+        assert optimo is not None and optimo <= _pasos(mejores)
+
+
+def test_origen_en_el_destino():
+    datos = generar_caso(5, 0)
+    datos['destino'] = list(datos['origen'])
+    _, soluciones = _resolver(datos, "astar")
+    assert _pasos(soluciones) == 0
+
+
+def test_metodo_desconocido():
+    with pytest.raises(ValueError):
+        Universo(datos=generar_caso(5, 0)).resolver("bfs")
@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from modules.mision_interestelar import Universo
+from modules.presupuesto import INTERVALO_CONSULTA, Presupuesto, TokenCancelacion
+from modules.rendimiento import generar_caso
+
+METODOS = ("astar", "dijkstra", "incremental", "contraido", "backtracking", "backtracking_iterativo", "paralelo")
+
+
+def test_presupuesto_de_nodos():
+    presupuesto = Presupuesto(max_nodos=3)
+    assert [presupuesto.consumir() for _ in range(4)] == [False, False, False, True]
+    assert presupuesto.motivo == "max_nodos"
+    assert presupuesto.agotado
+
+
+def test_presupuesto_de_tiempo_se_consulta_cada_intervalo():
+    presupuesto = Presupuesto(max_segundos=0)
+    assert not any(presupuesto.consumir() for _ in range(INTERVALO_CONSULTA - 1))
+    assert presupuesto.consumir()
+    assert presupuesto.motivo == "max_segundos"
+    assert presupuesto.restante() == 0
+
+
+def test_cancelacion():
+    token = TokenCancelacion()
+    presupuesto = Presupuesto(cancelacion=token)
+    assert not presupuesto.verificar()
+    token.cancelar()
+    assert presupuesto.verificar()
+    assert presupuesto.motivo == "cancelado"
+
+
+@pytest.mark.parametrize("metodo", METODOS)
+def test_corte_por_nodos_devuelve_un_parcial(metodo):
+    universo = Universo(datos=generar_caso(30, 1))
+    soluciones = universo.resolver(metodo, max_nodos=2, trabajadores=2)
+    estado = universo.estado_resolucion
+    assert not estado.completa and not estado.optima
+    assert estado.motivo == "max_nodos"
+    if metodo == "paralelo":
+        # Los procesos no devuelven el mejor camino parcial
+        assert soluciones == []
+        return
+    assert soluciones and soluciones[0]['completa'] is False
+    assert soluciones[0]['camino'][0] == tuple(universo.origen)
+
+
+@pytest.mark.parametrize("metodo", METODOS)
+def test_token_cancelado_detiene_la_busqueda(metodo):
+    token = TokenCancelacion()
+    token.cancelar()
+    universo = Universo(datos=generar_caso(100, 1))
+    universo.resolver(metodo, cancelacion=token, trabajadores=2)
+    assert universo.estado_resolucion.motivo == "cancelado"
+    assert not universo.estado_resolucion.completa
+
+
+def test_cancelar_desde_otro_hilo():
+    # La enumeración completa de 10x10 no termina: solo la corta la cancelación
+    token = TokenCancelacion()
+    universo = Universo(datos=generar_caso(10, 1))
+    temporizador = threading.Timer(0.2, token.cancelar)
+    temporizador.start()
+    try:
+        universo.mejores_soluciones(1, cancelacion=token)
+    finally:
+        temporizador.cancel()
+    assert universo.estado_resolucion.motivo == "cancelado"
+    assert not universo.estado_resolucion.completa
@@ -0,0 +1,41 @@
+import io
+import json
+
+import pytest
+
+from modules.generar_matriz import guardar_matriz
+from modules.matriz_mapeada import convertir_json
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+from modules.resolucion_lote import METODOS_LOTE, expandir_entradas, resolver_lote
+
+
+@pytest.fixture
+def lote(tmp_path):
+    for semilla in range(3):
+        guardar_matriz(generar_caso(6, semilla), str(tmp_path / f"u{semilla}.json"))
+    convertir_json(str(tmp_path / "u0.json"), str(tmp_path / "u0.umap"))
+    (tmp_path / "roto.json").write_text("{")
+    return expandir_entradas([str(tmp_path)])
+
+
+@pytest.mark.parametrize("metodo", METODOS_LOTE)
+def test_resolver_lote(lote, metodo):
+    salida = io.StringIO()
+    resumen = resolver_lote(lote, salida, metodo=metodo, trabajadores=2)
+    registros = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+    assert [registro['archivo'] for registro in registros] == lote
+    assert resumen == {'archivos': 5, 'resueltos': sum(r['resuelto'] for r in registros), 'errores': 1}
+    errores = [registro for registro in registros if registro['error']]
+    assert errores[0]['archivo'].endswith("roto.json")
+    # El .umap y su JSON de origen dan el mismo resultado
+    por_nombre = {registro['archivo'].rsplit("/", 1)[1]: registro for registro in registros}
+    assert por_nombre['u0.umap']['pasos'] == por_nombre['u0.json']['pasos']
+    if metodo in Universo.METODOS_OPTIMOS:
+        assert all(registro['optima'] for registro in registros if registro['resuelto'])
+
+
+@pytest.mark.parametrize("metodo", ["paralelo", "contraido", "bfs"])
+def test_metodos_fuera_del_lote(lote, metodo):
+    with pytest.raises(ValueError):
+        resolver_lote(lote, io.StringIO(), metodo=metodo)
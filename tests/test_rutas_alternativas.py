@@ -0,0 +1,85 @@
+import pytest
+
+from modules.generar_matriz import generar_matriz_universo
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+from modules.rutas_alternativas import similitud_rutas
+
+SIN_ELEMENTOS = dict(num_agujeros_negros=0, num_estrellas=0, num_gusanos=0, num_recargas=0,
+                     num_cargas_requeridas=0, carga_inicial=1000)
+
+
+def _caminos_simples(filas, columnas, origen, destino):
+    caminos, camino = [], [origen]
+
+    def extender():
+        fila, columna = camino[-1]
+        if camino[-1] == destino:
+            caminos.append(list(camino))
+            return
+        for df, dc in ((0, 1), (1, 0), (0, -1), (-1, 0)):
+            siguiente = (fila + df, columna + dc)
+            if 0 <= siguiente[0] < filas and 0 <= siguiente[1] < columnas and siguiente not in camino:
+                camino.append(siguiente)
+                extender()
+                camino.pop()
+
+    extender()
+    return caminos
+
+
+def _claves(universo, caminos):
+    verificacion = universo.verificar_caminos(caminos)
+    return sorted((len(camino) - 1, -int(energia)) for camino, valido, energia
+                  in zip(caminos, verificacion.validos.tolist(), verificacion.energia_final.tolist()) if valido)
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_k_mas_cortas_contra_enumeracion(semilla):
+    # Sin elementos especiales volver a una celda nunca conviene: las rutas son los caminos simples
+    universo = Universo(datos=generar_matriz_universo(3, 4, semilla=semilla, **SIN_ELEMENTOS))
+    todos = _caminos_simples(3, 4, (0, 0), (2, 3))
+    k = 10
+    rutas = universo.rutas_alternativas(k)
+    caminos = [[tuple(celda) for celda in ruta['camino']] for ruta in rutas]
+    assert _claves(universo, caminos) == _claves(universo, todos)[:k]
+    assert universo.estado_resolucion.optima
+
+
+@pytest.mark.parametrize("tamano,semilla", [(6, 0), (6, 3), (8, 1), (8, 4)])
+def test_orden_distintas_y_validas(tamano, semilla):
+    universo = Universo(datos=generar_caso(tamano, semilla))
+    astar = Universo(datos=generar_caso(tamano, semilla)).resolver("astar")
+    rutas = universo.rutas_alternativas(6)
+    if not astar:
+        assert rutas == []
+        return
+    caminos = [[tuple(celda) for celda in ruta['camino']] for ruta in rutas]
+    pasos = [len(camino) - 1 for camino in caminos]
+    assert pasos[0] == len(astar[0]['camino']) - 1
+    assert pasos == sorted(pasos)
+    assert len(set(map(tuple, caminos))) == len(caminos)
+    assert universo.verificar_caminos(caminos).validos.all()
+    assert universo.soluciones == rutas
+
+
+@pytest.mark.parametrize("similitud", [0.5, 0.8])
+def test_similitud_maxima(similitud):
+    universo = Universo(datos=generar_matriz_universo(6, 6, semilla=2, **SIN_ELEMENTOS))
+    rutas = universo.rutas_alternativas(4, similitud_maxima=similitud, max_examinadas=500)
+    assert len(rutas) > 1
+    for i, ruta in enumerate(rutas):
+        for otra in rutas[:i]:
+            assert similitud_rutas(ruta['camino'], otra['camino']) <= similitud
+    # Con umbral las rutas no son las k más cortas
+    assert not universo.estado_resolucion.optima
+
+
+def test_cortes_y_argumentos():
+    universo = Universo(datos=generar_matriz_universo(6, 6, semilla=2, **SIN_ELEMENTOS))
+    assert len(universo.rutas_alternativas(50, max_examinadas=3)) == 3
+    assert universo.estado_resolucion.completa is False
+    with pytest.raises(ValueError):
+        universo.rutas_alternativas(0)
+    with pytest.raises(ValueError):
+        universo.rutas_alternativas(2, similitud_maxima=1.5)
@@ -0,0 +1,66 @@
+import pytest
+
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+from modules.solucion_compacta import SolucionCompacta, deserializar_soluciones, serializar_soluciones
+
+CON_SALTO = {
+    'camino': [(0, 0), (0, 1), (1, 1), (4, 3), (4, 2)],
+    'energia': [100, 95, 90, 90, 2 ** 40],
+    'estrellas': [0, 0, 1, 1, 0],
+}
+ENERGIA_ENORME = {'camino': [(2, 2), (1, 2)], 'energia': [5, 2 ** 70], 'estrellas': [0, 0]}
+PARCIAL = {'camino': [(0, 0), (1, 0)], 'energia': [10, 7], 'estrellas': [0, 0], 'completa': False}
+
+
+@pytest.mark.parametrize("solucion", [CON_SALTO, ENERGIA_ENORME, PARCIAL])
+def test_se_comporta_como_el_diccionario(solucion):
+    compacta = SolucionCompacta.desde_dict(solucion)
+    assert compacta.como_dict() == solucion
+    assert dict(compacta) == {clave: compacta[clave] for clave in solucion}
+    assert compacta.pasos == len(solucion['camino']) - 1
+    assert compacta.get('completa', True) == solucion.get('completa', True)
+
+
+def test_saltos_y_energia_grande():
+    compacta = SolucionCompacta.desde_dict(CON_SALTO)
+    assert list(compacta.movimientos).count(4) == 1
+    assert list(compacta.saltos) == [4, 3]
+    assert isinstance(SolucionCompacta.desde_dict(ENERGIA_ENORME).energia, list)
+
+
+@pytest.mark.parametrize("solucion", [CON_SALTO, ENERGIA_ENORME, PARCIAL])
+def test_bytes_ida_y_vuelta(solucion):
+    compacta = SolucionCompacta.desde_dict(solucion)
+    assert SolucionCompacta.desde_bytes(compacta.a_bytes()).como_dict() == solucion
+
+
+def test_lista_ida_y_vuelta():
+    soluciones = [CON_SALTO, SolucionCompacta.desde_dict(ENERGIA_ENORME), PARCIAL]
+    recuperadas = deserializar_soluciones(serializar_soluciones(soluciones))
+    assert [solucion.como_dict() for solucion in recuperadas] == [CON_SALTO, ENERGIA_ENORME, PARCIAL]
+    assert deserializar_soluciones(serializar_soluciones([])) == []
+
+
+@pytest.mark.parametrize("largo", [6, 10, 30, -6, -1])
+def test_datos_truncados(largo):
+    datos = serializar_soluciones([CON_SALTO, PARCIAL])
+    with pytest.raises(ValueError):
+        deserializar_soluciones(datos[:largo])
+
+
+def test_formato_desconocido():
+    with pytest.raises(ValueError):
+        deserializar_soluciones(b'XXXX' + serializar_soluciones([CON_SALTO])[4:])
+    with pytest.raises(ValueError):
+        SolucionCompacta.desde_bytes(b'SOLC')
+
+
+def test_exportar_e_importar_desde_el_universo():
+    universo = Universo(datos=generar_caso(8, 0))
+    soluciones = universo.resolver("astar")
+    caminos = [solucion['camino'] for solucion in soluciones]
+    datos = universo.exportar_soluciones()
+    otro = Universo(datos=generar_caso(8, 0))
+    assert [solucion['camino'] for solucion in otro.importar_soluciones(datos)] == caminos
+    assert otro.verificar_caminos().validos.all()
@@ -0,0 +1,90 @@
+import pytest
+
+from modules.estadisticas import EstadisticasBusqueda, PODA_TRANSPOSICION
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+from modules.tabla_transposicion import TablaTransposicion
+
+# Una recarga alcanzable por dos caminos: el más barato no deja libre la única ruta al destino
+MAPA_RECARGA = {
+    "matriz": {"filas": 3, "columnas": 2}, "origen": [0, 0], "destino": [2, 0],
+    "agujerosNegros": [[2, 1]], "estrellasGigantes": [], "agujerosGusano": [],
+    "zonasRecarga": [[1, 1, 3]], "celdasCargaRequerida": [{"coordenada": [2, 0], "cargaGastada": 12}],
+    "cargaInicial": 10, "matrizInicial": [[0, 2], [1, 5], [0, 5]],
+}
+
+
+def test_domina_con_subconjunto_de_visitadas():
+    tabla = TablaTransposicion()
+    assert not tabla.dominado(5, 0b0011, 10, 1)
+    assert tabla.dominado(5, 0b0111, 10, 1)
+    assert tabla.dominado(5, 0b0011, 9, 0)
+    # Más energía, otra celda o visitadas que no la incluyen: no está dominada
+    assert not tabla.dominado(5, 0b0111, 11, 1)
+    assert not tabla.dominado(6, 0b0111, 1, 0)
+    assert not tabla.dominado(5, 0b1001, 1, 0)
+    assert tabla.podas == 2
+
+
+def test_salidas_de_gusano_deben_coincidir():
+    tabla = TablaTransposicion(exactas=0b0100)
+    assert not tabla.dominado(5, 0b0001, 10, 0)
+    # La segunda visitó la salida del gusano y la primera no: un salto podría caer ahí
+    assert not tabla.dominado(5, 0b0101, 10, 0)
+    assert tabla.dominado(5, 0b0011, 10, 0)
+
+
+def test_la_nueva_reemplaza_a_las_que_domina():
+    tabla = TablaTransposicion()
+    tabla.dominado(5, 0b0111, 5, 0)
+    tabla.dominado(5, 0b1011, 5, 0)
+    assert len(tabla) == 2
+    tabla.dominado(5, 0b0011, 5, 0)
+    assert len(tabla) == 1
+
+
+def test_capacidad_y_desalojo():
+    tabla = TablaTransposicion(capacidad=3, por_celda=2)
+    for celda in range(3):
+        tabla.dominado(celda, 1 << celda, 5, 0)
+    tabla.dominado(0, 0b1000, 5, 0)
+    tabla.dominado(3, 0, 5, 0)
+    assert len(tabla) <= 3
+    assert tabla.desalojos == 2
+    with pytest.raises(ValueError):
+        TablaTransposicion(capacidad=0)
+
+
+@pytest.mark.parametrize("capacidad", [None, 100])
+def test_no_pierde_soluciones(capacidad):
+    universo = Universo(datos=MAPA_RECARGA)
+    soluciones = universo.resolver("backtracking_iterativo", capacidad_tabla=capacidad)
+    assert [list(s['camino']) for s in soluciones] == [[(0, 0), (0, 1), (1, 1), (1, 0), (2, 0)]]
+
+    universo = Universo(datos=MAPA_RECARGA)
+    assert len(universo.mejores_soluciones(5, capacidad_tabla=capacidad)) == 1
+    # Con podas de la tabla no se puede afirmar que se enumeraron todas
+    podo = universo.tabla_transposicion is not None and universo.tabla_transposicion.podas > 0
+    assert universo.estado_resolucion.completa == (not podo)
+
+
+@pytest.mark.parametrize("tamano,semilla", [(tamano, semilla) for tamano in (5, 6, 8) for semilla in range(8)])
+def test_misma_existencia_con_y_sin_tabla(tamano, semilla):
+    datos = generar_caso(tamano, semilla)
+    sin_tabla = Universo(datos=datos).resolver("backtracking_iterativo")
+    con_tabla = Universo(datos=datos).resolver("backtracking_iterativo", capacidad_tabla=10_000)
+    assert bool(sin_tabla) == bool(con_tabla)
+
+
+@pytest.mark.parametrize("semilla", range(4))
+def test_enumeracion_con_tabla_expande_menos_y_encuentra_el_optimo(semilla):
+    datos = generar_caso(5, semilla)
+    sin_tabla = Universo(datos=datos)
+    optimo = sin_tabla.mejores_soluciones(1, criterio="longitud")
+    con_tabla = Universo(datos=datos)
+    estadisticas = EstadisticasBusqueda()
+    mejores = con_tabla.mejores_soluciones(1, criterio="longitud", capacidad_tabla=100_000,
+                                           estadisticas=estadisticas)
+    assert len(mejores[0]['camino']) == len(optimo[0]['camino'])
+    assert con_tabla.estado_resolucion.nodos_expandidos < sin_tabla.estado_resolucion.nodos_expandidos
+    assert estadisticas.podas[PODA_TRANSPOSICION] == con_tabla.tabla_transposicion.podas > 0
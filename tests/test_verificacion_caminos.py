@@ -0,0 +1,105 @@
+import pytest
+
+from modules.estadisticas import PODA_AGUJERO_NEGRO, PODA_CARGA_REQUERIDA, PODA_SIN_ENERGIA
+from modules.mision_interestelar import Universo
+from modules.rendimiento import generar_caso
+from modules.verificacion_caminos import (MOTIVO_CAMINO_VACIO, MOTIVO_DESTINO_NO_ALCANZADO,
+                                          MOTIVO_FUERA_DE_GRILLA, MOTIVO_NO_ADYACENTE, MOTIVO_ORIGEN,
+                                          MOTIVO_SALTO_GUSANO)
+
+METODOS = ("astar", "dijkstra", "incremental", "contraido", "pareto", "backtracking",
+           "backtracking_iterativo", "paralelo")
+# Rodea por la derecha: (0, 0) -> (0, 2) -> (2, 2)
+POR_ARRIBA = [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)]
+
+
+def _universo(**cambios):
+    datos = {
+        "matriz": {"filas": 3, "columnas": 3}, "origen": [0, 0], "destino": [2, 2],
+        "agujerosNegros": [], "estrellasGigantes": [], "agujerosGusano": [],
+        "zonasRecarga": [], "celdasCargaRequerida": [], "cargaInicial": 10,
+        "matrizInicial": [[1, 1, 1], [1, 1, 1], [1, 1, 1]],
+    }
+    datos.update(cambios)
+    return Universo(datos=datos)
+
+
+@pytest.mark.parametrize("metodo", METODOS)
+@pytest.mark.parametrize("semilla", range(4))
+def test_las_soluciones_de_cada_metodo_son_validas(metodo, semilla):
+    universo = Universo(datos=generar_caso(8, semilla))
+    soluciones = universo.resolver(metodo, trabajadores=2)
+    verificacion = universo.verificar_caminos()
+    assert len(verificacion) == len(soluciones)
+    assert verificacion.validos.all()
+    assert verificacion.energia_final.tolist() == [solucion['energia'][-1] for solucion in soluciones]
+
+
+def test_prefijos_no_llegan_al_destino():
+    universo = Universo(datos=generar_caso(8, 0))
+    solucion = universo.resolver("astar")[0]
+    camino = solucion['camino']
+    prefijos = [camino[:largo] for largo in range(1, len(camino))]
+    verificacion = universo.verificar_caminos(prefijos)
+    assert not verificacion.validos.any()
+    assert set(verificacion.motivos) == {MOTIVO_DESTINO_NO_ALCANZADO}
+    assert verificacion.energia_final.tolist() == list(solucion['energia'][:-1])
+
+
+@pytest.mark.parametrize("camino,paso,motivo", [
+    ([], 0, MOTIVO_CAMINO_VACIO),
+    ([(1, 0), (2, 0), (2, 1), (2, 2)], 0, MOTIVO_ORIGEN),
+    ([(0, 0), (0, -1)], 1, MOTIVO_FUERA_DE_GRILLA),
+    ([(0, 0), (1, 1), (2, 2)], 1, MOTIVO_NO_ADYACENTE),
+    ([(0, 0), (1, 0)], 1, MOTIVO_DESTINO_NO_ALCANZADO),
+])
+def test_errores_de_forma(camino, paso, motivo):
+    verificacion = _universo().verificar_caminos([camino])
+    assert not verificacion.validos[0]
+    assert (verificacion.primer_error[0], verificacion.motivos[0]) == (paso, motivo)
+
+
+def test_agujero_negro_necesita_estrella():
+    universo = _universo(agujerosNegros=[[0, 1]])
+    assert universo.verificar_caminos([POR_ARRIBA]).motivos == [PODA_AGUJERO_NEGRO]
+    # Con la estrella de (1, 0) primero, el mismo tramo es válido (y la estrella se gasta)
+    universo = _universo(agujerosNegros=[[0, 1], [1, 2]], estrellasGigantes=[[1, 0]])
+    camino = [(0, 0), (1, 0), (1, 1), (0, 1), (0, 2), (1, 2), (2, 2)]
+    verificacion = universo.verificar_caminos([camino, [(0, 0), (1, 0), (1, 1), (1, 2), (2, 2)]])
+    assert verificacion.validos.tolist() == [False, True]
+    assert (verificacion.primer_error[0], verificacion.motivos[0]) == (5, PODA_AGUJERO_NEGRO)
+
+
+def test_carga_requerida_y_energia():
+    universo = _universo(celdasCargaRequerida=[{"coordenada": [0, 1], "cargaGastada": 50}])
+    verificacion = universo.verificar_caminos([POR_ARRIBA])
+    assert (verificacion.primer_error[0], verificacion.motivos[0]) == (1, PODA_CARGA_REQUERIDA)
+
+    verificacion = _universo(cargaInicial=2).verificar_caminos([POR_ARRIBA])
+    assert (verificacion.primer_error[0], verificacion.motivos[0]) == (2, PODA_SIN_ENERGIA)
+    # En el destino la energía puede llegar a cero
+    verificacion = _universo(cargaInicial=4).verificar_caminos([POR_ARRIBA])
+    assert verificacion.validos[0] and verificacion.energia_final[0] == 0
+
+
+def test_recarga_multiplica_una_vez_sin_cobrar():
+    universo = _universo(zonasRecarga=[[0, 1, 3]])
+    ida_y_vuelta = [(0, 0), (0, 1), (0, 0), (0, 1), (0, 2), (1, 2), (2, 2)]
+    verificacion = universo.verificar_caminos([POR_ARRIBA, ida_y_vuelta])
+    assert verificacion.validos.all()
+    assert verificacion.energia_final.tolist() == [10 * 3 - 3, 10 * 3 - 1 - 3]
+
+
+def test_salto_de_gusano_obligatorio():
+    universo = _universo(agujerosGusano=[{"entrada": [0, 1], "salida": [2, 0]}])
+    con_salto = [(0, 0), (0, 1), (2, 0), (2, 1), (2, 2)]
+    sin_salto = POR_ARRIBA
+    verificacion = universo.verificar_caminos([con_salto, sin_salto])
+    assert verificacion.validos.tolist() == [True, False]
+    assert (verificacion.primer_error[1], verificacion.motivos[1]) == (2, MOTIVO_SALTO_GUSANO)
+
+
+def test_no_modifica_el_universo():
+    universo = _universo(agujerosNegros=[[1, 1]], estrellasGigantes=[[0, 1]])
+    universo.verificar_caminos([[(0, 0), (0, 1), (1, 1), (1, 2), (2, 2)]])
+    assert universo.matriz[1][1].es_agujero_negro and universo.matriz[0][1].es_estrella_gigante